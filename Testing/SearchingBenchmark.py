@@ -0,0 +1,23 @@
+"""
+Created on October 18, 2026
+@author: Lance A. Endres
+
+Micro-benchmark of Search.FindIndicesByValues.  Compares the vectorized search of NumPy arrays against
+the original loop (which is still used for lists).
+"""
+import numpy                                                    as np
+import timeit
+
+from   lendres.algorithms.Search                                import Search
+
+
+if __name__ == "__main__":
+    data   = np.random.default_rng(1).integers(0, 100, 5000000)
+    # Lists are searched with the original, element by element, loop.
+    asList = data.tolist()
+    number = 3
+
+    for maxCount in [10, 1000, None]:
+        loopTime   = timeit.timeit(lambda: Search.FindIndicesByValues(asList, 7, maxCount), number=number) / number
+        arrayTime  = timeit.timeit(lambda: Search.FindIndicesByValues(data, 7, maxCount), number=number) / number
+        print("maxCount = {:>6}:  loop {:10.6f} s    array {:10.6f} s    speed up {:10.1f}x".format(str(maxCount), loopTime, arrayTime, loopTime/arrayTime))
@@ -60,6 +60,17 @@ class TestPlotHelper(unittest.TestCase):
         self.title = "Label Peaks Y"
 
 
+    def testNearestPoints(self):
+        annotationHelper = AnnotationHelper(formatString="{x:0.2f}, {y:0.2f}")
+        nearestPoints    = annotationHelper.GetNearestPoints(self.lines, [1.0, 2.5], [3.0, 0.0])
+        self.assertIs(nearestPoints[0][0], self.lines[0])
+        self.assertEqual(len(nearestPoints), 2)
+
+        annotationHelper.AddNearestPointAnnotations(self.lines, [1.0, 2.5], [3.0, 0.0])
+        self.assertEqual(len(annotationHelper.annotations), 2)
+        self.title = "Nearest Points"
+
+
     def testAdjustText1(self):
         annotationHelper = AnnotationHelper(formatString="{x:0.1f}, {y:0.2f}", size="10")
         annotationHelper.SetAdjustText(adjustText=True, arrowprops={"arrowstyle":"-", "color":"red"})
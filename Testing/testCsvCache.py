@@ -0,0 +1,137 @@
+"""
+Created on October 18, 2026
+@author: Lance A. Endres
+"""
+import pandas                                                        as pd
+import tempfile
+import shutil
+import os
+
+import DataSetLoading
+from   lendres.io.CsvCache                                           import CsvCache
+from   lendres.data.DataComparison                                   import DataComparison
+
+import unittest
+
+
+class TestCsvCache(unittest.TestCase):
+
+    def setUp(self):
+        # Work on a copy of the data so the source file can be modified.
+        self.directory = tempfile.mkdtemp()
+        self.inputFile = os.path.join(self.directory, "insurance.csv")
+        shutil.copyfile(DataSetLoading.GetFileInDataDirectory("insurance.csv"), self.inputFile)
+        self.csvCache  = CsvCache(directory=os.path.join(self.directory, "cache"))
+
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+
+    def testHitAndMiss(self):
+        original = self.csvCache.ReadCsv(self.inputFile)
+        cached   = self.csvCache.ReadCsv(self.inputFile)
+        pd.testing.assert_frame_equal(original, cached)
+        pd.testing.assert_frame_equal(original, pd.read_csv(self.inputFile))
+        self.assertEqual(self.csvCache.Statistics["misses"], 1)
+        self.assertEqual(self.csvCache.Statistics["hits"], 1)
+
+        # Different read options are a different entry.
+        result = self.csvCache.ReadCsv(self.inputFile, usecols=["age", "sex"])
+        self.assertEqual(list(result.columns), ["age", "sex"])
+        self.assertEqual(self.csvCache.Statistics["misses"], 2)
+
+
+    def testInvalidation(self):
+        self.csvCache.ReadCsv(self.inputFile)
+
+        with open(self.inputFile, "a") as file:
+            file.write("20,male,30.0,0,no,southwest,1000.0\n")
+
+        result = self.csvCache.ReadCsv(self.inputFile)
+        self.assertEqual(result.shape[0], pd.read_csv(self.inputFile).shape[0])
+        self.assertEqual(self.csvCache.Statistics["misses"], 2)
+
+
+    def testEviction(self):
+        csvCache = CsvCache(directory=os.path.join(self.directory, "cache"), maximumSize=1)
+        csvCache.ReadCsv(self.inputFile)
+        csvCache.ReadCsv(self.inputFile, usecols=["age"])
+        self.assertEqual(csvCache.Statistics["evictions"], 2)
+        self.assertEqual(len(os.listdir(os.path.join(self.directory, "cache"))), 0)
+
+
+    def testOnlyCacheFilesRemoved(self):
+        # Other files in the cache directory are not removed, even with the same extension.
+        cacheDirectory = os.path.join(self.directory, "cache")
+        os.makedirs(cacheDirectory)
+        otherFiles     = ["results.npz", "insurance.csv.0123456789abcdef.npz", "insurance.csv.0123456789abcdef0123.pkl"]
+        for name in otherFiles:
+            with open(os.path.join(cacheDirectory, name), "wb") as file:
+                file.write(b"data")
+
+        csvCache = CsvCache(directory=cacheDirectory, maximumSize=1)
+        csvCache.ReadCsv(self.inputFile)
+        self.assertEqual(csvCache.Statistics["evictions"], 1)
+
+        self.csvCache.ReadCsv(self.inputFile)
+        self.assertEqual(len(os.listdir(cacheDirectory)), len(otherFiles)+1)
+        self.csvCache.Clear()
+        self.assertEqual(sorted(os.listdir(cacheDirectory)), sorted(otherFiles))
+
+
+    def testColumnTypes(self):
+        with open(self.inputFile, "w") as file:
+            file.write("id,name,date,value,flag\n")
+            file.write("a,first,2026-01-01,1.5,True\n")
+            file.write("b,,2026-01-02,,False\n")
+            file.write("c,third,2026-01-03,3.5,True\n")
+            file.write("d,\u00fcber \u6771\u4eac \U0001f600,2026-01-04,4.5,False\n")
+
+        for kwargs in [{}, {"index_col" : "id", "parse_dates" : ["date"]}]:
+            original = self.csvCache.ReadCsv(self.inputFile, **kwargs)
+            cached   = self.csvCache.ReadCsv(self.inputFile, **kwargs)
+            pd.testing.assert_frame_equal(cached, original)
+            pd.testing.assert_frame_equal(cached, pd.read_csv(self.inputFile, **kwargs))
+
+        self.assertEqual(self.csvCache.Statistics["hits"], 2)
+
+
+    def testTextSize(self):
+        # Text is stored about the size of the text, not padded to the longest value.
+        inputFile = DataSetLoading.GetFileInDataDirectory("Tweets.csv")
+        original  = self.csvCache.ReadCsv(inputFile)
+        cached    = self.csvCache.ReadCsv(inputFile)
+        pd.testing.assert_frame_equal(cached, original)
+        self.assertLess(os.path.getsize(self.csvCache.GetCachePath(inputFile)), 2*os.path.getsize(inputFile))
+
+
+    def testNotCached(self):
+        # A column of mixed types cannot be stored without pickle, so it is read from the source each time.
+        with open(self.inputFile, "w") as file:
+            file.write("value\n1\na\n")
+
+        converters = {"value" : lambda value: int(value) if value.isdigit() else value}
+        self.csvCache.ReadCsv(self.inputFile, converters=converters)
+        result = self.csvCache.ReadCsv(self.inputFile, converters=converters)
+        self.assertEqual(result["value"].tolist(), [1, "a"])
+        self.assertEqual(self.csvCache.Statistics["misses"], 2)
+
+
+    def testDefaultDirectory(self):
+        # The default cache is in the user's cache directory, not next to the data.
+        csvCache = CsvCache()
+        self.assertEqual(csvCache.directory, CsvCache.GetDefaultDirectory())
+        self.assertEqual(csvCache.fileFormat, "npz")
+        self.assertFalse(csvCache.GetCachePath(self.inputFile).startswith(self.directory))
+
+
+    def testDataComparison(self):
+        dataComparison = DataComparison("age", directory=self.directory, csvCache=self.csvCache)
+        dataComparison.LoadFile("insurance.csv", "First")
+        dataComparison.LoadFile("insurance.csv", "Second")
+        self.assertEqual(self.csvCache.Statistics["hits"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
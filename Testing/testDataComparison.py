@@ -3,8 +3,11 @@ Created on July 20, 2023
 @author: Lance A. Endres
 """
 import pandas                                                        as pd
+import numpy                                                         as np
+import matplotlib.pyplot                                             as plt
 import os
 import math
+import tempfile
 
 from   lendres.io.ConsoleHelper                                      import ConsoleHelper
 from   lendres.data.DataComparison                                   import DataComparison
@@ -14,6 +17,13 @@ import unittest
 
 pd.set_option('display.max_columns', None)
 
+def ScaleTime(dataSet):
+    # Defined at the module level so that it can be sent to another process.
+    dataSet         = dataSet.copy()
+    dataSet["Time"] = dataSet["Time"] * 2
+    return dataSet
+
+
 class TestDataComparison(unittest.TestCase):
 
     @classmethod
@@ -80,6 +90,315 @@ class TestDataComparison(unittest.TestCase):
         self.dataComparison.CreateMultiAxisComparisonPlot(columns, labels)
 
 
+    def testDecimatedPlots(self):
+        self.dataComparison.CreateComparisonPlot("w_bit", xLabel="Time (s)", decimate=True)
+
+        columns = [["Displacement (revs)"], ["w_bit"]]
+        labels = ["Displacement (revs)", "Velocity (rpm)"]
+        figure = self.dataComparison.CreateMultiAxisComparisonPlot(columns, labels, decimate=200)
+        self.assertLessEqual(len(figure.axes[0].get_lines()[0].get_xdata()), 800)
+
+
+    def testGetIndex(self):
+        self.assertEqual(self.dataComparison.GetIndex(1, 11.006), 1100)
+        self.assertEqual(self.dataComparison.GetIndex(1, 11.006, method="nearest"), 1101)
+        self.assertEqual(self.dataComparison.GetIndex(1, 11.004, method="nearest"), 1100)
+
+
+    def testGetValues(self):
+        times  = [11, 11.005, 20, 100]
+        result = self.dataComparison.GetValues([self.velColumn, self.dispColumn], times, dataSet=1)
+        self.assertEqual(list(result.columns), ["Time", self.velColumn, self.dispColumn])
+        self.assertAlmostEqual(result[self.velColumn].iloc[0], 75.1645423, places=3)
+        self.assertEqual(result[self.velColumn].iloc[1], self.dataComparison.GetValue(1, self.velColumn, 11.005))
+        self.assertTrue(np.isnan(result[self.velColumn].iloc[3]))
+
+        # Interpolation.
+        result = self.dataComparison.GetValues(self.velColumn, times, dataSet=1, interpolate=True, asArray=True)
+        lower  = self.dataComparison.GetValue(1, self.velColumn, 11.0)
+        upper  = self.dataComparison.GetValue(1, self.velColumn, 11.01)
+        self.assertAlmostEqual(result[1, 0], (lower+upper)/2)
+        self.assertAlmostEqual(result[0, 0], lower)
+
+        # All data sets.
+        result = self.dataComparison.GetValues(self.velColumn, times)
+        self.assertEqual(result.shape, (4, 1+self.dataComparison.NumberOfDataSets))
+        self.assertIn("Model 2 " + self.velColumn, result.columns)
+
+
+    def testAlignedData(self):
+        result = self.dataComparison.GetAlignedData(self.velColumn, grid=[10, 11, 12])
+        self.assertEqual(list(result.columns), ["Time", "Model 1 " + self.velColumn, "Model 2 " + self.velColumn])
+        self.assertAlmostEqual(result["Model 2 " + self.velColumn].iloc[1], 75.1645423, places=3)
+
+        # Cached until the data sets change.
+        self.assertIs(self.dataComparison.GetAlignedData(self.velColumn, grid=[10, 11, 12]), result)
+        self.dataComparison.InvalidateCache()
+        self.assertIsNot(self.dataComparison.GetAlignedData(self.velColumn, grid=[10, 11, 12]), result)
+
+        # The finest grid is the time axis of the first model.
+        result = self.dataComparison.GetAlignedData([self.velColumn, self.dispColumn])
+        self.assertEqual(result.shape[0], self.dataComparison.dataSets[0].shape[0])
+        self.assertEqual(result.shape[1], 5)
+
+        result = self.dataComparison.GetAlignedData(self.velColumn, grid="union")
+        self.assertTrue(np.all(np.diff(result["Time"]) > 0))
+
+
+    def testLoadFiles(self):
+        dataComparison = DataComparison(directory=self.dataComparison.directory, independentColumn="Time")
+        errors         = dataComparison.LoadFiles([("dynamicsmodel2.csv", "First"), ("missing.csv", "Missing"), ("dynamicsmodel2.csv", "Second")], numberOfWorkers=2)
+        self.assertEqual(dataComparison.dataSetNames, ["First", "Second"])
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(errors[0][0], "missing.csv")
+
+        dataComparison = DataComparison(directory=self.dataComparison.directory, independentColumn="Time")
+        errors         = dataComparison.LoadFiles(pattern="dynamicsmodel*.csv", useProcesses=True)
+        self.assertEqual(len(errors), 0)
+        self.assertIn("dynamicsmodel2", dataComparison.dataSetNames)
+        self.assertEqual(dataComparison.dataSets[-1].shape[0], 6001)
+
+
+    def testLazyLoading(self):
+        dataComparison = DataComparison(directory=self.dataComparison.directory, independentColumn="Time", lazyLoading=True)
+        dataComparison.LoadFile("dynamicsmodel2.csv", "Model 2")
+        self.assertEqual(list(dataComparison.dataSets[0].columns), ["Time"])
+        self.assertIn(self.velColumn, dataComparison.GetColumnNames(0))
+
+        # Columns are loaded when used.
+        self.assertAlmostEqual(dataComparison.GetValue(0, self.velColumn, 11), 75.1645423, places=3)
+        self.assertEqual(list(dataComparison.dataSets[0].columns), ["Time", self.velColumn])
+
+        dataComparison.LoadColumns()
+        self.assertEqual(dataComparison.dataSets[0].shape, (6001, 11))
+
+
+    def testDifferenceMetrics(self):
+        dataComparison = DataComparison("Time")
+        time           = np.linspace(0, 10, 10001)
+        dataComparison.AddDataSet(pd.DataFrame({"Time" : time, "Value" : np.sin(time)}), "Reference")
+        dataComparison.AddDataSet(pd.DataFrame({"Time" : time[::10], "Value" : 2*np.sin(time[::10]) + 1}), "Other")
+
+        result   = dataComparison.GetDifferenceMetrics(chunkSize=777)
+        row      = result.iloc[0]
+        aligned  = dataComparison.GetAlignedData("Value", grid=time)
+        errors   = aligned["Other Value"] - aligned["Reference Value"]
+
+        self.assertEqual(row["Data Set"], "Other")
+        self.assertEqual(row["Number of Points"], 10001)
+        self.assertAlmostEqual(row["RMS Error"], np.sqrt(np.mean(errors**2)))
+        self.assertAlmostEqual(row["Maximum Absolute Error"], np.abs(errors).max())
+        self.assertAlmostEqual(row["Time of Maximum Error"], time[np.argmax(np.abs(errors))])
+        self.assertAlmostEqual(row["Correlation"], np.corrcoef(aligned["Other Value"], aligned["Reference Value"])[0, 1])
+
+        # Parallel columns.
+        result = self.dataComparison.GetDifferenceMetrics([self.velColumn, self.dispColumn], numberOfWorkers=2)
+        self.assertEqual(list(result["Column"]), [self.velColumn, self.dispColumn])
+
+
+    def testApplyParallel(self):
+        dataComparison = DataComparison(directory=self.dataComparison.directory, independentColumn="Time")
+        dataComparison.LoadFile("dynamicsmodel2.csv", "First")
+        dataComparison.LoadFile("dynamicsmodel2.csv", "Second")
+        timeAxis = dataComparison.GetTimeAxis(0)
+
+        # Threads, modified in place.
+        results = dataComparison.ApplyParallel(self.AddRevolutions, numberOfWorkers=2)
+        self.assertIs(results[0], dataComparison.dataSets[0])
+        self.assertIn("Displacement (revs)", dataComparison.dataSets[1].columns)
+        self.assertIsNot(dataComparison.GetTimeAxis(0), timeAxis)
+
+        # Processes, new data sets returned.
+        results = dataComparison.ApplyParallel(ScaleTime, useProcesses=True, numberOfWorkers=2)
+        self.assertEqual(dataComparison.dataSetNames, ["First", "Second"])
+        self.assertEqual(dataComparison.dataSets[1].name, "Second")
+        self.assertEqual(dataComparison.GetTimeAxis(1)[-1], 120.0)
+        self.assertIn("Displacement (revs)", dataComparison.dataSets[1].columns)
+
+
+    def testRefresh(self):
+        with open(os.path.join(self.dataComparison.directory, "dynamicsmodel2.csv"), "r") as file:
+            lines = file.readlines()
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "growing.csv")
+
+            # Start with a partially written last line.
+            with open(path, "w") as file:
+                file.writelines(lines[:101])
+                file.write(lines[101][:5])
+
+            # The partial line is not loaded.
+            dataComparison = DataComparison(independentColumn="Time")
+            dataComparison.LoadFile(path, "Growing")
+            self.assertEqual(len(dataComparison.dataSets[0]), 100)
+
+            # Finish the line and add more, including another partial line.
+            with open(path, "a") as file:
+                file.write(lines[101][5:])
+                file.writelines(lines[102:201])
+                file.write(lines[201][:5])
+
+            self.assertEqual(dataComparison.Refresh(), [100])
+            self.assertEqual(dataComparison.Refresh(), [0])
+
+            with open(path, "a") as file:
+                file.write(lines[201][5:])
+                file.writelines(lines[202:])
+
+            self.assertEqual(dataComparison.Refresh(), [len(lines)-201])
+
+            expected = pd.read_csv(os.path.join(self.dataComparison.directory, "dynamicsmodel2.csv"))
+            data     = dataComparison.dataSets[0]
+            self.assertEqual(data.name, "Growing")
+            pd.testing.assert_frame_equal(data, expected)
+            np.testing.assert_array_equal(dataComparison.GetTimeAxis(0), expected["Time"].to_numpy())
+            self.assertTrue(dataComparison.IsMonotonic(0))
+
+
+    def testRefreshBlankLinesAndQuotes(self):
+        # Rows do not match lines when there are blank lines or quoted line endings.
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "growing.csv")
+            with open(path, "w") as file:
+                file.write("Time,Note\n0.0,a\n\n1.0,\"two\nlines\"\n\n2.0,c\n3.0,par")
+
+            dataComparison = DataComparison(independentColumn="Time")
+            dataComparison.LoadFile(path, "Growing")
+            self.assertEqual(len(dataComparison.dataSets[0]), 3)
+
+            with open(path, "a") as file:
+                file.write("t\n\n4.0,\"more\nlines\"\n")
+            self.assertEqual(dataComparison.Refresh(), [2])
+
+            data = dataComparison.dataSets[0]
+            np.testing.assert_array_equal(data["Time"].to_numpy(), [0.0, 1.0, 2.0, 3.0, 4.0])
+            self.assertEqual(data["Note"].tolist(), ["a", "two\nlines", "c", "part", "more\nlines"])
+
+            # A header without a line ending.
+            with open(path, "w") as file:
+                file.write("Time,Note")
+            dataComparison = DataComparison(independentColumn="Time")
+            dataComparison.LoadFile(path, "Header")
+            self.assertEqual(len(dataComparison.dataSets[0]), 0)
+            self.assertEqual(dataComparison.Refresh(), [0])
+
+            with open(path, "a") as file:
+                file.write("\n0.0,a\n")
+            self.assertEqual(dataComparison.Refresh(), [1])
+            self.assertEqual(dataComparison.dataSets[0]["Note"].tolist(), ["a"])
+
+
+    def testRefreshDoesNotCopy(self):
+        numberOfRows  = 100000
+        numberOfSteps = 50
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "growing.csv")
+            pd.DataFrame({"Time" : np.arange(numberOfRows)*0.5, "Count" : np.arange(numberOfRows)}).to_csv(path, index=False)
+
+            dataComparison = DataComparison(independentColumn="Time")
+            dataComparison.LoadFile(path, "Growing")
+            dataComparison.Apply(lambda dataSet: dataSet.insert(2, "Double", dataSet["Time"]*2))
+            dataComparison.GetTimeAxis(0)
+            self.assertEqual(dataComparison.Refresh(), [0])
+
+            buffers = set()
+            for step in range(-1, numberOfSteps):
+                timeAxis = dataComparison.GetTimeAxis(0)
+                counts   = dataComparison.dataSets[0]["Count"].to_numpy()
+
+                rows = numberOfRows + step + 1
+                with open(path, "a") as file:
+                    file.write(str(rows*0.5) + "," + str(rows) + "\n")
+                self.assertEqual(dataComparison.Refresh(), [1])
+
+                # The first refresh that appends rows creates the buffers.  After that, the existing rows are only copied when
+                # a buffer is full, and the buffers double in size.
+                if step < 0:
+                    continue
+                buffers.add(id(dataComparison.timeAxisBuffers[0]))
+                if len(buffers) == 1:
+                    self.assertTrue(np.shares_memory(dataComparison.GetTimeAxis(0), timeAxis))
+                    self.assertTrue(np.shares_memory(dataComparison.dataSets[0]["Count"].to_numpy(), counts))
+
+            self.assertEqual(len(buffers), 1)
+
+            data = dataComparison.dataSets[0]
+            self.assertEqual(len(data), numberOfRows + numberOfSteps + 1)
+            self.assertEqual(data["Count"].dtype, np.int64)
+            np.testing.assert_array_equal(data["Count"].to_numpy(), np.arange(numberOfRows + numberOfSteps + 1))
+            np.testing.assert_array_equal(dataComparison.GetTimeAxis(0), np.arange(numberOfRows + numberOfSteps + 1)*0.5)
+            self.assertTrue(np.isnan(data["Double"].to_numpy()[numberOfRows:]).all())
+            self.assertEqual(dataComparison.GetIndex(0, 10.25), 20)
+
+
+    def testAddInvalidDataSet(self):
+        dataComparison = DataComparison(independentColumn="Time")
+        dataComparison.AddDataSet(pd.DataFrame({"Time" : [0.0, 1.0], "Value" : [1.0, 2.0]}), "Valid")
+
+        self.assertRaises(Exception, dataComparison.AddDataSet, pd.DataFrame({"Value" : [1.0, 2.0]}), "Invalid")
+        self.assertEqual(dataComparison.NumberOfDataSets, 1)
+        self.assertEqual(len(dataComparison.timeAxes), 1)
+        self.assertEqual(dataComparison.dataSetNames, ["Valid"])
+
+
+    def testDatePlot(self):
+        dataComparison = DataComparison(independentColumn="Date")
+        dates          = pd.date_range("2026-01-01", periods=5000, freq="min")
+        dataComparison.AddDataSet(pd.DataFrame({"Date" : dates, "Value" : np.sin(np.arange(5000)/100)}), "Dates")
+
+        for decimate in [False, True]:
+            # The plot is drawn on the current figure, so start from a new one.
+            plt.close("all")
+            figure, axes = dataComparison.NewComparisonPlot("Value", decimate=decimate)
+            xData        = axes.get_lines()[0].get_xdata()
+            self.assertEqual(np.asarray(xData).dtype.kind, "M")
+            self.assertEqual(xData[0], dates[0])
+
+
+    def testTimeWindow(self):
+        slices = self.dataComparison.GetTimeWindowSlices((10, 20))
+        self.assertEqual(slices[1], slice(1000, 2001))
+
+        dataSets = self.dataComparison.GetTimeWindow((10, 20))
+        self.assertEqual(dataSets[1]["Time"].iloc[0], 10)
+        self.assertEqual(dataSets[1]["Time"].iloc[-1], 20)
+        self.assertEqual(dataSets[1].name, "Model 2")
+        self.assertTrue(np.shares_memory(dataSets[1]["w_bit"].to_numpy(), self.dataComparison.dataSets[1]["w_bit"].to_numpy()))
+
+        self.dataComparison.CreateComparisonPlot("w_bit", window=(10, 20))
+        figure = self.dataComparison.CreateMultiAxisComparisonPlot([["Displacement (revs)"], ["w_bit"]], ["Displacement (revs)", "Velocity (rpm)"], window=(10, 20))
+        self.assertEqual(len(figure.axes[0].get_lines()[-1].get_xdata()), 1001)
+
+
+    def testTimeAxisCache(self):
+        timeAxis = self.dataComparison.GetTimeAxis(1)
+        self.assertEqual(timeAxis.dtype, np.float64)
+        self.assertTrue(timeAxis.flags["C_CONTIGUOUS"])
+        self.assertTrue(self.dataComparison.IsMonotonic(1))
+        self.assertIs(self.dataComparison.GetTimeAxis(1), timeAxis)
+
+        # The PointGrid used for searches is cached with the time axis.
+        self.dataComparison.GetIndex(1, 11.0)
+        pointGrid = self.dataComparison.pointGrids[1]
+        self.assertIs(pointGrid.points, timeAxis)
+        self.dataComparison.GetValues(self.velColumn, [11.0, 12.0], dataSet=1)
+        self.assertIs(self.dataComparison.pointGrids[1], pointGrid)
+
+        # Applying a function invalidates the cache.
+        self.dataComparison.Apply(lambda dataSet: None)
+        self.assertIsNone(self.dataComparison.pointGrids[1])
+        self.assertIsNot(self.dataComparison.GetTimeAxis(1), timeAxis)
+
+
+    def testNotMonotonic(self):
+        dataComparison = DataComparison("Time")
+        dataComparison.AddDataSet(pd.DataFrame({"Time" : [0.0, 2.0, 1.0], "Value" : [1, 2, 3]}), "Not Monotonic")
+        self.assertFalse(dataComparison.IsMonotonic(0))
+        self.assertRaises(Exception, dataComparison.GetIndex, 0, 1.5)
+
+
     def testGetVelocity(self):
         self.assertAlmostEqual(self.dataComparison.GetValue(0, self.velColumn, 11), 38.4657299, places=3)
         self.assertAlmostEqual(self.dataComparison.GetValue(1, self.velColumn, 11), 75.1645423, places=3)
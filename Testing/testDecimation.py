@@ -0,0 +1,70 @@
+"""
+Created on October 18, 2026
+@author: Lance A. Endres
+"""
+import numpy                                                    as np
+import matplotlib.pyplot                                        as plt
+
+from   lendres.algorithms.Decimation                            import Decimation
+from   lendres.plotting.PlotMaker                               import PlotMaker
+import unittest
+
+# More information at:
+# https://docs.python.org/3/library/unittest.html
+
+class TestDecimation(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        generator = np.random.default_rng(1)
+        cls.x     = np.linspace(0, 100, 1000000)
+        cls.y     = np.sin(cls.x) + generator.normal(0, 0.1, len(cls.x))
+
+        # Add a narrow spike that must survive the decimation.
+        cls.y[123457] = 50
+
+
+    def testSize(self):
+        x, y = Decimation.MinMax(self.x, self.y, 800)
+        self.assertLessEqual(len(x), 4*800)
+        self.assertTrue(np.all(np.diff(x) > 0))
+
+
+    def testEnvelope(self):
+        x, y = Decimation.MinMax(self.x, self.y, 800)
+        self.assertEqual(y.max(), 50)
+        self.assertEqual(y.min(), self.y.min())
+        self.assertEqual(x[0], self.x[0])
+        self.assertEqual(x[-1], self.x[-1])
+
+        # Every bucket keeps its minimum and maximum.
+        buckets = np.minimum((self.x / 100 * 800).astype(int), 799)
+        for bucket in [0, 17, 400, 799]:
+            inBucket = buckets == bucket
+            self.assertIn(self.y[inBucket].max(), y)
+            self.assertIn(self.y[inBucket].min(), y)
+
+
+    def testSmallSeries(self):
+        x, y = Decimation.MinMax([1, 2, 3], [4, 5, 6], 800)
+        self.assertEqual(y.tolist(), [4, 5, 6])
+
+
+    def testNotSorted(self):
+        # Bucketed by position.
+        x, y = Decimation.MinMax(self.y, self.y, 100)
+        self.assertLessEqual(len(x), 400)
+        self.assertEqual(y.max(), 50)
+
+
+    def testDecimateForAxes(self):
+        figure, axes = plt.subplots()
+        x, y         = PlotMaker.DecimateForAxes(axes, self.x, self.y, True)
+        self.assertLessEqual(len(x), 4*int(np.ceil(axes.get_window_extent().width)))
+        x, y         = PlotMaker.DecimateForAxes(axes, self.x, self.y, False)
+        self.assertEqual(len(x), len(self.x))
+        plt.close(figure)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,9 +3,12 @@ Created on November 16, 2022
 @author: Lance A. Endres
 """
 import DataSetLoading
+import pandas                                                   as pd
 from   lendres.path.File                                        import File
 
 import os
+import gzip
+import tempfile
 import unittest
 
 
@@ -38,5 +41,240 @@ class TestFile(unittest.TestCase):
         os.remove(combinedOutputPath)
 
 
+    def testCompressedSplitAndCombine(self):
+        with open(TestFile.inputFile, "rb") as file:
+            data = file.read()
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "source.csv.gz")
+            with gzip.open(path, "wb") as file:
+                file.write(data)
+
+            # Compressed input to compressed parts.
+            outputFiles = File.SplitFileByNumberOfLines(path, 2000, True, "{base} part {number}{extension}.xz", blockSize=50000, compressionLevel=1, numberOfWorkers=3)
+            self.assertEqual(outputFiles[0], os.path.join(directory, "source part 1.csv.xz"))
+
+            # Compressed parts to a compressed file and to an uncompressed file.
+            File.CombineFiles("combined.csv.bz2", outputFiles, compressionLevel=1)
+            File.CombineFiles("combined.csv", outputFiles, True)
+
+            with open(os.path.join(directory, "combined.csv"), "rb") as file:
+                self.assertEqual(file.read(), data)
+            with File.OpenFile(os.path.join(directory, "combined.csv.bz2")) as file:
+                self.assertEqual(file.read(), data)
+
+            # Uncompressed input to compressed parts.
+            outputFiles = File.SplitFileBySize(os.path.join(directory, "combined.csv"), numberOfParts=4, outputFileNameFormat="{base} {number}.csv.gz")
+            File.CombineFiles("recombined.csv", outputFiles)
+            with open(os.path.join(directory, "recombined.csv"), "rb") as file:
+                self.assertEqual(file.read(), data)
+
+            self.assertRaises(Exception, File.SplitFileBySize, path, numberOfParts=2)
+
+
+    def testSplitFileByKey(self):
+        data = pd.read_csv(TestFile.inputFile)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "source.csv")
+            data.to_csv(path, index=False)
+
+            outputFiles = File.SplitFileByKey(path, "Location", 5, bufferSize=1000)
+            self.assertEqual(len(outputFiles), 5)
+
+            # Each location is in only one part and no lines are lost.
+            parts = [pd.read_csv(outputFile) for outputFile in outputFiles]
+            locations = [set(part["Location"]) for part in parts]
+            for i in range(len(parts)):
+                for j in range(i+1, len(parts)):
+                    self.assertEqual(len(locations[i] & locations[j]), 0)
+
+            combined = pd.concat(parts).sort_values("S.No.", ignore_index=True)
+            pd.testing.assert_frame_equal(combined, data.sort_values("S.No.", ignore_index=True))
+
+            # The key column by position gives the same parts.
+            outputFiles = File.SplitFileByKey(path, list(data.columns).index("Location"), 5, outputFileNameFormat="{base} position {number}.csv")
+            for outputFile, part in zip(outputFiles, parts):
+                pd.testing.assert_frame_equal(pd.read_csv(outputFile), part)
+
+            # Lines that span many blocks, lines that end at the end of a block, and a last line without a line ending.
+            lines = [b"key,value", b"a," + b"x"*5000, b"b,y", b"c," + b"z"*98, b"a,w"]
+            with open(path, "wb") as file:
+                file.write(b"\n".join(lines))
+
+            outputFiles = File.SplitFileByKey(path, "key", 3, blockSize=100)
+            partLines   = []
+            for outputFile in outputFiles:
+                with open(outputFile, "rb") as file:
+                    self.assertEqual(file.readline(), lines[0] + b"\n")
+                    partLines += file.read().split(b"\n")[:-1]
+            self.assertEqual(sorted(partLines), sorted(lines[1:]))
+
+        # The pieces of a partial line are joined only when its line ending is found.
+        remainder = []
+        self.assertEqual(File._SplitBlockIntoLines(b"ab", remainder), [])
+        self.assertEqual(File._SplitBlockIntoLines(b"cd", remainder), [])
+        self.assertEqual(remainder, [b"ab", b"cd"])
+        self.assertEqual(File._SplitBlockIntoLines(b"e\nf\ng", remainder), [b"abcde", b"f"])
+        self.assertEqual(File._SplitBlockIntoLines(b"\n", remainder), [b"g"])
+        self.assertEqual(remainder, [])
+
+
+    def testSortFiles(self):
+        data = pd.read_csv(TestFile.inputFile)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "source.csv")
+            data.to_csv(path, index=False)
+
+            # Mix compressed and uncompressed parts.  The small memory limit creates many runs and the small merge width
+            # requires more than one merge pass.
+            outputFiles = File.SplitFileByNumberOfLines(path, 1500)
+            outputFiles = [outputFile if i % 2 == 0 else outputFile + ".gz" for i, outputFile in enumerate(outputFiles)]
+            for outputFile in outputFiles[1::2]:
+                with open(outputFile[:-3], "rb") as file, gzip.open(outputFile, "wb") as compressedFile:
+                    compressedFile.write(file.read())
+
+            File.SortFiles("sorted.csv", outputFiles, "Kilometers_Driven", numeric=True, memoryLimit=20000, numberOfWorkers=2, mergeWidth=4)
+            File.SortFiles("sorted by name.csv.gz", outputFiles, 1, memoryLimit=100000, numberOfWorkers=2)
+
+            expected = data.sort_values("Kilometers_Driven", kind="stable", ignore_index=True)
+            pd.testing.assert_frame_equal(pd.read_csv(os.path.join(directory, "sorted.csv")), expected)
+
+            expected = data.sort_values("Name", kind="stable", ignore_index=True, key=lambda names: names.str.encode("utf-8"))
+            pd.testing.assert_frame_equal(pd.read_csv(os.path.join(directory, "sorted by name.csv.gz")), expected)
+
+
+    def testSplitFileBySize(self):
+        with open(TestFile.inputFile, "rb") as file:
+            header = file.readline()
+            data   = file.read()
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "source.csv")
+            with open(path, "wb") as file:
+                file.write(header + data)
+
+            for options in [{"numberOfParts" : 7}, {"partSize" : 100000}]:
+                outputFiles = File.SplitFileBySize(path, hasHeader=True, numberOfWorkers=3, **options)
+
+                if "partSize" in options:
+                    self.assertEqual(len(outputFiles), -(-len(data) // 100000))
+                else:
+                    self.assertEqual(len(outputFiles), 7)
+
+                # Every part starts with the header and has only complete lines.  Together they have all the data.
+                combined = b""
+                for outputFile in outputFiles:
+                    with open(outputFile, "rb") as file:
+                        self.assertEqual(file.readline(), header)
+                        part = file.read()
+                    self.assertTrue(part.endswith(b"\n"))
+                    combined += part
+                    os.remove(outputFile)
+                self.assertEqual(combined, data)
+
+            # More parts than lines.
+            with open(path, "wb") as file:
+                file.write(b"a,b\n1,2\n3,4")
+            outputFiles = File.SplitFileBySize(path, numberOfParts=10)
+            self.assertEqual(len(outputFiles), 2)
+            with open(outputFiles[1], "rb") as file:
+                self.assertEqual(file.read(), b"a,b\n3,4")
+
+
+    def testSplitFileByNumberOfLines(self):
+        with open(TestFile.inputFile, "rb") as file:
+            lines = file.readlines()
+
+        with tempfile.TemporaryDirectory() as directory:
+            # Remove the final line ending to check that a partial last line is kept.
+            path = os.path.join(directory, "source.csv")
+            with open(path, "wb") as file:
+                file.writelines(lines[:-1])
+                file.write(lines[-1].rstrip(b"\n"))
+
+            # A small block size forces the parts to span blocks.
+            outputFiles = File.SplitFileByNumberOfLines(path, 1000, True, "{base}_{number:03d}{extension}", blockSize=10000)
+
+            numberOfParts = -(-(len(lines)-1) // 1000)
+            self.assertEqual(len(outputFiles), numberOfParts)
+            self.assertEqual(outputFiles[0], os.path.join(directory, "source_001.csv"))
+
+            for i, outputFile in enumerate(outputFiles):
+                with open(outputFile, "rb") as file:
+                    partLines = file.readlines()
+                expected = lines[1+i*1000:1+(i+1)*1000]
+                expected[-1] = expected[-1] if i < numberOfParts-1 else expected[-1].rstrip(b"\n")
+                self.assertEqual(partLines, lines[:1] + expected)
+
+            # Compressed parts from an uncompressed file (compressed by range with several workers and by block with one) and
+            # from a compressed file (compressed by block) have the same lines as the uncompressed parts.
+            compressedFiles = File.SplitFileByNumberOfLines(path, 1000, True, "{base}_{number:03d}{extension}.gz", blockSize=10000, compressionLevel=1, numberOfWorkers=3)
+            xzFiles         = File.SplitFileByNumberOfLines(path, 1000, True, "{base}_{number:03d}{extension}.xz", blockSize=10000, compressionLevel=1)
+            File.CombineFiles("source.csv.bz2", compressedFiles[:1] + outputFiles[1:], compressionLevel=1)
+            bz2Files        = File.SplitFileByNumberOfLines(os.path.join(directory, "source.csv.bz2"), 1000, True, "{base}_{number:03d}{extension}.bz2", blockSize=10000, compressionLevel=1, numberOfWorkers=3)
+
+            self.assertEqual(len(compressedFiles), numberOfParts)
+            self.assertEqual(len(bz2Files), numberOfParts)
+            self.assertEqual(len(xzFiles), numberOfParts)
+            for outputFile, compressedFile, bz2File, xzFile in zip(outputFiles, compressedFiles, bz2Files, xzFiles):
+                with open(outputFile, "rb") as file, File.OpenFile(compressedFile) as compressed, File.OpenFile(bz2File) as bz2Compressed, File.OpenFile(xzFile) as xzCompressed:
+                    data = file.read()
+                    self.assertEqual(compressed.read(), data)
+                    self.assertEqual(bz2Compressed.read(), data)
+                    self.assertEqual(xzCompressed.read(), data)
+
+            # Without a header, every line is data.
+            outputFiles = File.SplitFileByNumberOfLines(path, len(lines), False)
+            self.assertEqual(len(outputFiles), 1)
+            self.assertEqual(outputFiles[0], os.path.join(directory, "source part 1.csv"))
+
+
+    def testSplitFileIntoManyParts(self):
+        lines = [b"%d,%s\n" % (i, b"x" * (i % 300)) for i in range(3000)]
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "source.csv")
+            with open(path, "wb") as file:
+                file.writelines(lines)
+
+            # Many parts start in each block.
+            for numberOfLines in [1, 7]:
+                outputFiles = File.SplitFileByNumberOfLines(path, numberOfLines, False, "{base} {number}.csv", blockSize=100000)
+                self.assertEqual(len(outputFiles), -(-len(lines) // numberOfLines))
+                for i, outputFile in enumerate(outputFiles):
+                    with open(outputFile, "rb") as file:
+                        self.assertEqual(file.readlines(), lines[i*numberOfLines:(i+1)*numberOfLines])
+
+        # The line found matches counting each line.
+        block = b"".join(lines)
+        for start, numberOfLines in [(0, 1), (0, 65), (5, 2999), (len(lines[0]), 1000), (0, 3000)]:
+            expected = start - 1
+            for i in range(numberOfLines):
+                expected = block.index(b"\n", expected+1)
+            self.assertEqual(File._FindLineEnd(block, start, numberOfLines), expected+1)
+
+
+    def testCopyBytes(self):
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, "source.bin")
+            output = os.path.join(directory, "output.bin")
+            data   = bytes(range(256)) * 1000
+            with open(source, "wb") as file:
+                file.write(data)
+
+            # The bytes still in the output buffer are written before the copied bytes, and later writes follow them.
+            with File.OpenFile(source) as inputFile, File.OpenFile(output, "wb") as outputFile:
+                outputFile.write(b"start")
+                File._CopyBytes(inputFile, outputFile, 10, 100000, blockSize=1000)
+                outputFile.write(b"middle")
+                File._CopyBytes(inputFile, outputFile, 200000, blockSize=1000)
+                outputFile.write(b"end")
+
+            with open(output, "rb") as file:
+                self.assertEqual(file.read(), b"start" + data[10:100010] + b"middle" + data[200000:] + b"end")
+
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,89 @@
+"""
+Created on October 18, 2026
+@author: Lance A. Endres
+"""
+import DataSetLoading
+from   lendres.path.LineIndex                                   import LineIndex
+
+import os
+import time
+import shutil
+import tempfile
+import unittest
+
+
+class TestLineIndex(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.inputFile = DataSetLoading.GetFileInDataDirectory("used_cars_data.csv")
+
+        with open(cls.inputFile, "rb") as file:
+            cls.lines = file.readlines()
+
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path      = os.path.join(self.directory, "source.csv")
+        shutil.copy(self.inputFile, self.path)
+
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+
+    def testReadLines(self):
+        lineIndex = LineIndex(self.path, 100)
+        self.assertEqual(lineIndex.NumberOfLines, len(self.lines))
+
+        for start, stop in [(0, 1), (5, 17), (99, 101), (1000, 2500), (len(self.lines)-3, len(self.lines)+10)]:
+            self.assertEqual(lineIndex.ReadLines(start, stop), b"".join(self.lines[start:stop]))
+
+        self.assertEqual(lineIndex.GetLineOffset(lineIndex.NumberOfLines), os.path.getsize(self.path))
+        self.assertRaises(Exception, lineIndex.GetLineOffset, lineIndex.NumberOfLines+1)
+
+
+    def testSavedIndex(self):
+        lineIndex = LineIndex(self.path, 100)
+        self.assertTrue(os.path.exists(self.path + ".idx"))
+
+        # The saved index is used.
+        loaded = LineIndex(self.path, 100)
+        self.assertTrue(loaded.Load())
+        self.assertEqual(loaded.NumberOfLines, lineIndex.NumberOfLines)
+        self.assertEqual(loaded.ReadLines(250, 260), b"".join(self.lines[250:260]))
+
+        # A different number of lines per sample or a changed file is not.
+        self.assertFalse(LineIndex(self.path, 50, save=False).Load())
+        self.assertFalse(LineIndex(self.path, 100, indexPath=self.path + ".other", save=False).Load())
+
+        time.sleep(0.01)
+        with open(self.path, "ab") as file:
+            file.write(b"extra line without a line ending")
+
+        self.assertFalse(loaded.Load())
+        lineIndex = LineIndex(self.path, 100)
+        self.assertEqual(lineIndex.NumberOfLines, len(self.lines)+1)
+        self.assertEqual(lineIndex.ReadLines(len(self.lines), len(self.lines)+1), b"extra line without a line ending")
+
+
+    def testByteRanges(self):
+        lineIndex = LineIndex(self.path, 50)
+        ranges    = lineIndex.GetByteRanges(8, firstLine=1)
+        self.assertEqual(len(ranges), 8)
+
+        # The ranges cover the file after the header, start at line starts, and are about the same size.
+        data = b"".join(self.lines[1:])
+        self.assertEqual(b"".join(lineIndex.ReadBytes(start, end) for start, end in ranges), data)
+
+        with open(self.path, "rb") as file:
+            for start, end in ranges:
+                file.seek(start-1)
+                self.assertEqual(file.read(1), b"\n")
+
+        sizes = [end - start for start, end in ranges]
+        self.assertLess(max(sizes) - min(sizes), 2*len(max(self.lines, key=len))*50)
+
+
+if __name__ == "__main__":
+    unittest.main()
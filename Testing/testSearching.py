@@ -3,6 +3,8 @@ Created on Febuary 16, 2022
 @author: Lance A. Endres
 """
 import numpy                                                    as np
+import pandas                                                   as pd
+import weakref
 
 from   lendres.algorithms.Search                                import Search
 import unittest
@@ -53,6 +55,175 @@ class TestBoundingBinarySearch(unittest.TestCase):
 
 
 
+class TestBoundingBinarySearchArray(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.points = [1, 3, 5, 8, 11, 14, 18, 22]
+        cls.items  = [2, 16, 5, 22, 1]
+
+
+    def testIndices(self):
+        lower, upper = Search.BoundingBinarySearchArray(self.items, self.points, returnedUnits="indices")
+        self.assertEqual(lower.tolist(), [0, 5, 2, 7, 0])
+        self.assertEqual(upper.tolist(), [1, 6, 2, 7, 0])
+
+
+    def testValues(self):
+        lower, upper = Search.BoundingBinarySearchArray(self.items, self.points, returnedUnits="values")
+        self.assertEqual(lower.tolist(), [1, 14, 5, 22, 1])
+        self.assertEqual(upper.tolist(), [3, 18, 5, 22, 1])
+
+
+    def testOutOfRange(self):
+        lower, upper = Search.BoundingBinarySearchArray([-2, 10000, 2], self.points, returnedUnits="indices")
+        self.assertTrue(np.isnan(lower[0]) and np.isnan(upper[0]))
+        self.assertTrue(np.isnan(lower[1]) and np.isnan(upper[1]))
+        self.assertEqual(lower[2], 0)
+
+
+    def testMatchesScalarSearch(self):
+        items        = np.linspace(0, 23, 500)
+        lower, upper = Search.BoundingBinarySearchArray(items, self.points)
+        for item, first, last in zip(items, lower, upper):
+            expected = Search.BoundingBinarySearch(item, self.points)
+            np.testing.assert_array_equal([first, last], expected)
+
+
+
+class TestBoundingGridSearch(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.uniformPoints    = np.arange(0, 60.0001, 0.01)
+        cls.nonuniformPoints = np.cumsum(np.random.default_rng(1).uniform(0.5, 1.5, 5000))
+        cls.items            = np.concatenate([np.random.default_rng(2).uniform(-1, 61, 2000), cls.uniformPoints[::7]])
+
+        # Analyze the points once and reuse the PointGrids for the searches.
+        cls.uniformGrid      = Search.GetPointGrid(cls.uniformPoints)
+        cls.nonuniformGrid   = Search.GetPointGrid(cls.nonuniformPoints)
+
+
+    def testIsUniform(self):
+        self.assertTrue(self.uniformGrid.IsUniform)
+        self.assertFalse(self.nonuniformGrid.IsUniform)
+
+
+    def testPointsNotHeld(self):
+        # Nothing is cached, so the points are freed when they are no longer used.
+        points    = np.arange(0, 10.0, 0.5)
+        reference = weakref.ref(points)
+        Search.GetPointGrid(points)
+        self.assertEqual(Search.BoundingGridSearch(2.25, points, isUniform=True), [4, 5])
+        del points
+        self.assertIsNone(reference())
+
+
+    def testUniformMatchesBinarySearch(self):
+        for item in self.items:
+            expected = np.concatenate(Search.BoundingBinarySearchArray(item, self.uniformPoints))
+            np.testing.assert_array_equal(self.uniformGrid.BoundingSearch(item), expected)
+            np.testing.assert_array_equal(Search.BoundingGridSearch(item, self.uniformPoints, isUniform=True), expected)
+
+
+    def testUniformArrayMatchesBinarySearch(self):
+        for returnedUnits in ["indices", "values"]:
+            expected = Search.BoundingBinarySearchArray(self.items, self.uniformPoints, returnedUnits)
+            for result in [self.uniformGrid.BoundingSearchArray(self.items, returnedUnits), Search.BoundingGridSearchArray(self.items, self.uniformPoints, returnedUnits, isUniform=True)]:
+                np.testing.assert_array_equal(result[0], expected[0])
+                np.testing.assert_array_equal(result[1], expected[1])
+
+
+    def testInterpolationMatchesBinarySearch(self):
+        items = np.concatenate([np.linspace(0, self.nonuniformPoints[-1]+1, 3000), self.nonuniformPoints[::11]])
+        for item in items:
+            expected = np.concatenate(Search.BoundingBinarySearchArray(item, self.nonuniformPoints))
+            np.testing.assert_array_equal(self.nonuniformGrid.BoundingSearch(item), expected)
+            np.testing.assert_array_equal(Search.BoundingGridSearch(item, self.nonuniformPoints, isUniform=False), expected)
+
+
+    def testSeries(self):
+        series = pd.Series(np.arange(0, 100.0, 0.5))
+
+        # Without a hint, a binary search is used.
+        self.assertEqual(Search.BoundingGridSearch(10.25, series), [20, 21])
+        self.assertEqual(Search.BoundingGridSearch(10.25, series, isUniform=True), [20, 21])
+
+        # The PointGrid uses the memory of the Series.
+        pointGrid = Search.GetPointGrid(series)
+        self.assertTrue(pointGrid.IsUniform)
+        self.assertTrue(np.shares_memory(pointGrid.points, series.to_numpy()))
+        self.assertEqual(pointGrid.BoundingSearch(10.25), [20, 21])
+
+
+    def testIntegerPoints(self):
+        points    = np.arange(0, 10000, 5)
+        pointGrid = Search.GetPointGrid(points)
+        self.assertTrue(pointGrid.IsUniform)
+        self.assertTrue(np.shares_memory(pointGrid.points, points))
+
+        lower, upper = Search.BoundingGridSearchArray([12, 15, -1], points, returnedUnits="values")
+        np.testing.assert_array_equal(lower, [10, 15, np.nan])
+        np.testing.assert_array_equal(upper, [15, 15, np.nan])
+        self.assertEqual(pointGrid.BoundingSearch(12), [2, 3])
+
+
+    def testList(self):
+        points = [1, 3, 5, 8, 11, 14, 18, 22]
+        self.assertEqual(Search.BoundingGridSearch(16, points), [5, 6])
+        self.assertEqual(Search.BoundingGridSearch(5, points, returnedUnits="values"), [5, 5])
+        self.assertTrue(np.isnan(Search.BoundingGridSearch(23, points)[0]))
+
+
+
+class TestRangeAndNearest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.points = np.array([1, 3, 5, 8, 11, 14, 18, 22])
+
+
+    def testRangeSlice(self):
+        self.assertEqual(Search.RangeSlice(self.points, 3, 11), slice(1, 5))
+        self.assertEqual(Search.RangeSlice(self.points, 4, 10), slice(2, 4))
+        self.assertEqual(self.points[Search.RangeSlice(self.points, 0, 100)].tolist(), self.points.tolist())
+
+
+    def testRangeSliceTolerance(self):
+        self.assertEqual(Search.RangeSlice(self.points, 4, 10, tolerance=1), slice(1, 5))
+
+
+    def testEmptyRange(self):
+        result = Search.RangeSlice(self.points, 15, 17)
+        self.assertEqual(result.start, result.stop)
+        result = Search.RangeSlice(self.points, 100, 200)
+        self.assertEqual(result.start, result.stop)
+
+
+    def testRangeBounds(self):
+        startIndices, stopIndices = Search.RangeBounds(self.points, [0, 5, 12], [4, 14, 13])
+        self.assertEqual(startIndices.tolist(), [0, 2, 5])
+        self.assertEqual(stopIndices.tolist(), [2, 6, 5])
+
+
+    def testNearestIndices(self):
+        result = Search.NearestIndices([-5, 2, 2.5, 6.4, 6.6, 14, 100], self.points)
+        self.assertEqual(result.tolist(), [0, 0, 1, 2, 3, 5, 7])
+
+
+    def testNearestIndicesTolerance(self):
+        result = Search.NearestIndices([-5, 2, 14, 100], self.points, tolerance=1)
+        self.assertTrue(np.isnan(result[0]))
+        self.assertEqual(result[1:3].tolist(), [0, 5])
+        self.assertTrue(np.isnan(result[3]))
+
+
+    def testNearestIndex(self):
+        self.assertEqual(Search.NearestIndex(7, self.points), 3)
+        self.assertTrue(Search.NearestIndex(7, self.points, tolerance=0.5) is np.nan)
+
+
+
 class TestFindIndicesByValues(unittest.TestCase):
 
     @classmethod
@@ -80,5 +251,24 @@ class TestFindIndicesByValues(unittest.TestCase):
         self.assertEqual(len(result), 4)
 
 
+    def testFindInArray(self):
+        result = Search.FindIndicesByValues(np.array(self.numbers), 11, maxCount=2)
+        self.assertEqual(result, [2, 3])
+        self.assertIsInstance(result[0], int)
+
+
+    def testFindInSeries(self):
+        series = pd.Series(self.strings, index=range(100, 113))
+        result = Search.FindIndicesByValues(series, "b")
+        self.assertEqual(result, Search.FindIndicesByValues(self.strings, "b"))
+
+
+    def testFindInLargeArray(self):
+        data   = np.random.default_rng(1).integers(0, 100, 200000)
+        result = Search.FindIndicesByValues(data, 7, maxCount=70000)
+        self.assertEqual(result, np.flatnonzero(data == 7).tolist())
+        self.assertEqual(Search.FindIndicesByValues(data, 7, maxCount=10), result[:10])
+
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
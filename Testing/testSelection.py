@@ -0,0 +1,65 @@
+"""
+Created on October 18, 2026
+@author: Lance A. Endres
+"""
+import numpy                                                    as np
+
+from   lendres.algorithms.Selection                             import Selection
+from   lendres.signalprocessing.SignalProcessing                import SignalProcessing
+import unittest
+
+# More information at:
+# https://docs.python.org/3/library/unittest.html
+
+class TestSelection(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        #               0  1   2   3  4  5  6   7   8   9  10 11 12
+        cls.numbers = [ 1, 3, 11, 11, 5, 8, 5, 11, 14, 18, 22, 3, 3]
+
+
+    def testSmallest(self):
+        indices, values = Selection.Smallest(self.numbers, 4)
+        self.assertEqual(indices.tolist(), [0, 1, 11, 12])
+        self.assertEqual(values.tolist(), [1, 3, 3, 3])
+
+
+    def testLargest(self):
+        indices, values = Selection.Largest(self.numbers, 5)
+        self.assertEqual(indices.tolist(), [10, 9, 8, 2, 3])
+        self.assertEqual(values.tolist(), [22, 18, 14, 11, 11])
+
+
+    def testCountTooLarge(self):
+        indices, values = Selection.Smallest(self.numbers, 100)
+        self.assertEqual(values.tolist(), sorted(self.numbers))
+        indices, values = Selection.Largest(self.numbers, 0)
+        self.assertEqual(len(indices), 0)
+
+
+    def testNotANumber(self):
+        indices, values = Selection.Largest([1.0, np.nan, 3.0, 2.0], 2)
+        self.assertEqual(indices.tolist(), [2, 3])
+
+
+    def testMatchesSort(self):
+        data            = np.random.default_rng(1).integers(0, 1000, 100000)
+        indices, values = Selection.Smallest(data, 500)
+        expected        = np.argsort(data, kind="stable")[:500]
+        self.assertEqual(indices.tolist(), expected.tolist())
+
+        indices, values = Selection.Largest(data, 500)
+        self.assertEqual(values.tolist(), np.sort(data)[::-1][:500].tolist())
+
+
+    def testGetPeaks(self):
+        x                       = np.linspace(0, 4*np.pi, 1000)
+        y                       = np.sin(x) * x
+        peakIndices, peakValues = SignalProcessing.GetPeaks(y, number=2, sortBy="globalheight")
+        self.assertEqual(len(peakIndices), 2)
+        self.assertGreater(peakValues[0], peakValues[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+"""
+Created on October 18, 2026
+@author: Lance A. Endres
+"""
+import numpy                                                    as np
+
+from   lendres.algorithms.SpatialIndex                          import SpatialIndex
+import unittest
+
+# More information at:
+# https://docs.python.org/3/library/unittest.html
+
+class TestSpatialIndex(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        generator         = np.random.default_rng(1)
+        cls.x             = generator.normal(0, 10, 20000)
+        cls.y             = generator.uniform(-5, 5, 20000)
+        cls.spatialIndex  = SpatialIndex(cls.x, cls.y)
+
+
+    def testNearest(self):
+        generator            = np.random.default_rng(2)
+        queryX               = generator.uniform(-60, 60, 500)
+        queryY               = generator.uniform(-10, 10, 500)
+        indices, distances   = self.spatialIndex.Nearest(queryX, queryY)
+
+        for i in range(len(queryX)):
+            allDistances = np.hypot(self.x - queryX[i], self.y - queryY[i])
+            self.assertEqual(indices[i], np.argmin(allDistances))
+            self.assertAlmostEqual(distances[i], allDistances.min())
+
+
+    def testNearestOnPoint(self):
+        indices, distances = self.spatialIndex.Nearest(self.x[:10], self.y[:10])
+        self.assertEqual(indices.tolist(), list(range(10)))
+        self.assertTrue((distances == 0).all())
+
+
+    def testQueryBox(self):
+        result   = self.spatialIndex.QueryBox(-3, -1, 5, 2)
+        expected = np.flatnonzero((self.x >= -3) & (self.x <= 5) & (self.y >= -1) & (self.y <= 2))
+        self.assertEqual(result.tolist(), expected.tolist())
+
+
+    def testQueryBoxes(self):
+        results = self.spatialIndex.QueryBoxes([-100, 200], [-100, 200], [100, 300], [100, 300])
+        self.assertEqual(len(results[0]), len(self.x))
+        self.assertEqual(len(results[1]), 0)
+
+
+    def testNotFinite(self):
+        spatialIndex       = SpatialIndex([0, np.nan, 2, 3], [0, 1, np.inf, 3])
+        self.assertEqual(spatialIndex.NumberOfPoints, 2)
+        indices, distances = spatialIndex.Nearest([2.1], [2.1])
+        self.assertEqual(indices[0], 3)
+
+
+    def testLine(self):
+        spatialIndex       = SpatialIndex(np.arange(100), np.zeros(100))
+        indices, distances = spatialIndex.Nearest([10.4, 10.6, -5], [1, -1, 0])
+        self.assertEqual(indices.tolist(), [10, 11, 0])
+
+
+if __name__ == "__main__":
+    unittest.main()
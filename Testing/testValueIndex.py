@@ -0,0 +1,80 @@
+"""
+Created on October 18, 2026
+@author: Lance A. Endres
+"""
+import numpy                                                    as np
+
+from   lendres.algorithms.Search                                import Search
+from   lendres.algorithms.ValueIndex                            import ValueIndex
+import unittest
+
+# More information at:
+# https://docs.python.org/3/library/unittest.html
+
+class TestValueIndex(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        #                0    1    2    3    4    5    6    7    8    9   10   11   12
+        cls.numbers = [  1,   3,  11,  11,   5,   8,   5,  11,  14,  18,  22,   3,   3]
+        cls.strings = ["a", "b", "c", "b", "b", "d", "d", "e", "a", "a", "b", "b", "b"]
+
+
+    def testFindNumbers(self):
+        valueIndex = ValueIndex(self.numbers)
+        self.assertEqual(valueIndex.GetPositions(3).tolist(), [1, 11, 12])
+        self.assertEqual(valueIndex.GetCount(11), 3)
+
+
+    def testFindStrings(self):
+        valueIndex = ValueIndex(self.strings)
+        self.assertEqual(valueIndex.GetPositions("b").tolist(), Search.FindIndicesByValues(self.strings, "b"))
+        self.assertEqual(valueIndex.GetPositions("b", maxCount=4).tolist(), [1, 3, 4, 10])
+
+
+    def testMissingValue(self):
+        valueIndex = ValueIndex(self.strings)
+        self.assertFalse("z" in valueIndex)
+        self.assertEqual(len(valueIndex.GetPositions("z")), 0)
+
+
+    def testUpdate(self):
+        valueIndex = ValueIndex(self.strings)
+
+        # Append entries.
+        data = self.strings + ["z", "a"]
+        valueIndex.Update(data)
+        self.assertEqual(valueIndex.GetPositions("z").tolist(), [13])
+        self.assertEqual(valueIndex.GetPositions("a").tolist(), [0, 8, 9, 14])
+
+        # Change an entry in the middle and shorten the data.
+        data = list(data[:10])
+        data[2] = "a"
+        valueIndex.Update(data)
+        self.assertFalse("z" in valueIndex)
+        self.assertFalse("c" in valueIndex)
+        for value in set(data):
+            self.assertEqual(valueIndex.GetPositions(value).tolist(), Search.FindIndicesByValues(data, value))
+
+
+    def testLargeData(self):
+        data       = np.random.default_rng(1).integers(0, 10, 10000)
+        valueIndex = ValueIndex(data)
+        for value in range(10):
+            self.assertEqual(valueIndex.GetPositions(value, 25).tolist(), Search.FindIndicesByValues(data, value, 25))
+
+
+    def testUpdateWithoutChanges(self):
+        data       = np.random.default_rng(1).integers(0, 10, 1000)
+        valueIndex = ValueIndex(data)
+        indexed    = valueIndex.data
+
+        # The data is not copied, and equal data does not replace the indexed data.
+        self.assertIs(indexed, data)
+        valueIndex.Update(data.copy())
+        self.assertIs(valueIndex.data, indexed)
+        self.assertEqual(valueIndex.GetPositions(3).tolist(), np.flatnonzero(data == 3).tolist())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+"""
+Created on October 18, 2026
+@author: Lance A. Endres
+"""
+import numpy                                     as np
+
+
+class Decimation():
+    """
+    Algorithms for reducing the number of points in a series while keeping its shape.
+    """
+
+
+    @classmethod
+    def MinMax(cls, x, y, numberOfBuckets:int):
+        """
+        Reduces a series to at most four points per bucket.  The independent (x) range is divided into buckets of equal
+        width and the first, last, minimum, and maximum points of each bucket are kept.
+
+        When the number of buckets is the number of pixels the series spans, the plot of the reduced series is visually
+        the same as the plot of the full series.  The envelope, including all the peaks, is kept.
+
+        Parameters
+        ----------
+        x : array like of float or datetime64
+            The independent values.  Must be sorted (ascending) to bucket by value, otherwise the points are bucketed by position.
+        y : array like of float
+            The dependent values.
+        numberOfBuckets : int
+            The number of buckets.
+
+        Returns
+        -------
+        x, y : numpy.ndarray, numpy.ndarray
+            The reduced series.  If the series is already small enough, it is returned unchanged (as arrays).
+        """
+        x = np.asarray(x)
+        y = np.asarray(y)
+
+        numberOfBuckets = max(int(numberOfBuckets), 1)
+        if len(x) <= 4*numberOfBuckets:
+            return x, y
+
+        # Find the bucket of each point.  Points are bucketed by their x value if the values are sorted, otherwise by position.
+        # Dates and time spans are bucketed by their integer representation.
+        xValues = x.view(np.int64).astype(np.float64) if x.dtype.kind in "mM" else x.astype(np.float64)
+        span    = xValues[-1] - xValues[0]
+        if np.isfinite(span) and span > 0 and np.all(xValues[1:] >= xValues[:-1]):
+            buckets = np.minimum(((xValues - xValues[0]) * (numberOfBuckets / span)).astype(np.int64), numberOfBuckets-1)
+        else:
+            buckets = np.arange(len(x)) * numberOfBuckets // len(x)
+
+        # The buckets are in ascending order, so each one is a contiguous section of the points.
+        starts  = np.flatnonzero(np.diff(buckets, prepend=-1))
+        ends    = np.append(starts[1:], len(x)) - 1
+        counts  = ends - starts + 1
+
+        yValues = y.astype(np.float64)
+        indices = [starts, ends]
+
+        # Find the position of the minimum and maximum in each bucket.  The value is found for each bucket, then the
+        # first point in the bucket with that value.  NaN values are ignored.
+        for function in [np.fmin, np.fmax]:
+            extremes   = function.reduceat(yValues, starts)
+            candidates = np.flatnonzero(yValues == np.repeat(extremes, counts))
+            bucketOf   = np.searchsorted(starts, candidates, side="right") - 1
+            first      = np.flatnonzero(np.diff(bucketOf, prepend=-1))
+            indices.append(candidates[first])
+
+        indices = np.unique(np.concatenate(indices))
+        return x[indices], y[indices]
@@ -0,0 +1,298 @@
+"""
+Created on October 18, 2026
+@author: Lance A. Endres
+"""
+import numpy                                     as np
+import math
+
+
+class PointGrid():
+    """
+    A sorted list of points that is analyzed once so that items can be bounded quickly.
+
+    If the points are uniformly spaced (e.g., a time vector sampled at a fixed rate), the bounding indices are
+    calculated arithmetically in O(1).  Otherwise, an interpolation search is used, which is fast for nearly
+    uniform points.  The interpolation search is limited to a fixed number of steps, after which it falls back
+    to a binary search of the remaining range.
+    """
+
+    def __init__(self, points, isUniform:bool=None, relativeTolerance:float=1e-6):
+        """
+        Constructor.
+
+        Parameters
+        ----------
+        points : array like of int or float
+            A sorted (ascending) list of points.
+        isUniform : bool, optional
+            A hint that specifies if the points are uniformly spaced.  If None, the spacing is checked.  The
+            default is None.
+        relativeTolerance : float, optional
+            The maximum deviation of a point from a uniform grid (as a fraction of the grid spacing) for the points
+            to be considered uniform.  The default is 1e-6.
+
+        Returns
+        -------
+        None.
+        """
+        # The points are kept in their own type (not copied to floats) so that a PointGrid of integer points does not hold a
+        # second copy of them.
+        self.points         = np.asarray(points)
+        if self.points.dtype.kind not in "iuf":
+            self.points     = self.points.astype(np.float64)
+
+        self.start          = float(self.points[0])
+        self.step           = 0.0
+        if len(self.points) > 1:
+            self.step       = (float(self.points[-1]) - self.start) / (len(self.points) - 1)
+
+        if isUniform is None:
+            isUniform = self.CheckIsUniform(self.points, relativeTolerance)
+        self.isUniform      = isUniform and self.step > 0
+
+        # Number of interpolation steps before falling back to a binary search.
+        self.maxIterations  = int(math.log2(len(self.points))) + 1
+
+
+    @property
+    def NumberOfPoints(self):
+        """
+        Gets the number of points.
+
+        Returns
+        -------
+        int
+        """
+        return len(self.points)
+
+
+    @property
+    def IsUniform(self):
+        """
+        Gets if the points are uniformly spaced.
+
+        Returns
+        -------
+        bool
+        """
+        return self.isUniform
+
+
+    @classmethod
+    def CheckIsUniform(cls, points, relativeTolerance:float=1e-6):
+        """
+        Checks if points are uniformly spaced.
+
+        Parameters
+        ----------
+        points : array like of int or float
+            A sorted (ascending) list of points.
+        relativeTolerance : float, optional
+            The maximum deviation of a point from a uniform grid (as a fraction of the grid spacing).  The default is 1e-6.
+
+        Returns
+        -------
+        bool
+            True if the points are uniformly spaced.
+        """
+        points = np.asarray(points, dtype=np.float64)
+        if len(points) < 2:
+            return False
+
+        step = (points[-1] - points[0]) / (len(points) - 1)
+        if not step > 0:
+            return False
+
+        grid = points[0] + step*np.arange(len(points))
+        return np.max(np.abs(points - grid)) <= relativeTolerance*step
+
+
+    def BoundingSearch(self, item, returnedUnits="indices"):
+        """
+        Finds the bounding values for item in the points.
+
+        Parameters
+        ----------
+        item : int or float
+            Item to bound.
+        returnedUnits : string, optional
+            Specifies the context of the returned values. The default is "indices".
+                indices : Returns the indices of the points.
+                values : Returns the bounding values, that is values = points[indices].
+
+        Returns
+        -------
+        list : int or float
+            A list of length two that has either the indices or the values that bound the
+            input "item."  If "item" is in the points, the list will contain two entries that
+            are the same (the index/value).
+
+            If "item" is not in the range of the points, [np.NaN, np.NaN] is returned.
+        """
+        points = self.points
+        last   = len(points) - 1
+
+        # Check for out of range.
+        if item < points[0] or item > points[last]:
+            return [np.nan, np.nan]
+
+        if self.isUniform:
+            first = self._UniformLowerIndex(item)
+        else:
+            first = self._InterpolationLowerIndex(item)
+
+        if points[first] == item:
+            last = first
+        else:
+            last = first + 1
+
+        if returnedUnits == "indices":
+            return [first, last]
+        else:
+            return [points[first], points[last]]
+
+
+    def BoundingSearchArray(self, items, returnedUnits="indices"):
+        """
+        Finds the bounding values for each entry in an array of items.
+
+        Parameters
+        ----------
+        items : array like of int or float
+            Items to bound.
+        returnedUnits : string, optional
+            Specifies the context of the returned values. The default is "indices".
+                indices : Returns the indices of the points.
+                values : Returns the bounding values, that is values = points[indices].
+
+        Returns
+        -------
+        lower, upper : numpy.ndarray of float, numpy.ndarray of float
+            Two arrays the same length as "items" that have either the indices or the values that bound
+            each item.  See Search.BoundingBinarySearchArray.
+        """
+        items  = np.atleast_1d(np.asarray(items, dtype=np.float64))
+        points = self.points
+        last   = len(points) - 1
+
+        if self.isUniform:
+            lower = np.floor((items - self.start) / self.step)
+            lower = np.clip(np.nan_to_num(lower), 0, last).astype(np.int64)
+
+            # Round off can put the calculated index one off from the correct one, so correct it.
+            lower = self._CorrectLowerIndices(items, lower)
+        else:
+            lower = np.clip(np.searchsorted(points, items, side="right") - 1, 0, last)
+
+        upper      = np.where(points[lower] == items, lower, np.minimum(lower+1, last))
+        outOfRange = (items < points[0]) | (items > points[last])
+
+        if returnedUnits == "indices":
+            lower = lower.astype(np.float64)
+            upper = upper.astype(np.float64)
+        else:
+            lower = points[lower].astype(np.float64)
+            upper = points[upper].astype(np.float64)
+
+        lower[outOfRange] = np.nan
+        upper[outOfRange] = np.nan
+
+        return lower, upper
+
+
+    def _UniformLowerIndex(self, item):
+        """
+        Calculates the index of the largest point that is less than or equal to the item for uniform points.
+
+        Parameters
+        ----------
+        item : int or float
+            Item to bound.  Must be in the range of the points.
+
+        Returns
+        -------
+        int
+            The lower bounding index.
+        """
+        points = self.points
+        last   = len(points) - 1
+        index  = min(max(int((item - self.start) / self.step), 0), last)
+
+        # Round off can put the calculated index one off from the correct one, so correct it.
+        while index > 0 and points[index] > item:
+            index -= 1
+        while index < last and points[index+1] <= item:
+            index += 1
+
+        return index
+
+
+    def _CorrectLowerIndices(self, items, lower):
+        """
+        Corrects lower bounding indices that are off due to round off.
+
+        Parameters
+        ----------
+        items : numpy.ndarray of float
+            The items being bounded.
+        lower : numpy.ndarray of int
+            The calculated lower bounding indices.
+
+        Returns
+        -------
+        numpy.ndarray of int
+            The corrected lower bounding indices.
+        """
+        points = self.points
+        last   = len(points) - 1
+
+        while True:
+            tooHigh = (lower > 0) & (points[lower] > items)
+            tooLow  = (lower < last) & (points[np.minimum(lower+1, last)] <= items)
+            if not (tooHigh.any() or tooLow.any()):
+                return lower
+            lower = lower - tooHigh + tooLow
+
+
+    def _InterpolationLowerIndex(self, item):
+        """
+        Finds the index of the largest point that is less than or equal to the item with an interpolation search.
+
+        The interpolation search is limited to a set number of steps.  If the item has not been bounded by then,
+        the remaining range is binary searched.
+
+        Parameters
+        ----------
+        item : int or float
+            Item to bound.  Must be in the range of the points.
+
+        Returns
+        -------
+        int
+            The lower bounding index.
+        """
+        points = self.points
+        low    = 0
+        high   = len(points) - 1
+
+        if item == points[high]:
+            return high
+
+        # The item is always kept in the range points[low] <= item < points[high].
+        for i in range(self.maxIterations):
+            if high - low <= 1:
+                return low
+
+            # Estimate the position by linear interpolation.
+            probe = low + int((item - float(points[low])) * (high - low) / (float(points[high]) - float(points[low])))
+            probe = min(max(probe, low), high-1)
+
+            if points[probe] <= item:
+                if points[probe+1] > item:
+                    return probe
+                low  = probe + 1
+            else:
+                high = probe
+
+        # Fallback to a binary search of what remains.
+        return low + int(np.searchsorted(points[low:high+1], item, side="right")) - 1
@@ -3,6 +3,9 @@ Created on February 16, 2022
 @author: Lance A. Endres
 """
 import numpy                                     as np
+import pandas                                    as pd
+
+from   lendres.algorithms.PointGrid              import PointGrid
 
 class Search():
     """
@@ -77,6 +80,285 @@ class Search():
             return [points[first], points[last]]
 
 
+    @classmethod
+    def BoundingBinarySearchArray(cls, items, points, returnedUnits="indices"):
+        """
+        Finds the bounding values for each entry in an array of items in a sorted list of points.
+
+        This is the vectorized version of BoundingBinarySearch.  The search is done with numpy.searchsorted
+        so all the items are bounded in one call instead of one Python level search per item.
+
+        Parameters
+        ----------
+        items : array like of int or float
+            Items to bound.
+        points : array like of int or float
+            A sorted (ascending) list of points to search through.
+        returnedUnits : string, optional
+            Specifies the context of the returned values. The default is "indices".
+                indices : Returns the indices of the "points" list.
+                values : Returns the bounding values, that is values = points[indices].
+
+        Returns
+        -------
+        lower, upper : numpy.ndarray of float, numpy.ndarray of float
+            Two arrays the same length as "items" that have either the indices or the values that bound
+            each item.  If an item is in "points," the lower and upper entries are the same (the index/value).
+
+            If an item is out of the range of "points," the lower and upper entries are np.nan.  The arrays are
+            always returned as floats so that the out of range entries can be marked, use "astype(int)" on the
+            in range entries to use the indices for indexing.
+        """
+        items  = np.atleast_1d(np.asarray(items, dtype=np.float64))
+        points = np.asarray(points, dtype=np.float64)
+
+        # The right side search gives the index of the first point that is greater than the item, so the
+        # point before it is the lower bound.  If the lower bound is equal to the item, we have an exact hit
+        # and the lower and upper bounds are the same point.
+        upper      = np.searchsorted(points, items, side="right")
+        lower      = upper - 1
+
+        # Check for out of range.
+        outOfRange = (items < points[0]) | (items > points[-1])
+
+        # Clip so the out of range entries can be safely used for indexing.  They are replaced with NaN below.
+        lower      = np.clip(lower, 0, len(points)-1)
+        upper      = np.where(points[lower] == items, lower, np.clip(upper, 0, len(points)-1))
+
+        if returnedUnits == "indices":
+            lower = lower.astype(np.float64)
+            upper = upper.astype(np.float64)
+        else:
+            lower = points[lower]
+            upper = points[upper]
+
+        lower[outOfRange] = np.nan
+        upper[outOfRange] = np.nan
+
+        return lower, upper
+
+
+    @classmethod
+    def GetPointGrid(cls, points, isUniform:bool=None):
+        """
+        Gets the PointGrid for a sorted list of points.
+
+        Creating a PointGrid checks if the points are uniform, which is O(n), so it should be done for points that are
+        searched many times.  The PointGrid is not cached, so it should be kept (e.g., with the points) and reused.  It
+        references the points, so it must be created again if the points are modified.
+
+        Parameters
+        ----------
+        points : array like of int or float
+            A sorted (ascending) list of points.
+        isUniform : bool, optional
+            A hint that specifies if the points are uniformly spaced.  If None, the spacing is checked.  The
+            default is None.
+
+        Returns
+        -------
+        : PointGrid
+            The PointGrid of the points.
+        """
+        if isinstance(points, pd.Series):
+            points = points.to_numpy()
+        return PointGrid(points, isUniform)
+
+
+    @classmethod
+    def BoundingGridSearch(cls, item, points, returnedUnits="indices", isUniform:bool=None):
+        """
+        Finds the bounding values for item in a list of points.
+
+        If a uniform hint is given, a PointGrid is used.  If the points are uniformly spaced, the bounding indices are calculated
+        directly in O(1).  Otherwise, an interpolation search (with a binary search fallback) is used.  See PointGrid.  If no hint
+        is given, a binary search is used because checking the spacing of the points costs more than the search.  To search the
+        same points many times, create a PointGrid with GetPointGrid and keep it.
+
+        Parameters
+        ----------
+        item : int or float
+            Item to bound.
+        points : array like of int or float
+            A sorted (ascending) list of points to search through.
+        returnedUnits : string, optional
+            Specifies the context of the returned values. The default is "indices".
+                indices : Returns the indices of the "points" list.
+                values : Returns the bounding values, that is values = points[indices].
+        isUniform : bool, optional
+            A hint that specifies if the points are uniformly spaced.  The default is None.
+
+        Returns
+        -------
+        list : int or float
+            See BoundingBinarySearch.
+        """
+        if isUniform is None:
+            if isinstance(points, pd.Series):
+                points = points.to_numpy()
+            return cls.BoundingBinarySearch(item, points, returnedUnits)
+
+        return cls.GetPointGrid(points, isUniform).BoundingSearch(item, returnedUnits)
+
+
+    @classmethod
+    def BoundingGridSearchArray(cls, items, points, returnedUnits="indices", isUniform:bool=None):
+        """
+        Finds the bounding values for each entry in an array of items in a list of points.
+
+        If a uniform hint is given, a PointGrid is used and, if the points are uniformly spaced, the bounding indices are
+        calculated directly.  Otherwise, a binary search is used.
+
+        Parameters
+        ----------
+        items : array like of int or float
+            Items to bound.
+        points : array like of int or float
+            A sorted (ascending) list of points to search through.
+        returnedUnits : string, optional
+            Specifies the context of the returned values. The default is "indices".
+                indices : Returns the indices of the "points" list.
+                values : Returns the bounding values, that is values = points[indices].
+        isUniform : bool, optional
+            A hint that specifies if the points are uniformly spaced.  The default is None.
+
+        Returns
+        -------
+        lower, upper : numpy.ndarray of float, numpy.ndarray of float
+            See BoundingBinarySearchArray.
+        """
+        if isUniform is None:
+            return cls.BoundingBinarySearchArray(items, points, returnedUnits)
+
+        return cls.GetPointGrid(points, isUniform).BoundingSearchArray(items, returnedUnits)
+
+
+    @classmethod
+    def RangeBounds(cls, points, starts, ends, tolerance:float=0.0):
+        """
+        Finds the positional bounds of the points that are in each of a set of ranges.
+
+        For each range, the points at positions starts[i] <= position < stops[i] satisfy
+        starts[i] - tolerance <= point <= ends[i] + tolerance.
+
+        Parameters
+        ----------
+        points : array like of int or float
+            A sorted (ascending) list of points to search through.
+        starts : array like of int or float
+            The start (lowest value) of each range.
+        ends : array like of int or float
+            The end (highest value) of each range.
+        tolerance : float, optional
+            Amount the ranges are expanded by on each side. The default is 0.0.
+
+        Returns
+        -------
+        startIndices, stopIndices : numpy.ndarray of int, numpy.ndarray of int
+            The first index in each range and one past the last index in each range.  If no points are in
+            a range, the start and stop indices are equal.
+        """
+        points       = np.asarray(points)
+        starts       = np.atleast_1d(np.asarray(starts, dtype=np.float64)) - tolerance
+        ends         = np.atleast_1d(np.asarray(ends, dtype=np.float64)) + tolerance
+
+        startIndices = np.searchsorted(points, starts, side="left")
+        stopIndices  = np.maximum(np.searchsorted(points, ends, side="right"), startIndices)
+
+        return startIndices, stopIndices
+
+
+    @classmethod
+    def RangeSlice(cls, points, start, end, tolerance:float=0.0):
+        """
+        Finds the points that are in a range.
+
+        Parameters
+        ----------
+        points : array like of int or float
+            A sorted (ascending) list of points to search through.
+        start : int or float
+            The start (lowest value) of the range.
+        end : int or float
+            The end (highest value) of the range.
+        tolerance : float, optional
+            Amount the range is expanded by on each side. The default is 0.0.
+
+        Returns
+        -------
+        : slice
+            A positional slice of the points in the range.  Using the slice on an array (or with pandas.DataFrame.iloc)
+            returns a view instead of a copy.
+        """
+        startIndices, stopIndices = cls.RangeBounds(points, start, end, tolerance)
+        return slice(int(startIndices[0]), int(stopIndices[0]))
+
+
+    @classmethod
+    def NearestIndices(cls, items, points, tolerance:float=None):
+        """
+        Finds the index of the point closest to each item.
+
+        Parameters
+        ----------
+        items : array like of int or float
+            Items to find the closest points to.
+        points : array like of int or float
+            A sorted (ascending) list of points to search through.
+        tolerance : float, optional
+            The maximum distance between an item and its closest point.  If None, the closest point is
+            always returned.  The default is None.
+
+        Returns
+        -------
+        indices : numpy.ndarray of float
+            The index of the closest point to each item.  If two points are equally close, the lower index is
+            returned.  If the closest point is further than the tolerance, the entry is np.nan.  The indices are
+            returned as floats so that those entries can be marked.
+        """
+        items   = np.atleast_1d(np.asarray(items, dtype=np.float64))
+        points  = np.asarray(points, dtype=np.float64)
+        last    = len(points) - 1
+
+        # The points on either side of each item.
+        upper   = np.clip(np.searchsorted(points, items, side="left"), 0, last)
+        lower   = np.clip(upper - 1, 0, last)
+
+        indices = np.where(np.abs(items - points[lower]) <= np.abs(points[upper] - items), lower, upper).astype(np.float64)
+
+        if tolerance is not None:
+            indices[np.abs(points[indices.astype(np.int64)] - items) > tolerance] = np.nan
+
+        return indices
+
+
+    @classmethod
+    def NearestIndex(cls, item, points, tolerance:float=None):
+        """
+        Finds the index of the point closest to an item.
+
+        Parameters
+        ----------
+        item : int or float
+            Item to find the closest point to.
+        points : array like of int or float
+            A sorted (ascending) list of points to search through.
+        tolerance : float, optional
+            The maximum distance between the item and the closest point.  If None, the closest point is
+            always returned.  The default is None.
+
+        Returns
+        -------
+        : int
+            The index of the closest point.  If the closest point is further than the tolerance, np.nan is returned.
+        """
+        index = cls.NearestIndices(item, points, tolerance)[0]
+
+        if np.isnan(index):
+            return np.nan
+        return int(index)
+
+
     @classmethod
     def FindIndicesByValues(cls, data, searchValue, maxCount=None):
         """
@@ -103,6 +385,13 @@ class Search():
         if maxCount == None:
             maxCount = len(data)
 
+        # NumPy arrays and pandas Series are searched in vectorized chunks.
+        if isinstance(data, pd.Series):
+            data = data.to_numpy()
+
+        if isinstance(data, np.ndarray) and data.ndim == 1:
+            return cls._FindIndicesByValuesInArray(data, searchValue, maxCount)
+
         foundCount  = 0
         indices     = []
 
@@ -115,4 +404,44 @@ class Search():
                 if foundCount == maxCount:
                     break
 
-        return indices
\ No newline at end of file
+        return indices
+
+
+    @classmethod
+    def _FindIndicesByValuesInArray(cls, data:np.ndarray, searchValue, maxCount:int, chunkSize:int=65536):
+        """
+        Searches a numpy array to find the indices of entries that match a specified value.
+
+        The array is compared in chunks so that the search can stop as soon as "maxCount" entries are found
+        without comparing the rest of the array.  The chunks start small and double in size up to "chunkSize."
+
+        Parameters
+        ----------
+        data : numpy.ndarray
+            One dimensional data to search through.
+        searchValue : string, numeric
+            Value to match in the data.
+        maxCount : integer
+            The maximum number of entries to returned.
+        chunkSize : integer, optional
+            The maximum number of entries compared at a time.  The default is 65536.
+
+        Returns
+        -------
+        indices : list of integers
+            The indices of all matched values.
+        """
+        indices = []
+        start   = 0
+
+        # Start with a small chunk and grow it up to the chunk size.  This keeps the cost low when the
+        # matches are found near the start of the array.
+        size    = min(1024, chunkSize)
+
+        while start < len(data) and len(indices) < maxCount:
+            found = np.flatnonzero(data[start:start+size] == searchValue)
+            indices.extend((found[:maxCount-len(indices)] + start).tolist())
+            start += size
+            size   = min(2*size, chunkSize)
+
+        return indices
@@ -0,0 +1,117 @@
+"""
+Created on October 18, 2026
+@author: Lance A. Endres
+"""
+import numpy                                     as np
+
+
+class Selection():
+    """
+    Selection algorithms.
+
+    Selects the smallest or largest entries without sorting all the data.  The selection is done with a partition,
+    which is O(n), and then only the selected entries are sorted.
+    """
+
+
+    @classmethod
+    def Smallest(cls, values, count:int):
+        """
+        Selects the smallest entries.
+
+        Parameters
+        ----------
+        values : array like of int or float
+            The values to select from.  NaN values are ignored.
+        count : int
+            The number of entries to select.  If larger than the number of values, all the values are returned.
+
+        Returns
+        -------
+        indices, selected : numpy.ndarray of int, numpy.ndarray
+            The positions of the selected entries in "values" and the selected values.  Sorted from smallest to
+            largest.  Equal values are ordered by position (the selection is stable).
+        """
+        return cls._Select(values, count, largest=False)
+
+
+    @classmethod
+    def Largest(cls, values, count:int):
+        """
+        Selects the largest entries.
+
+        Parameters
+        ----------
+        values : array like of int or float
+            The values to select from.  NaN values are ignored.
+        count : int
+            The number of entries to select.  If larger than the number of values, all the values are returned.
+
+        Returns
+        -------
+        indices, selected : numpy.ndarray of int, numpy.ndarray
+            The positions of the selected entries in "values" and the selected values.  Sorted from largest to
+            smallest.  Equal values are ordered by position (the selection is stable).
+        """
+        return cls._Select(values, count, largest=True)
+
+
+    @classmethod
+    def _Select(cls, values, count:int, largest:bool):
+        """
+        Selects the smallest or largest entries.
+
+        Parameters
+        ----------
+        values : array like of int or float
+            The values to select from.
+        count : int
+            The number of entries to select.
+        largest : bool
+            If True, the largest entries are selected, otherwise the smallest are.
+
+        Returns
+        -------
+        indices, selected : numpy.ndarray of int, numpy.ndarray
+            The positions of the selected entries in "values" and the selected values.
+        """
+        values    = np.asarray(values)
+        positions = None
+
+        # Remove NaN values, but keep track of where the remaining values came from.
+        if values.dtype.kind == "f":
+            isNumber = ~np.isnan(values)
+            if not isNumber.all():
+                positions = np.flatnonzero(isNumber)
+                values    = values[positions]
+
+        count = min(max(int(count), 0), len(values))
+
+        if count == 0:
+            return np.empty(0, dtype=np.int64), values[:0]
+
+        # The partition gives the value at the edge of the selection.  Everything beyond it is selected and
+        # only the first of the values equal to it (by position) are selected to fill the count.  This makes
+        # the selection stable, which a plain argpartition is not.
+        if largest:
+            threshold = np.partition(values, len(values)-count)[len(values)-count]
+            beyond    = np.flatnonzero(values > threshold)
+        else:
+            threshold = np.partition(values, count-1)[count-1]
+            beyond    = np.flatnonzero(values < threshold)
+
+        equal   = np.flatnonzero(values == threshold)[:count-len(beyond)]
+        indices = np.concatenate((beyond, equal))
+
+        # Sort the selection by value then position.
+        if largest:
+            indices = indices[np.lexsort((-indices, values[indices]))[::-1]]
+        else:
+            indices = indices[np.lexsort((indices, values[indices]))]
+
+        selected = values[indices]
+
+        if positions is not None:
+            indices = positions[indices]
+
+        return indices, selected
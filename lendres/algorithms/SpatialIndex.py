@@ -0,0 +1,337 @@
+"""
+Created on October 18, 2026
+@author: Lance A. Endres
+"""
+import numpy                                     as np
+import math
+
+
+class SpatialIndex():
+    """
+    A two dimensional spatial index of points.
+
+    The points are bucketed into a uniform grid of cells.  The points are stored sorted by cell (row major), so the
+    points in a row of cells are contiguous.  Queries only examine the cells around the query location instead of
+    every point.
+
+    The distances are calculated in the units of the points.  If the x and y values have different scales (e.g., points
+    on a plot), convert them to a common scale (e.g., display coordinates) before creating the index.
+    """
+
+    def __init__(self, x, y, pointsPerCell:int=4):
+        """
+        Constructor.
+
+        Parameters
+        ----------
+        x : array like of float
+            The x values of the points.
+        y : array like of float
+            The y values of the points.
+        pointsPerCell : int, optional
+            The average number of points in each cell.  Used to set the grid size.  The default is 4.
+
+        Returns
+        -------
+        None.
+        """
+        self.x          = np.asarray(x, dtype=np.float64).ravel()
+        self.y          = np.asarray(y, dtype=np.float64).ravel()
+
+        if len(self.x) != len(self.y):
+            raise Exception("The x and y values must be the same length.")
+
+        # Points that are not finite (NaN or infinite) are not indexed.
+        positions       = np.flatnonzero(np.isfinite(self.x) & np.isfinite(self.y))
+
+        self.xMin       = 0.0
+        self.yMin       = 0.0
+        width           = 1.0
+        height          = 1.0
+        if len(positions) > 0:
+            self.xMin   = self.x[positions].min()
+            self.yMin   = self.y[positions].min()
+            width       = self.x[positions].max() - self.xMin
+            height      = self.y[positions].max() - self.yMin
+
+        # Size the grid so that the cells are approximately square and hold the requested number of points.
+        numberOfCells   = max(1, len(positions) // max(1, pointsPerCell))
+        if width > 0 and height > 0:
+            self.columns = max(1, int(round(math.sqrt(numberOfCells * width / height))))
+            self.rows    = max(1, int(round(numberOfCells / self.columns)))
+        elif width > 0:
+            self.columns, self.rows = numberOfCells, 1
+        else:
+            self.columns, self.rows = 1, numberOfCells
+
+        self.cellWidth  = width / self.columns if width > 0 else 1.0
+        self.cellHeight = height / self.rows if height > 0 else 1.0
+
+        # Sort the points by cell.  The cell starts are the position in the sorted order that each cell starts at, so the
+        # points in cell "i" are self.order[self.cellStarts[i]:self.cellStarts[i+1]].
+        columns, rows   = self._GetCells(self.x[positions], self.y[positions])
+        cells           = rows*self.columns + columns
+        sortOrder       = np.argsort(cells, kind="stable")
+        self.order      = positions[sortOrder]
+        self.cellStarts = np.concatenate(([0], np.cumsum(np.bincount(cells, minlength=self.rows*self.columns))))
+
+
+    @property
+    def NumberOfPoints(self):
+        """
+        Gets the number of indexed points.
+
+        Returns
+        -------
+        int
+        """
+        return len(self.order)
+
+
+    def QueryBox(self, xMin:float, yMin:float, xMax:float, yMax:float):
+        """
+        Finds the points inside of a box.
+
+        Parameters
+        ----------
+        xMin : float
+            Minimum x value of the box.
+        yMin : float
+            Minimum y value of the box.
+        xMax : float
+            Maximum x value of the box.
+        yMax : float
+            Maximum y value of the box.
+
+        Returns
+        -------
+        indices : numpy.ndarray of int
+            The indices (in ascending order) of the points inside of the box (including the edges).
+        """
+        if xMin > xMax or yMin > yMax or self.NumberOfPoints == 0:
+            return np.empty(0, dtype=np.int64)
+
+        columns, rows = self._GetCells(np.array([xMin, xMax]), np.array([yMin, yMax]))
+        candidates    = self._GetPointsInCells(columns[0], columns[1], rows[0], rows[1])
+
+        x             = self.x[candidates]
+        y             = self.y[candidates]
+        inside        = (x >= xMin) & (x <= xMax) & (y >= yMin) & (y <= yMax)
+
+        return np.sort(candidates[inside])
+
+
+    def QueryBoxes(self, xMins, yMins, xMaxs, yMaxs):
+        """
+        Finds the points inside of each of a set of boxes.
+
+        Parameters
+        ----------
+        xMins : array like of float
+            Minimum x value of each box.
+        yMins : array like of float
+            Minimum y value of each box.
+        xMaxs : array like of float
+            Maximum x value of each box.
+        yMaxs : array like of float
+            Maximum y value of each box.
+
+        Returns
+        -------
+        : list of numpy.ndarray of int
+            The indices of the points inside of each box.  See QueryBox.
+        """
+        return [self.QueryBox(*box) for box in zip(xMins, yMins, xMaxs, yMaxs)]
+
+
+    def Nearest(self, x, y):
+        """
+        Finds the point closest to each query location.
+
+        Parameters
+        ----------
+        x : array like of float
+            The x values of the query locations.
+        y : array like of float
+            The y values of the query locations.
+
+        Returns
+        -------
+        indices, distances : numpy.ndarray of int, numpy.ndarray of float
+            The index of the closest point to each location and the distance to it.  If two points are equally close,
+            the lower index is returned.  If there are no points, the indices are -1 and the distances are infinite.
+        """
+        x         = np.atleast_1d(np.asarray(x, dtype=np.float64))
+        y         = np.atleast_1d(np.asarray(y, dtype=np.float64))
+
+        indices   = np.full(len(x), -1, dtype=np.int64)
+        distances = np.full(len(x), np.inf)
+
+        if self.NumberOfPoints == 0:
+            return indices, distances
+
+        columns, rows = self._GetCells(x, y)
+
+        for i in range(len(x)):
+            indices[i], distances[i] = self._Nearest(x[i], y[i], columns[i], rows[i])
+
+        return indices, distances
+
+
+    def _Nearest(self, x:float, y:float, column:int, row:int):
+        """
+        Finds the point closest to a location.
+
+        The cells are searched in square rings around the starting cell.  The search stops when the closest point found
+        is closer than any point outside of the searched cells could be.
+
+        Parameters
+        ----------
+        x : float
+            The x value of the query location.
+        y : float
+            The y value of the query location.
+        column : int
+            The column of the starting cell.
+        row : int
+            The row of the starting cell.
+
+        Returns
+        -------
+        index, distance : int, float
+            The index of the closest point and the distance to it.
+        """
+        bestIndex    = -1
+        bestDistance = np.inf
+        ring         = 0
+
+        while True:
+            # Range of cells searched so far (including this ring).
+            column0 = max(column-ring, 0)
+            column1 = min(column+ring, self.columns-1)
+            row0    = max(row-ring, 0)
+            row1    = min(row+ring, self.rows-1)
+
+            candidates = self._GetRingPoints(column, row, ring)
+
+            if len(candidates) > 0:
+                distances = np.hypot(self.x[candidates] - x, self.y[candidates] - y)
+                minimum   = distances.min()
+                if minimum <= bestDistance:
+                    index = candidates[distances == minimum].min()
+                    if minimum < bestDistance or index < bestIndex:
+                        bestIndex, bestDistance = index, minimum
+
+            # The distance from the location to the closest cell that has not been searched.  An edge of the searched
+            # cells that is also the edge of the grid has nothing beyond it.
+            bound = np.inf
+            if column0 > 0:
+                bound = min(bound, x - (self.xMin + column0*self.cellWidth))
+            if column1 < self.columns-1:
+                bound = min(bound, self.xMin + (column1+1)*self.cellWidth - x)
+            if row0 > 0:
+                bound = min(bound, y - (self.yMin + row0*self.cellHeight))
+            if row1 < self.rows-1:
+                bound = min(bound, self.yMin + (row1+1)*self.cellHeight - y)
+
+            if bestDistance < bound or bound == np.inf:
+                return bestIndex, bestDistance
+
+            ring += 1
+
+
+    def _GetCells(self, x, y):
+        """
+        Gets the cells that contain locations.  Locations outside of the grid are put in the closest cell.
+
+        Parameters
+        ----------
+        x : numpy.ndarray of float
+            The x values of the locations.
+        y : numpy.ndarray of float
+            The y values of the locations.
+
+        Returns
+        -------
+        columns, rows : numpy.ndarray of int, numpy.ndarray of int
+            The column and row of the cell of each location.
+        """
+        columns = np.floor(np.nan_to_num((x - self.xMin) / self.cellWidth))
+        rows    = np.floor(np.nan_to_num((y - self.yMin) / self.cellHeight))
+        columns = np.clip(columns, 0, self.columns-1).astype(np.int64)
+        rows    = np.clip(rows, 0, self.rows-1).astype(np.int64)
+        return columns, rows
+
+
+    def _GetPointsInCells(self, column0:int, column1:int, row0:int, row1:int):
+        """
+        Gets the points in a rectangle of cells.
+
+        Parameters
+        ----------
+        column0 : int
+            First column.
+        column1 : int
+            Last column (inclusive).
+        row0 : int
+            First row.
+        row1 : int
+            Last row (inclusive).
+
+        Returns
+        -------
+        : numpy.ndarray of int
+            The indices of the points.
+        """
+        # The cells in a row are contiguous, so each row of cells is one slice.
+        slices = [
+            self.order[self.cellStarts[row*self.columns+column0]:self.cellStarts[row*self.columns+column1+1]]
+            for row in range(row0, row1+1)
+        ]
+        return np.concatenate(slices) if len(slices) > 0 else np.empty(0, dtype=np.int64)
+
+
+    def _GetRingPoints(self, column:int, row:int, ring:int):
+        """
+        Gets the points in the cells that form a square ring around a cell.
+
+        Parameters
+        ----------
+        column : int
+            Column of the center cell.
+        row : int
+            Row of the center cell.
+        ring : int
+            Distance (in cells) of the ring from the center cell.  A ring of 0 is the center cell.
+
+        Returns
+        -------
+        : numpy.ndarray of int
+            The indices of the points.
+        """
+        column0 = max(column-ring, 0)
+        column1 = min(column+ring, self.columns-1)
+        row0    = max(row-ring, 0)
+        row1    = min(row+ring, self.rows-1)
+
+        if ring == 0:
+            return self._GetPointsInCells(column, column, row, row)
+
+        points = []
+
+        # Top and bottom rows of the ring, if they are in the grid.
+        if row-ring >= 0:
+            points.append(self._GetPointsInCells(column0, column1, row-ring, row-ring))
+        if row+ring < self.rows:
+            points.append(self._GetPointsInCells(column0, column1, row+ring, row+ring))
+
+        # Left and right columns of the ring (without the corners), if they are in the grid.
+        innerRow0 = max(row-ring+1, 0)
+        innerRow1 = min(row+ring-1, self.rows-1)
+        if innerRow0 <= innerRow1:
+            if column-ring >= 0:
+                points.append(self._GetPointsInCells(column-ring, column-ring, innerRow0, innerRow1))
+            if column+ring < self.columns:
+                points.append(self._GetPointsInCells(column+ring, column+ring, innerRow0, innerRow1))
+
+        return np.concatenate(points) if len(points) > 0 else np.empty(0, dtype=np.int64)
@@ -0,0 +1,209 @@
+"""
+Created on October 18, 2026
+@author: Lance A. Endres
+"""
+import numpy                                     as np
+
+
+class ValueIndex():
+    """
+    An index that maps each distinct value in an array like object to the positions it occurs at.
+
+    The index is built once and then queried many times.  Each query for the first "k" positions of a value
+    is O(k) instead of a scan of the entire data.  If the data changes, the index can be updated and only the
+    part of the data that changed is re-indexed.
+
+    The indexed data is referenced, not copied.  Changes are found by comparing new data to the indexed data, so
+    data that is modified in place must be indexed again with a new ValueIndex.
+    """
+
+    def __init__(self, data):
+        """
+        Constructor.
+
+        Parameters
+        ----------
+        data : array like
+            Data to index.
+
+        Returns
+        -------
+        None.
+        """
+        self.data      = np.empty(0)
+        self.positions = {}
+        self.Update(data)
+
+
+    def __len__(self):
+        """
+        Gets the number of entries in the indexed data.
+
+        Returns
+        -------
+        int
+        """
+        return len(self.data)
+
+
+    def __contains__(self, value):
+        """
+        Checks if a value is in the indexed data.
+
+        Parameters
+        ----------
+        value : string, numeric
+            Value to check.
+
+        Returns
+        -------
+        bool
+        """
+        return value in self.positions
+
+
+    @property
+    def Values(self):
+        """
+        Gets the distinct values in the indexed data.
+
+        Returns
+        -------
+        list
+        """
+        return list(self.positions.keys())
+
+
+    def GetCount(self, value):
+        """
+        Gets the number of times a value occurs in the indexed data.
+
+        Parameters
+        ----------
+        value : string, numeric
+            Value to count.
+
+        Returns
+        -------
+        int
+        """
+        return len(self.positions.get(value, ()))
+
+
+    def GetPositions(self, value, maxCount=None):
+        """
+        Gets the positions (indices) of the entries that match a specified value.
+
+        Parameters
+        ----------
+        value : string, numeric
+            Value to match in the data.
+        maxCount : integer, optional
+            The maximum number of positions to return.  The first "maxCount" positions are returned.  If
+            None, all the positions are returned.  The default is None.
+
+        Returns
+        -------
+        positions : numpy.ndarray of int
+            The positions of the matched values in ascending order.  The array is a view into the index and
+            should not be modified.
+        """
+        positions = self.positions.get(value)
+
+        if positions is None:
+            return np.empty(0, dtype=np.int64)
+
+        if maxCount is None:
+            return positions
+        return positions[:maxCount]
+
+
+    def Update(self, data):
+        """
+        Updates the index to match new data.
+
+        The new data is compared to the indexed data and only the entries after the first difference
+        are re-indexed.  Appending to the data, for example, only indexes the appended entries.
+
+        Parameters
+        ----------
+        data : array like
+            The new data to index.
+
+        Returns
+        -------
+        None.
+        """
+        data   = np.asarray(data)
+
+        # Find the first position where the old and new data differ.
+        length = min(len(self.data), len(data))
+        start  = length
+        if self.data.dtype.kind != data.dtype.kind:
+            start = 0
+        elif length > 0:
+            differences = np.flatnonzero(self.data[:length] != data[:length])
+            if len(differences) > 0:
+                start = differences[0]
+
+        # Nothing changed, so the indexed data is kept.
+        if start == len(self.data) and start == len(data):
+            return
+
+        # Remove the positions at and after the first difference.  The positions are sorted, so they can be
+        # truncated with a binary search.
+        if start < len(self.data):
+            for value in list(self.positions.keys()):
+                positions = self.positions[value]
+                count     = np.searchsorted(positions, start)
+                if count == 0:
+                    del self.positions[value]
+                elif count < len(positions):
+                    self.positions[value] = positions[:count]
+
+        # Index the new entries and merge them into the existing positions.
+        for value, positions in self._GroupPositions(data[start:], start).items():
+            if value in self.positions:
+                self.positions[value] = np.concatenate((self.positions[value], positions))
+            else:
+                self.positions[value] = positions
+
+        self.data = data
+
+
+    @classmethod
+    def _GroupPositions(cls, data, offset):
+        """
+        Groups the positions of the data by value.
+
+        Parameters
+        ----------
+        data : numpy.ndarray
+            Data to group.
+        offset : int
+            Offset added to the positions.  Used when indexing a section of a larger array.
+
+        Returns
+        -------
+        : dict
+            A dictionary of value to the (sorted) positions of that value.
+        """
+        if len(data) == 0:
+            return {}
+
+        try:
+            values, inverse = np.unique(data, return_inverse=True)
+        except TypeError:
+            # Mixed types that cannot be sorted are grouped one entry at a time.
+            groups = {}
+            for i, value in enumerate(data.tolist()):
+                groups.setdefault(value, []).append(i+offset)
+            return {value : np.asarray(positions, dtype=np.int64) for value, positions in groups.items()}
+
+        # A stable sort of the value numbers keeps the positions of each value in ascending order.
+        inverse   = inverse.ravel()
+        order     = np.argsort(inverse, kind="stable").astype(np.int64) + offset
+        counts    = np.bincount(inverse, minlength=len(values))
+        groups    = np.split(order, np.cumsum(counts)[:-1])
+
+        return dict(zip(values.tolist(), groups))
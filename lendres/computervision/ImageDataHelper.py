@@ -6,12 +6,14 @@ from   matplotlib                                                    import pypl
 import seaborn                                                       as sns
 import pandas                                                        as pd
 import numpy                                                         as np
+import weakref
 
 from   lendres.io.ConsoleHelper                                      import ConsoleHelper
 from   lendres.TensorFlowDataHelper                                  import TensorFlowDataHelper
 from   lendres.plotting.PlotHelper                                   import PlotHelper
 from   lendres.UnivariateAnalysis                                    import UnivariateAnalysis
-from   lendres.Algorithms                                            import FindIndicesByValues
+from   lendres.algorithms.Search                                     import Search
+from   lendres.algorithms.ValueIndex                                 import ValueIndex
 from   lendres.ImageHelper                                           import ImageHelper
 from   lendres.TensorFlowDataHelperFunctions                         import TensorFlowDataHelperFunctions
 
@@ -54,6 +56,10 @@ class ImageDataHelper(TensorFlowDataHelper):
 
         self.colorConversion         = None
 
+        # Indices of the label values, stored by data set name with a reference to the labels they were built from and their
+        # length.  Built as needed.
+        self.labelIndices            = {}
+
 
     def CopyFrom(self, dataHelper):
         """
@@ -75,6 +81,7 @@ class ImageDataHelper(TensorFlowDataHelper):
         self.numberOfLabelCategories = dataHelper.numberOfLabelCategories
 
         self.colorConversion         = dataHelper.colorConversion
+        self.InvalidateLabelIndex()
 
 
     def LoadImagesFromNumpyArray(self, inputFile):
@@ -114,6 +121,7 @@ class ImageDataHelper(TensorFlowDataHelper):
 
         uniqueLabels = self.labels["Names"].unique().categories.tolist()
         self.SetLabelCategories(uniqueLabels)
+        self.InvalidateLabelIndex()
 
 
     def LoadLabelNumbersFromCsv(self, inputFile, labelCategories):
@@ -138,6 +146,7 @@ class ImageDataHelper(TensorFlowDataHelper):
 
         self.labels["Names"] = labels
         self.labels["Names"] = self.labels["Names"].astype("category")
+        self.InvalidateLabelIndex()
 
 
     def SetLabelCategories(self, labelCategories):
@@ -286,6 +295,87 @@ class ImageDataHelper(TensorFlowDataHelper):
         ImageHelper.CreateImageArrayPlot(images, labels, columns, self.colorConversion)
 
 
+    def GetLabelIndex(self, dataSet="original"):
+        """
+        Gets an index of the label values of a data set.  The index is built the first time it is requested.  It is
+        updated (only the changed entries) if the labels are replaced or their length changes.  If the labels are modified
+        in place, call InvalidateLabelIndex.
+
+        Parameters
+        ----------
+        dataSet : string
+            The data set to index the labels of.
+
+        Returns
+        -------
+        : ValueIndex
+            The index of the label values.
+        """
+        xData, yData = self.GetDataSet(dataSet)
+
+        # Pandas can return a new Series each time a column is accessed, so the original labels are identified by the DataFrame
+        # that holds them.
+        source = self.labels if dataSet == "original" else yData
+        cached = self.labelIndices.get(dataSet)
+
+        if cached is not None:
+            reference, length, valueIndex = cached
+            if reference() is source and length == len(yData):
+                return valueIndex
+
+        # Comparing the labels to the index is a scan of all the labels, so it is only done if the labels were replaced.
+        labels = np.asarray(yData)
+        if cached is None:
+            valueIndex = ValueIndex(labels)
+        else:
+            valueIndex.Update(labels)
+
+        self.labelIndices[dataSet] = (self._GetReference(source), len(labels), valueIndex)
+        return valueIndex
+
+
+    @classmethod
+    def _GetReference(cls, value):
+        """
+        Gets a reference to an object that is used to check if it is the same object later.
+
+        Parameters
+        ----------
+        value : object
+            The object.
+
+        Returns
+        -------
+        : function
+            A function that returns the object, or None if a weakly referenced object was freed.
+        """
+        try:
+            return weakref.ref(value)
+        except TypeError:
+            # Objects that cannot be weakly referenced (e.g., lists) are held.
+            return lambda: value
+
+
+    def InvalidateLabelIndex(self, dataSet=None):
+        """
+        Removes the index of the label values of a data set so that it is rebuilt the next time it is requested.  Must be called
+        if the labels are modified in place.
+
+        Parameters
+        ----------
+        dataSet : string, optional
+            The data set.  If None, the indices of all the data sets are removed.  The default is None.
+
+        Returns
+        -------
+        None.
+        """
+        if dataSet is None:
+            self.labelIndices.clear()
+        else:
+            self.labelIndices.pop(dataSet, None)
+
+
     def GetIndicesByCategory(self, numberOfExamples, categoryName=None, categoryNumber=None, dataSet="original"):
         """
         Gets the indices of images that fall into the specified category.
@@ -306,7 +396,7 @@ class ImageDataHelper(TensorFlowDataHelper):
         """
         # If a name was provided, convert it to a number.  Searching by number is faster.
         if categoryName != None:
-            categoryNumber = FindIndicesByValues(self.labelCategories, searchValue=categoryName, maxCount=1)
+            categoryNumber = Search.FindIndicesByValues(self.labelCategories, searchValue=categoryName, maxCount=1)
             # The find indices function returns an array, we only want one entry.
             categoryNumber = categoryNumber[0]
 
@@ -314,8 +404,7 @@ class ImageDataHelper(TensorFlowDataHelper):
         if categoryNumber == None:
             raise Exception("A valid category name or a valid category number must be provided.")
 
-        xData, yData = self.GetDataSet(dataSet)
-        indices      = FindIndicesByValues(yData, categoryNumber, numberOfExamples)
+        indices      = self.GetLabelIndex(dataSet).GetPositions(categoryNumber, numberOfExamples).tolist()
 
         if len(indices) == 0:
             categoryName = self.labelCategories[categoryNumber]
@@ -619,6 +708,7 @@ class ImageDataHelper(TensorFlowDataHelper):
         y = self.labels["Numbers"]
 
         self._SplitData(x, y, testSize, validationSize, stratify)
+        self.InvalidateLabelIndex()
 
 
     def GetSplitComparisons(self, format="countandpercentstring"):
@@ -3,10 +3,18 @@ Created on July 20, 2023
 @author: Lance A. Endres
 """
 import pandas                                                        as pd
+import numpy                                                         as np
 import matplotlib.pyplot                                             as plt
 import os
+import io
+import glob
+from   concurrent.futures                                            import ThreadPoolExecutor
+from   concurrent.futures                                            import ProcessPoolExecutor
 
 from   lendres.algorithms.Search                                     import Search
+from   lendres.algorithms.PointGrid                                  import PointGrid
+from   lendres.io.CsvCache                                           import CsvCache
+from   lendres.io.LimitedReader                                      import LimitedReader
 from   lendres.plotting.PlotHelper                                   import PlotHelper
 from   lendres.plotting.AxesHelper                                   import AxesHelper
 from   lendres.plotting.PlotMaker                                    import PlotMaker
@@ -22,7 +30,7 @@ class DataComparison():
     might be sampled at 0.1 seconds.
     """
 
-    def __init__(self, independentColumn:str, directory:str=None):
+    def __init__(self, independentColumn:str, directory:str=None, lazyLoading:bool=False, csvCache:CsvCache=None):
         """
         Constructor.
 
@@ -33,6 +41,11 @@ class DataComparison():
         directory : str, optional
             The directory to load the data files from. The default is None.  If none is supplied,
             the complete path must be specified when loading files.
+        lazyLoading : bool, optional
+            If True, only the header and the independent column are read when a file is loaded.  The other columns
+            are read from the file the first time they are used.  See LoadColumns.  The default is False.
+        csvCache : CsvCache, optional
+            If supplied, files are read through the cache.  The default is None.
 
         Returns
         -------
@@ -40,10 +53,37 @@ class DataComparison():
         """
         self.independentColumn  = independentColumn
         self.directory          = directory
+        self.lazyLoading        = lazyLoading
+        self.csvCache           = csvCache
 
         self.dataSets           = []
         self.dataSetNames       = []
 
+        # The file each data set was loaded from and the columns in the file.  None for data sets that
+        # were not loaded from a file.
+        self.filePaths          = []
+        self.fileColumns        = []
+
+        # The byte offset in each file that the data has been read up to (the end of the last complete line read).  Used to read
+        # only the lines appended to a file (see Refresh).  None if no complete line has been read.
+        self.fileOffsets        = []
+
+        # The arrays with spare capacity that the columns of data sets extended by Refresh are stored at the start of.  Stored
+        # by column name.  None for data sets that have not been refreshed.
+        self.rowBuffers         = []
+
+        # Cached copies of the independent column of each data set as contiguous float arrays, and if each is
+        # monotonically increasing.  An entry of None means the cache has to be (re)built.
+        self.timeAxes           = []
+        self.isMonotonic        = []
+        self.timeAxisBuffers    = []
+
+        # The PointGrids used to search the cached independent axes.  An entry of None means it has to be (re)built.
+        self.pointGrids         = []
+
+        # Cache of data sets resampled to a common grid.  Stored by the columns and grid used.
+        self.alignedData        = {}
+
 
     @property
     def NumberOfDataSets(self):
@@ -73,8 +113,67 @@ class DataComparison():
         -------
         None.
         """
-        dataFrame       = self.ValidateFile(file)
+        path              = self.GetFilePath(file)
+        dataFrame, offset = self._ReadFile(path, self._GetInitialColumns(), self.csvCache)
         self.AddDataSet(dataFrame, name)
+        self._SetFileSource(self.NumberOfDataSets-1, path, offset)
+
+
+    def LoadFiles(self, files:list=None, pattern:str=None, numberOfWorkers:int=None, useProcesses:bool=False):
+        """
+        Loads many data sets from files concurrently.
+
+        The files are parsed on a pool of threads (or processes) and the data sets are added in the order the files were
+        supplied.  A file that cannot be loaded does not stop the other files from loading, instead the error is returned.
+
+        Parameters
+        ----------
+        files : list of tuple(str, str), optional
+            A list of (file, name) pairs.  See LoadFile.  The default is None.
+        pattern : str, optional
+            A glob pattern (e.g. "*.csv") used to find the files.  The pattern is relative to the directory supplied at construction
+            (if one was supplied).  The data sets are named with the file names (without extension) and added in sorted order.  The
+            default is None.
+        numberOfWorkers : int, optional
+            The number of threads or processes used to load the files.  If None, the executor default is used.  The default is None.
+        useProcesses : bool, optional
+            If True, a pool of processes is used.  Otherwise, a pool of threads is used.  The default is False.
+
+        Returns
+        -------
+        errors : list of tuple(str, Exception)
+            The files that could not be loaded and the error raised while loading each one.
+        """
+        files = [] if files is None else list(files)
+
+        if pattern is not None:
+            searchPattern = pattern if self.directory is None else os.path.join(self.directory, pattern)
+            for path in sorted(glob.glob(searchPattern)):
+                file = path if self.directory is None else os.path.relpath(path, self.directory)
+                files.append((file, os.path.splitext(os.path.basename(path))[0]))
+
+        executorType = ProcessPoolExecutor if useProcesses else ThreadPoolExecutor
+        errors       = []
+        futures      = []
+
+        with executorType(max_workers=numberOfWorkers) as executor:
+            for file, name in files:
+                try:
+                    path = self.GetFilePath(file)
+                    futures.append((file, name, path, executor.submit(self._ReadFile, path, self._GetInitialColumns(), self.csvCache)))
+                except Exception as exception:
+                    errors.append((file, exception))
+
+            # Add the data sets in the order supplied.
+            for file, name, path, future in futures:
+                try:
+                    dataFrame, offset = future.result()
+                    self.AddDataSet(dataFrame, name)
+                    self._SetFileSource(self.NumberOfDataSets-1, path, offset)
+                except Exception as exception:
+                    errors.append((file, exception))
+
+        return errors
 
 
     def AddDataSet(self, dataFrame:pd.DataFrame, name:str):
@@ -92,9 +191,445 @@ class DataComparison():
         -------
         None.
         """
+        # The independent axis is extracted before anything is stored so that an invalid data set is not partially added.
+        timeAxis, isMonotonic = self._ExtractTimeAxis(dataFrame)
+
         dataFrame.name  = name
         self.dataSets.append(dataFrame)
         self.dataSetNames.append(name)
+        self.filePaths.append(None)
+        self.fileColumns.append(None)
+        self.fileOffsets.append(None)
+        self.rowBuffers.append(None)
+        self.timeAxes.append(timeAxis)
+        self.isMonotonic.append(isMonotonic)
+        self.timeAxisBuffers.append(None)
+        self.pointGrids.append(None)
+        self.alignedData.clear()
+
+
+    def _SetFileSource(self, dataSet:int, path:str, offset:int=None):
+        """
+        Records the file a data set was loaded from so that columns can be loaded later and appended lines can be read.
+
+        Parameters
+        ----------
+        dataSet : int
+            Index of the data set.
+        path : str
+            Path to the file.
+        offset : int, optional
+            The position in the file the data was read up to.  None if no complete line was read.  The default is None.
+
+        Returns
+        -------
+        None.
+        """
+        self.filePaths[dataSet]   = path
+        self.fileOffsets[dataSet] = offset
+        self.fileColumns[dataSet] = self._ReadHeader(path) if self.lazyLoading else list(self.dataSets[dataSet].columns)
+
+
+    def _GetInitialColumns(self):
+        """
+        Gets the columns to read when a file is loaded.
+
+        Returns
+        -------
+        : list of str or None
+            The independent column if lazy loading is used, otherwise None (all the columns).
+        """
+        return [self.independentColumn] if self.lazyLoading else None
+
+
+    def LoadColumns(self, columns:str|list=None, dataSet:int=None):
+        """
+        Reads columns that have not been loaded yet from the data set files.  Only needed when lazy loading is used.  The loaded
+        columns are kept in the data sets so they are only read once.
+
+        Parameters
+        ----------
+        columns : str or list of str, optional
+            The name(s) of the column(s) to load.  Columns that are already loaded or are not in a file are skipped.  If None, all
+            the columns are loaded.  The default is None.
+        dataSet : int, optional
+            Index of the data set.  If None, the columns are loaded for all the data sets.  The default is None.
+
+        Returns
+        -------
+        None.
+        """
+        if type(columns) is str:
+            columns = [columns]
+
+        dataSets = range(self.NumberOfDataSets) if dataSet is None else [dataSet]
+
+        for i in dataSets:
+            if self.filePaths[i] is None:
+                continue
+
+            data    = self.dataSets[i]
+            missing = [column for column in (self.fileColumns[i] if columns is None else columns) if column not in data.columns and column in self.fileColumns[i]]
+
+            if len(missing) > 0:
+                data[missing] = self._ReadFile(self.filePaths[i], missing, self.csvCache)[0][missing]
+
+
+    def Refresh(self, dataSet:int=None):
+        """
+        Reads the lines that have been appended to the data set files since they were last read (e.g., the output of a running
+        simulation).  Only the new, complete lines are read, so the cost of a refresh depends on the amount of new data instead of
+        the size of the file.  Reading continues from the position in the file that the data was last read up to (a file is only
+        loaded up to its last complete line), so blank lines and quoted line endings are handled.
+
+        The new rows are appended to the data sets and the cached independent axes are extended.  Columns that are not in the files
+        (e.g., columns added with Apply) are NaN for the new rows.
+
+        The columns and independent axes are stored at the start of arrays with spare capacity that double in size when full, so
+        the existing rows are not copied for each refresh.  The refreshed data sets are new DataFrames that are views of these
+        arrays.  Columns without a numpy type (e.g., strings) are copied.
+
+        Parameters
+        ----------
+        dataSet : int, optional
+            Index of the data set.  If None, all the data sets that were loaded from a file are refreshed.  The default is None.
+
+        Returns
+        -------
+        : list of int
+            The number of rows appended to each data set refreshed.
+        """
+        dataSets = range(self.NumberOfDataSets) if dataSet is None else [dataSet]
+        return [self._ReadAppendedLines(i) for i in dataSets]
+
+
+    def _ReadAppendedLines(self, dataSet:int):
+        """
+        Reads the complete lines that have been appended to a data set file and adds them to the data set.
+
+        Parameters
+        ----------
+        dataSet : int
+            Index of the data set.
+
+        Returns
+        -------
+        : int
+            The number of rows appended.
+        """
+        path = self.filePaths[dataSet]
+        if path is None:
+            return 0
+
+        data   = self.dataSets[dataSet]
+        offset = self.fileOffsets[dataSet]
+
+        if offset is None:
+            # The header line was not complete when the file was loaded, so the data starts after it.
+            offset = self._FindLineEnd(path, 0)
+            if offset is None:
+                return 0
+            self.fileOffsets[dataSet] = offset
+
+        if os.path.getsize(path) < offset:
+            raise Exception("The file \"" + path + "\" is shorter than the data already read.  The file must be loaded again.")
+
+        with open(path, "rb") as file:
+            file.seek(offset)
+            newBytes = file.read()
+
+        # Only complete lines are read.  A partially written line is read by the next refresh.
+        end = newBytes.rfind(b"\n") + 1
+        self.fileOffsets[dataSet] = offset + end
+
+        if end == 0:
+            return 0
+
+        columns  = [column for column in data.columns if column in self.fileColumns[dataSet]]
+        newData  = pd.read_csv(io.BytesIO(newBytes[:end]), header=None, names=self.fileColumns[dataSet], usecols=columns)
+
+        if len(newData) == 0:
+            return 0
+
+        self._AppendRows(dataSet, newData)
+
+        # Extend the cached independent axis instead of extracting it again.
+        timeAxis = self.timeAxes[dataSet]
+        if timeAxis is not None:
+            newTimes    = newData[self.independentColumn].to_numpy(dtype=np.float64)
+            isMonotonic = self.isMonotonic[dataSet] and bool(np.all(newTimes[1:] >= newTimes[:-1]))
+            if len(timeAxis) > 0:
+                isMonotonic = isMonotonic and newTimes[0] >= timeAxis[-1]
+
+            self.timeAxisBuffers[dataSet], self.timeAxes[dataSet] = self._AppendToBuffer(timeAxis, self.timeAxisBuffers[dataSet], newTimes)
+            self.isMonotonic[dataSet] = isMonotonic
+            self.pointGrids[dataSet]  = None
+
+        self.alignedData.clear()
+        return len(newData)
+
+
+    def _AppendRows(self, dataSet:int, newData:pd.DataFrame):
+        """
+        Appends rows to a data set.  The columns are appended to their buffers, so only the new rows are copied, and the data set is
+        replaced by a DataFrame that is a view of the buffers.
+
+        Parameters
+        ----------
+        dataSet : int
+            Index of the data set.
+        newData : pandas.DataFrame
+            The rows to append.  Columns of the data set that are missing are NaN for the new rows.
+
+        Returns
+        -------
+        None.
+        """
+        data       = self.dataSets[dataSet]
+        buffers    = self.rowBuffers[dataSet] or {}
+        newData    = newData.reindex(columns=data.columns)
+        newBuffers = {}
+        columns    = {}
+
+        for column in data.columns:
+            values, newValues = data[column], newData[column]
+
+            try:
+                if not isinstance(values.dtype, np.dtype) or not isinstance(newValues.dtype, np.dtype):
+                    raise TypeError("The column does not have a numpy type.")
+                newBuffers[column], columns[column] = self._AppendToBuffer(values.to_numpy(), buffers.get(column), newValues.to_numpy())
+            except TypeError:
+                # Types that cannot be stored in a numpy buffer are appended by copying the column.
+                columns[column] = pd.concat([values, newValues], ignore_index=True)
+
+        data      = pd.DataFrame(columns, index=pd.RangeIndex(len(data)+len(newData)), copy=False)
+        data.name = self.dataSetNames[dataSet]
+        self.dataSets[dataSet]   = data
+        self.rowBuffers[dataSet] = newBuffers
+
+
+    @classmethod
+    def _AppendToBuffer(cls, values:np.ndarray, buffer:np.ndarray, newValues:np.ndarray):
+        """
+        Appends values to an array that is stored at the start of a buffer with spare capacity.  The new values are written to the
+        spare capacity, so the existing values are not copied.  If the buffer is full, has a different type, or does not hold the
+        values, a new buffer with twice the needed capacity is created.
+
+        Parameters
+        ----------
+        values : numpy.ndarray
+            The existing values.
+        buffer : numpy.ndarray or None
+            The buffer the values are stored at the start of.
+        newValues : numpy.ndarray
+            The values to append.
+
+        Returns
+        -------
+        buffer, values : numpy.ndarray, numpy.ndarray
+            The buffer and a view of the start of it that holds the existing and new values.
+        """
+        length = len(values)
+        needed = length + len(newValues)
+        dtype  = np.result_type(values.dtype, newValues.dtype)
+
+        isStored = (
+            buffer is not None and
+            buffer.dtype == dtype and
+            values.dtype == dtype and
+            values.strides == buffer.strides and
+            values.__array_interface__["data"][0] == buffer.__array_interface__["data"][0]
+        )
+
+        if not isStored or len(buffer) < needed:
+            newBuffer          = np.empty(max(2*needed, 16), dtype=dtype)
+            newBuffer[:length] = values
+            buffer             = newBuffer
+
+        buffer[length:needed] = newValues
+        return buffer, buffer[:needed]
+
+
+    @classmethod
+    def _FindLineEnd(cls, path:str, start:int, blockSize:int=2**16):
+        """
+        Finds the end of the first complete line at or after a position in a file.
+
+        Parameters
+        ----------
+        path : str
+            Path to the file.
+        start : int
+            The position to start at.
+        blockSize : int, optional
+            The number of bytes read at a time.  The default is 64 KB.
+
+        Returns
+        -------
+        : int or None
+            The position after the line ending.  None if the file does not have a line ending after the position.
+        """
+        with open(path, "rb") as file:
+            file.seek(start)
+            position = start
+            while True:
+                block = file.read(blockSize)
+                if len(block) == 0:
+                    return None
+
+                index = block.find(b"\n")
+                if index >= 0:
+                    return position + index + 1
+                position += len(block)
+
+
+    @classmethod
+    def _FindLastLineEnd(cls, path:str, blockSize:int=2**16):
+        """
+        Finds the end of the last complete line in a file.  The file is read backwards from the end, so only the last line is read.
+
+        Parameters
+        ----------
+        path : str
+            Path to the file.
+        blockSize : int, optional
+            The number of bytes read at a time.  The default is 64 KB.
+
+        Returns
+        -------
+        : int
+            The position after the last line ending.  Zero if the file does not have a line ending.
+        """
+        with open(path, "rb") as file:
+            end = file.seek(0, os.SEEK_END)
+            while end > 0:
+                start = max(end - blockSize, 0)
+                file.seek(start)
+                index = file.read(end - start).rfind(b"\n")
+                if index >= 0:
+                    return start + index + 1
+                end = start
+        return 0
+
+
+    def GetColumnNames(self, dataSet:int):
+        """
+        Gets the names of the columns in a data set, including columns that have not been loaded yet.
+
+        Parameters
+        ----------
+        dataSet : int
+            Index of the data set.
+
+        Returns
+        -------
+        : list of str
+            The column names.
+        """
+        columns = list(self.dataSets[dataSet].columns)
+        if self.fileColumns[dataSet] is not None:
+            columns += [column for column in self.fileColumns[dataSet] if column not in columns]
+        return columns
+
+
+    def GetTimeAxis(self, dataSet:int):
+        """
+        Gets the independent column of a data set as a contiguous float array.  The array is cached, so it should not be modified.
+
+        Parameters
+        ----------
+        dataSet : int
+            Index of the data set.
+
+        Returns
+        -------
+        : numpy.ndarray
+            The independent column values.
+        """
+        if self.timeAxes[dataSet] is None:
+            self._CacheTimeAxis(dataSet)
+        return self.timeAxes[dataSet]
+
+
+    def IsMonotonic(self, dataSet:int):
+        """
+        Gets if the independent column of a data set is monotonically increasing.
+
+        Parameters
+        ----------
+        dataSet : int
+            Index of the data set.
+
+        Returns
+        -------
+        : bool
+            True if the independent column is monotonically increasing.
+        """
+        if self.isMonotonic[dataSet] is None:
+            self._CacheTimeAxis(dataSet)
+        return self.isMonotonic[dataSet]
+
+
+    def InvalidateCache(self, dataSet:int=None):
+        """
+        Invalidates the cached values of a data set.  Must be called if a data set is modified outside of this class
+        (Apply does this automatically).
+
+        Parameters
+        ----------
+        dataSet : int, optional
+            Index of the data set.  If None, the cached values of all data sets are invalidated.  The default is None.
+
+        Returns
+        -------
+        None.
+        """
+        dataSets = range(self.NumberOfDataSets) if dataSet is None else [dataSet]
+
+        for i in dataSets:
+            self.timeAxes[i]    = None
+            self.isMonotonic[i] = None
+            self.pointGrids[i]  = None
+
+        self.alignedData.clear()
+
+
+    def _CacheTimeAxis(self, dataSet:int):
+        """
+        Extracts the independent column of a data set and caches it.
+
+        Parameters
+        ----------
+        dataSet : int
+            Index of the data set.
+
+        Returns
+        -------
+        None.
+        """
+        self.timeAxes[dataSet], self.isMonotonic[dataSet] = self._ExtractTimeAxis(self.dataSets[dataSet])
+        self.pointGrids[dataSet] = None
+
+
+    def _ExtractTimeAxis(self, dataFrame:pd.DataFrame):
+        """
+        Extracts the independent column of a data set as a contiguous float array.
+
+        Parameters
+        ----------
+        dataFrame : pandas.DataFrame
+            The data set.
+
+        Returns
+        -------
+        timeAxis, isMonotonic : numpy.ndarray, bool
+            The independent column values and if they are monotonically increasing.
+        """
+        if self.independentColumn not in dataFrame.columns:
+            raise Exception("The data set does not contain the independent column \"" + self.independentColumn + "\".")
+
+        timeAxis = np.ascontiguousarray(dataFrame[self.independentColumn].to_numpy(dtype=np.float64))
+        return timeAxis, bool(np.all(timeAxis[1:] >= timeAxis[:-1]))
 
 
     def ValidateFile(self, inputFile:str):
@@ -111,12 +646,86 @@ class DataComparison():
         : pandas.DataFrame
             The file loaded into a DataFrame.
         """
+        return self._ReadFile(self.GetFilePath(inputFile), self._GetInitialColumns(), self.csvCache)[0]
+
+
+    def GetFilePath(self, inputFile:str):
+        """
+        Combines the file path with the directory, if one was supplied, and validates that the file exists.
+
+        Parameters
+        ----------
+        inputFile : str
+            File to load.
+
+        Returns
+        -------
+        path : str
+            The path to the file.
+        """
         path = inputFile
         if self.directory is not None:
             path = os.path.join(self.directory, inputFile)
         if not os.path.exists(path):
             raise Exception("The input file \"" + path + "\" does not exist.")
-        return pd.read_csv(path)
+        return path
+
+
+    @classmethod
+    def _ReadFile(cls, path:str, columns:list=None, csvCache:CsvCache=None):
+        """
+        Reads a file into a DataFrame.  A class method so that it can be run in another process.
+
+        Only the complete lines are read, so the last line of a file that is still being written is not read as a partial row.
+
+        Parameters
+        ----------
+        path : str
+            Path to the file.
+        columns : list of str, optional
+            The columns to read.  If None, all the columns are read.  The default is None.
+        csvCache : CsvCache, optional
+            If supplied, the file is read through the cache.  The default is None.
+
+        Returns
+        -------
+        dataFrame, offset : pandas.DataFrame, int
+            The file loaded into a DataFrame and the position in the file after the last line read (used by Refresh).  The offset
+            is None if the file does not have a complete line.
+        """
+        end = cls._FindLastLineEnd(path)
+        if end == 0:
+            return pd.read_csv(path, usecols=columns), None
+
+        # The cache reads the whole file, so it is only used if the file ends with a complete line and does not grow while it
+        # is read.
+        if csvCache is not None and os.path.getsize(path) == end:
+            dataFrame = csvCache.ReadCsv(path, usecols=columns)
+            if os.path.getsize(path) == end:
+                return dataFrame, end
+
+        # The position read up to is recorded instead of counting rows, because blank lines and quoted line endings mean rows and
+        # lines do not match.
+        with open(path, "rb") as file:
+            return pd.read_csv(LimitedReader(file, end), usecols=columns), end
+
+
+    @classmethod
+    def _ReadHeader(cls, path:str):
+        """
+        Reads the column names from a file.
+
+        Parameters
+        ----------
+        path : str
+            Path to the file.
+
+        Returns
+        -------
+        : list of str
+            The column names.
+        """
+        return list(pd.read_csv(path, nrows=0).columns)
 
 
     def GetEndTime(self):
@@ -128,10 +737,10 @@ class DataComparison():
         float
             The ending time.
         """
-        return (self.dataSets[0])[self.independentColumn].iloc[-1]
+        return self.GetTimeAxis(0)[-1]
 
 
-    def GetValue(self, dataSet:int, column:str, time:float):
+    def GetValue(self, dataSet:int, column:str, time:float, method:str="lower"):
         """
         Gets the value in the specified column at the specified value of the independent axis.  The value is returned
         from the specified data set.
@@ -144,19 +753,420 @@ class DataComparison():
             The name of the column the value is in.
         time : double
             Time of interest.
+        method : string, optional
+            How the index is selected when the time is between samples.  See GetIndex.  The default is "lower".
 
         Returns
         -------
         value : float
             The value.
         """
-        index = self.GetIndex(dataSet, time)
+        self.LoadColumns(column, dataSet)
+        index = self.GetIndex(dataSet, time, method)
         data  = self.dataSets[dataSet]
         value = data[column].iloc[index]
         return value
 
 
-    def GetIndex(self, dataSet:int, time:float):
+    def GetValues(self, columns:str|list, times, dataSet:int=None, interpolate:bool=False, asArray:bool=False):
+        """
+        Gets the values in the specified columns at many values of the independent axis.  All the values are found in one
+        vectorized pass instead of one search per value.
+
+        Parameters
+        ----------
+        columns : str or list of str
+            The name(s) of the column(s) the values are in.
+        times : array like of float
+            The values of the independent axis to get the values at.
+        dataSet : int, optional
+            Index of the data set to get the values from.  If None, the values are retrieved from all the data sets.
+            The default is None.
+        interpolate : bool, optional
+            If True, the values are linearly interpolated between the bounding samples.  If False, the value at the sample
+            before the time is used (the same as GetValue).  The default is False.
+        asArray : bool, optional
+            If True, a numpy.ndarray of the values (without the independent column) is returned instead of a DataFrame.
+            The default is False.
+
+        Returns
+        -------
+        : pandas.DataFrame or numpy.ndarray
+            The values.  The DataFrame has the independent column followed by the value columns.  If values are retrieved from
+            all the data sets, the columns are named with the data set name prefixed to the column name (e.g. "Model 1 w_bit").
+            Times outside of the range of a data set have values of NaN.
+        """
+        if type(columns) is str:
+            columns = [columns]
+
+        times    = np.atleast_1d(np.asarray(times, dtype=np.float64))
+        dataSets = range(self.NumberOfDataSets) if dataSet is None else [dataSet]
+
+        values      = []
+        columnNames = []
+        for i in dataSets:
+            values.append(self._GetValuesFromDataSet(i, columns, times, interpolate))
+            if dataSet is None:
+                columnNames.extend([self.dataSetNames[i] + " " + column for column in columns])
+            else:
+                columnNames.extend(columns)
+
+        values = np.hstack(values)
+
+        if asArray:
+            return values
+
+        result = pd.DataFrame(values, columns=columnNames)
+        result.insert(0, self.independentColumn, times)
+        return result
+
+
+    def _GetValuesFromDataSet(self, dataSet:int, columns:list, times:np.ndarray, interpolate:bool):
+        """
+        Gets the values in the specified columns at many values of the independent axis from one data set.
+
+        Parameters
+        ----------
+        dataSet : int
+            Index of the data set to get the values from.
+        columns : list of str
+            The names of the columns the values are in.
+        times : numpy.ndarray
+            The values of the independent axis to get the values at.
+        interpolate : bool
+            If True, the values are linearly interpolated between the bounding samples.
+
+        Returns
+        -------
+        values : numpy.ndarray
+            A two dimensional array of values.  Each column of the array is one of the columns.
+        """
+        self.LoadColumns(columns, dataSet)
+        pointGrid     = self._GetPointGrid(dataSet)
+        data          = self.dataSets[dataSet][columns].to_numpy(dtype=np.float64)
+        return self._SampleValues(pointGrid, data, times, interpolate)
+
+
+    @classmethod
+    def _SampleValues(cls, pointGrid:PointGrid, data:np.ndarray, times:np.ndarray, interpolate:bool):
+        """
+        Gets the values of sampled data at many values of the independent axis.
+
+        Parameters
+        ----------
+        pointGrid : PointGrid
+            The PointGrid of the sorted independent values of the samples.
+        data : numpy.ndarray
+            A two dimensional array of sampled values.  Each row is the values at one sample.
+        times : numpy.ndarray
+            The values of the independent axis to get the values at.
+        interpolate : bool
+            If True, the values are linearly interpolated between the bounding samples.
+
+        Returns
+        -------
+        values : numpy.ndarray
+            A two dimensional array of values.  Each row is the values at one of the times.
+        """
+        timeAxis      = pointGrid.points
+        lower, upper  = pointGrid.BoundingSearchArray(times)
+        outOfRange    = np.isnan(lower)
+        lower         = np.where(outOfRange, 0, lower).astype(np.int64)
+        upper         = np.where(outOfRange, 0, upper).astype(np.int64)
+
+        values        = data[lower]
+
+        if interpolate:
+            # The fraction of the way from the lower sample to the upper sample.  Exact hits have the same
+            # lower and upper sample, so they are left at a fraction of zero.
+            span          = timeAxis[upper] - timeAxis[lower]
+            fraction      = np.divide(times - timeAxis[lower], span, out=np.zeros_like(times), where=span != 0)
+            values        = values + (data[upper] - values) * fraction[:, np.newaxis]
+
+        values[outOfRange] = np.nan
+        return values
+
+
+    def GetAlignedData(self, columns:str|list=None, grid="finest"):
+        """
+        Resamples every data set onto a common grid of the independent axis.  The values are linearly interpolated.
+
+        The result is cached until the data sets change, so it can be used repeatedly (e.g., for difference metrics, overlays,
+        and exports) without searching again.
+
+        Parameters
+        ----------
+        columns : str or list of str, optional
+            The name(s) of the column(s) to resample.  If None, all the columns common to every data set (except the
+            independent column) are used.  The default is None.
+        grid : str or array like of float, optional
+            The values of the independent axis to resample at.  The default is "finest".
+                finest : The independent axis of the data set with the smallest (median) sample spacing.
+                union : Every value of the independent axis from all the data sets.
+                array like : The specified values.
+
+        Returns
+        -------
+        : pandas.DataFrame
+            The independent column followed by the value columns.  The columns are named with the data set name prefixed
+            to the column name (e.g. "Model 1 w_bit").  Values outside of the range of a data set are NaN.  The DataFrame
+            is cached, so it should not be modified.
+        """
+        if columns is None:
+            columns = self.GetCommonColumns()
+        elif type(columns) is str:
+            columns = [columns]
+
+        # The grid is part of the cache key.  Arrays are not hashable so the raw values are used.
+        if type(grid) is str:
+            gridKey = grid
+        else:
+            grid    = np.asarray(grid, dtype=np.float64)
+            gridKey = grid.tobytes()
+
+        key = (tuple(columns), gridKey)
+        if key not in self.alignedData:
+            self.alignedData[key] = self.GetValues(columns, self.GetCommonGrid(grid), interpolate=True)
+
+        return self.alignedData[key]
+
+
+    def GetCommonGrid(self, grid="finest"):
+        """
+        Gets a common grid of the independent axis for all the data sets.
+
+        Parameters
+        ----------
+        grid : str or array like of float, optional
+            The type of grid.  See GetAlignedData.  The default is "finest".
+
+        Returns
+        -------
+        : numpy.ndarray
+            The values of the independent axis.
+        """
+        if type(grid) is not str:
+            return np.asarray(grid, dtype=np.float64)
+
+        timeAxes = [self._GetSortedTimeAxis(i) for i in range(self.NumberOfDataSets)]
+
+        match grid:
+            case "finest":
+                spacings = [np.median(np.diff(timeAxis)) if len(timeAxis) > 1 else np.inf for timeAxis in timeAxes]
+                return timeAxes[int(np.argmin(spacings))]
+            case "union":
+                return np.unique(np.concatenate(timeAxes))
+            case _:
+                raise Exception("The 'grid' parameter is not valid.")
+
+
+    def GetCommonColumns(self):
+        """
+        Gets the columns that are in every data set (except the independent column).
+
+        Returns
+        -------
+        : list of str
+            The column names in the order of the first data set.
+        """
+        columns = [column for column in self.GetColumnNames(0) if column != self.independentColumn]
+        for i in range(1, self.NumberOfDataSets):
+            dataSetColumns = self.GetColumnNames(i)
+            columns        = [column for column in columns if column in dataSetColumns]
+        return columns
+
+
+    def GetDifferenceMetrics(self, columns:str|list=None, referenceDataSet:int=0, chunkSize:int=1000000, numberOfWorkers:int=1):
+        """
+        Calculates statistics of the differences between each data set and a reference data set.
+
+        The data sets are aligned to the samples of the reference data set (by linear interpolation).  The statistics are
+        accumulated in chunks of samples so the memory used is bounded by the chunk size, not the size of the data sets.
+        Samples outside of the range of a data set are skipped.
+
+        Parameters
+        ----------
+        columns : str or list of str, optional
+            The name(s) of the column(s) to compare.  If None, all the columns common to every data set (except the
+            independent column) are compared.  The default is None.
+        referenceDataSet : int, optional
+            Index of the data set the others are compared to.  The default is 0.
+        chunkSize : int, optional
+            The number of samples processed at a time.  The default is 1000000.
+        numberOfWorkers : int, optional
+            The number of threads used to compare columns in parallel.  The default is 1.
+
+        Returns
+        -------
+        : pandas.DataFrame
+            One row for each data set and column with the following headings:
+            "Data Set", "Column", "Number of Points", "RMS Error", "Maximum Absolute Error", "Time of Maximum Error", "Correlation"
+        """
+        if columns is None:
+            columns = self.GetCommonColumns()
+        elif type(columns) is str:
+            columns = [columns]
+
+        self.LoadColumns(columns)
+
+        comparisons = [(dataSet, column) for dataSet in range(self.NumberOfDataSets) if dataSet != referenceDataSet for column in columns]
+        function    = lambda comparison: self._GetDifferenceMetrics(comparison[0], referenceDataSet, comparison[1], chunkSize)
+
+        if numberOfWorkers > 1:
+            with ThreadPoolExecutor(max_workers=numberOfWorkers) as executor:
+                rows = list(executor.map(function, comparisons))
+        else:
+            rows = [function(comparison) for comparison in comparisons]
+
+        return pd.DataFrame(rows)
+
+
+    def _GetDifferenceMetrics(self, dataSet:int, referenceDataSet:int, column:str, chunkSize:int):
+        """
+        Calculates statistics of the differences between a column of a data set and the reference data set.
+
+        The mean and (co)variance sums used for the correlation are combined between chunks with the parallel algorithm
+        of Chan et al. so they are numerically stable.
+
+        Parameters
+        ----------
+        dataSet : int
+            Index of the data set.
+        referenceDataSet : int
+            Index of the reference data set.
+        column : str
+            The name of the column to compare.
+        chunkSize : int
+            The number of samples processed at a time.
+
+        Returns
+        -------
+        : dict
+            The statistics.  See GetDifferenceMetrics.
+        """
+        referenceTime    = self._GetSortedTimeAxis(referenceDataSet)
+        referenceData    = self.dataSets[referenceDataSet][column].to_numpy(dtype=np.float64)
+        pointGrid        = self._GetPointGrid(dataSet)
+        data             = self.dataSets[dataSet][column].to_numpy(dtype=np.float64)[:, np.newaxis]
+
+        count            = 0
+        sumOfSquares     = 0.0
+        maximumError     = -1.0
+        maximumErrorTime = np.nan
+        referenceMean    = 0.0
+        mean             = 0.0
+        referenceM2      = 0.0
+        m2               = 0.0
+        coMoment         = 0.0
+
+        for start in range(0, len(referenceTime), chunkSize):
+            times      = referenceTime[start:start+chunkSize]
+            reference  = referenceData[start:start+chunkSize]
+            values     = self._SampleValues(pointGrid, data, times, True)[:, 0]
+
+            valid      = ~(np.isnan(reference) | np.isnan(values))
+            times      = times[valid]
+            reference  = reference[valid]
+            values     = values[valid]
+
+            chunkCount = len(values)
+            if chunkCount == 0:
+                continue
+
+            differences   = values - reference
+            sumOfSquares += differences @ differences
+
+            index = np.argmax(np.abs(differences))
+            if abs(differences[index]) > maximumError:
+                maximumError     = abs(differences[index])
+                maximumErrorTime = times[index]
+
+            # Combine the chunk's means and (co)variance sums with the running values.
+            chunkReferenceMean = reference.mean()
+            chunkMean          = values.mean()
+            referenceDeviation = reference - chunkReferenceMean
+            deviation          = values - chunkMean
+
+            total              = count + chunkCount
+            referenceDelta     = chunkReferenceMean - referenceMean
+            delta              = chunkMean - mean
+            weight             = count * chunkCount / total
+
+            referenceM2       += referenceDeviation @ referenceDeviation + referenceDelta**2 * weight
+            m2                += deviation @ deviation + delta**2 * weight
+            coMoment          += referenceDeviation @ deviation + referenceDelta * delta * weight
+            referenceMean     += referenceDelta * chunkCount / total
+            mean              += delta * chunkCount / total
+            count              = total
+
+        correlation = np.nan
+        if referenceM2 > 0 and m2 > 0:
+            correlation = coMoment / np.sqrt(referenceM2 * m2)
+
+        return {
+            "Data Set"               : self.dataSetNames[dataSet],
+            "Column"                 : column,
+            "Number of Points"       : count,
+            "RMS Error"              : np.sqrt(sumOfSquares / count) if count > 0 else np.nan,
+            "Maximum Absolute Error" : maximumError if count > 0 else np.nan,
+            "Time of Maximum Error"  : maximumErrorTime,
+            "Correlation"            : correlation
+        }
+
+
+    def GetTimeWindowSlices(self, window:tuple=None):
+        """
+        Gets the positional slices of every data set that are in a range of the independent axis.  The slices are found with a
+        binary search of the cached independent axis.
+
+        Parameters
+        ----------
+        window : tuple of (float, float), optional
+            The start and end of the range of the independent axis (inclusive).  If None, the slices contain all the data.  The
+            default is None.
+
+        Returns
+        -------
+        : list of slice
+            A slice for each data set.
+        """
+        if window is None:
+            return [slice(0, len(dataSet)) for dataSet in self.dataSets]
+
+        return [Search.RangeSlice(self._GetSortedTimeAxis(i), window[0], window[1]) for i in range(self.NumberOfDataSets)]
+
+
+    def GetTimeWindow(self, window:tuple=None):
+        """
+        Gets the data of every data set that is in a range of the independent axis.
+
+        The data is returned as positional slices of the data sets, so the data is not copied.  The slices should be treated as
+        read only.
+
+        Parameters
+        ----------
+        window : tuple of (float, float), optional
+            The start and end of the range of the independent axis (inclusive).  If None, the complete data sets are returned.  The
+            default is None.
+
+        Returns
+        -------
+        : list of pandas.DataFrame
+            The data of each data set in the window.  Each has the "name" attribute of its data set.
+        """
+        if window is None:
+            return list(self.dataSets)
+
+        dataSets = []
+        for dataSet, windowSlice in zip(self.dataSets, self.GetTimeWindowSlices(window)):
+            view      = dataSet.iloc[windowSlice]
+            view.name = dataSet.name
+            dataSets.append(view)
+
+        return dataSets
+
+
+    def GetIndex(self, dataSet:int, time:float, method:str="lower"):
         """
         Gets the index at the specified value of the independent axis.  The index is returned from the specified data set.
 
@@ -166,20 +1176,68 @@ class DataComparison():
             Index of the data set to get the value from.
         time : double
             Time of interest.
+        method : string, optional
+            How the index is selected when the time is between samples.  The default is "lower".
+                lower : The index of the sample before the time.
+                nearest : The index of the sample closest to the time.
 
         Returns
         -------
         : int
             The index (or closest index if the time value does not exist) to the specified time.
         """
-        data            = self.dataSets[dataSet]
-        boundingIndices = Search.BoundingBinarySearch(time, data[self.independentColumn])
-        return boundingIndices[0]
+        match method:
+            case "lower":
+                boundingIndices = self._GetPointGrid(dataSet).BoundingSearch(time)
+                return boundingIndices[0]
+            case "nearest":
+                return Search.NearestIndex(time, self._GetSortedTimeAxis(dataSet))
+            case _:
+                raise Exception("The 'method' parameter is not valid.")
+
+
+    def _GetSortedTimeAxis(self, dataSet:int):
+        """
+        Gets the cached independent column of a data set and checks that it can be searched.
+
+        Parameters
+        ----------
+        dataSet : int
+            Index of the data set.
+
+        Returns
+        -------
+        : numpy.ndarray
+            The independent column values.
+        """
+        if not self.IsMonotonic(dataSet):
+            raise Exception("The independent column of the data set \"" + self.dataSetNames[dataSet] + "\" is not monotonically increasing.")
+        return self.GetTimeAxis(dataSet)
+
+
+    def _GetPointGrid(self, dataSet:int):
+        """
+        Gets the PointGrid used to search the independent column of a data set.  The PointGrid is cached with the independent
+        column, so the spacing of the points is only checked once.
+
+        Parameters
+        ----------
+        dataSet : int
+            Index of the data set.
+
+        Returns
+        -------
+        : PointGrid
+            The PointGrid of the independent column values.
+        """
+        if self.pointGrids[dataSet] is None:
+            self.pointGrids[dataSet] = Search.GetPointGrid(self._GetSortedTimeAxis(dataSet))
+        return self.pointGrids[dataSet]
 
 
     def Apply(self, function):
         """
-        Runs a function on every data set.
+        Runs a function on every data set.  If lazy loading is used, all the columns are loaded first.
 
         Parameters
         ----------
@@ -190,9 +1248,77 @@ class DataComparison():
         -------
         None.
         """
+        self.LoadColumns()
+
         for dataSet in self.dataSets:
              function(dataSet)
 
+        # The function may have modified the data.
+        self.InvalidateCache()
+
+
+    def ApplyParallel(self, function, useProcesses:bool=False, numberOfWorkers:int=None, replace:bool=True):
+        """
+        Runs a function on every data set concurrently.  If lazy loading is used, all the columns are loaded first.
+
+        Parameters
+        ----------
+        function : function
+            The function that is applied to each data set.  The function should take a pandas.DataFrame as the input and
+            either modify it in place (and return None) or return a new pandas.DataFrame.  When processes are used, the
+            function must be picklable (e.g., defined at the module level) and the data sets are copied to the processes.
+        useProcesses : bool, optional
+            If True, a pool of processes is used.  Otherwise, a pool of threads is used.  Threads work well for functions
+            that spend most of their time in numpy/pandas.  The default is False.
+        numberOfWorkers : int, optional
+            The number of threads or processes.  If None, the executor default is used.  The default is None.
+        replace : bool, optional
+            If True, the data sets are replaced by the transformed data sets.  The default is True.
+
+        Returns
+        -------
+        : list of pandas.DataFrame
+            The transformed data sets in the same order as the data sets.
+        """
+        self.LoadColumns()
+
+        executorType = ProcessPoolExecutor if useProcesses else ThreadPoolExecutor
+
+        with executorType(max_workers=numberOfWorkers) as executor:
+            results = list(executor.map(self._ApplyToDataSet, [function]*self.NumberOfDataSets, self.dataSets))
+
+        if replace:
+            for i, result in enumerate(results):
+                # The name attribute is not kept when a DataFrame is sent to another process.
+                result.name      = self.dataSetNames[i]
+                self.dataSets[i] = result
+
+        # The function may have modified the data.
+        self.InvalidateCache()
+
+        return results
+
+
+    @classmethod
+    def _ApplyToDataSet(cls, function, dataSet:pd.DataFrame):
+        """
+        Runs a function on a data set.  A class method so that it can be run in another process.
+
+        Parameters
+        ----------
+        function : function
+            The function that is applied to the data set.
+        dataSet : pandas.DataFrame
+            The data set.
+
+        Returns
+        -------
+        : pandas.DataFrame
+            The value returned by the function or, if the function returned None, the (modified) data set.
+        """
+        result = function(dataSet)
+        return dataSet if result is None else result
+
 
     def CreateComparisonPlot(
             self,
@@ -201,9 +1327,11 @@ class DataComparison():
             xLabel:str=None,
             yLabel:str=None,
             legendOptions:LegendOptions=LegendOptions(),
+            decimate:bool|int=False,
+            window:tuple=None,
             **kwargs
         ):
-        figure, axes = self.NewComparisonPlot(columns, title, xLabel, yLabel, legendOptions, **kwargs)
+        figure, axes = self.NewComparisonPlot(columns, title, xLabel, yLabel, decimate=decimate, window=window, **kwargs)
         LegendHelper.CreateLegendAtFigureBottom(figure, axes, offset=0.15*PlotHelper.GetSettings().Scale, legendOptions=legendOptions)
         plt.show()
         return figure
@@ -215,6 +1343,8 @@ class DataComparison():
             xLabel:str=None,
             yLabel:str|list=None,
             labelSuffixes:str=None,
+            decimate:bool|int=False,
+            window:tuple=None,
             **kwargs
         ):
         """
@@ -233,6 +1363,12 @@ class DataComparison():
         labelSuffixes : str, optional
             The label suffix to append for each series plotted.  If None, then the column name is used.  If supplied, the number of
             of values supplied must equal len(columns).  The default is None.
+        decimate : bool or int, optional
+            If True, each series is reduced to about the pixel width of the axes (the minimum and maximum of each pixel column are
+            kept).  If an integer, each series is reduced to that many buckets.  See PlotMaker.DecimateForAxes.  The default is False.
+        window : tuple of (float, float), optional
+            The start and end of the independent axis to plot.  Only the samples in the window are plotted and the data is not
+            copied.  If None, all the data is plotted.  The default is None.
         **kwargs : keyword arguments
             Keyword arguments to pass to the plot function.
 
@@ -256,14 +1392,20 @@ class DataComparison():
         if labelSuffixes is None:
             labelSuffixes = columns
 
+        self.LoadColumns(columns)
+
         # Convert the kwargs into individual series kwargs.
         seriesKeyWordArgs = PlotHelper.ConvertKeyWordArgumentsToSeriesSets(len(columns)*len(self.dataSets), **kwargs)
 
+        slices = self.GetTimeWindowSlices(window)
+
         i = 0
-        for dataSet, dataSetName in zip(self.dataSets, self.dataSetNames):
+        for j, (dataSet, dataSetName) in enumerate(zip(self.dataSets, self.dataSetNames)):
             for column, labelSuffix in zip(columns, labelSuffixes):
                 label = dataSetName + " " + labelSuffix
-                axes.plot(dataSet[self.independentColumn], dataSet[column], label=label, **(seriesKeyWordArgs[i]))
+                # The independent column is plotted (not the cached float copy) so that types like dates are plotted as themselves.
+                x, y  = PlotMaker.DecimateForAxes(axes, dataSet[self.independentColumn].to_numpy()[slices[j]], dataSet[column].to_numpy()[slices[j]], decimate)
+                axes.plot(x, y, label=label, **(seriesKeyWordArgs[i]))
                 i += 1
 
         # If no title is provided, create a default.
@@ -283,7 +1425,7 @@ class DataComparison():
         return figure, axes
 
 
-    def CreateMultiAxisComparisonPlot(self, axesesColumnNames:list, yLabels:list, legendOptions:LegendOptions=LegendOptions(), **kwargs):
+    def CreateMultiAxisComparisonPlot(self, axesesColumnNames:list, yLabels:list, legendOptions:LegendOptions=LegendOptions(), decimate:bool|int=False, window:tuple=None, **kwargs):
         """
         Creates a multi y-axes plot.  The columns are plotted for each data set.
 
@@ -298,6 +1440,10 @@ class DataComparison():
             A list of strings to use as labels for the y-axes.
         legendOptions : LegendOptions, optional
             Options that specify if and how the legend is generated. The default is LegendOptions().
+        decimate : bool or int, optional
+            If True or an integer, the number of points plotted is reduced.  See PlotMaker.DecimateForAxes.  The default is False.
+        window : tuple of (float, float), optional
+            The start and end of the independent axis to plot.  See NewComparisonPlot.  The default is None.
         **kwargs : keyword arguments
             Keyword arguments to pass to the plot function.
 
@@ -306,10 +1452,12 @@ class DataComparison():
         figure : matplotlib.figure.Figure
             The newly created figure.
         """
+        self.LoadColumns([column for axesColumnNames in axesesColumnNames for column in axesColumnNames])
+
         figure, axeses = PlotHelper.NewMultiYAxesFigure(len(axesesColumnNames))
 
-        for dataSet in self.dataSets:
-            lines = PlotMaker.MultiAxesPlot(axeses, dataSet, self.independentColumn, axesesColumnNames, independentAxis="x", **kwargs)
+        for dataSet in self.GetTimeWindow(window):
+            lines = PlotMaker.MultiAxesPlot(axeses, dataSet, self.independentColumn, axesesColumnNames, independentAxis="x", decimate=decimate, **kwargs)
             for line in lines:
                 line.set_label(dataSet.name + " " + line.get_label())
 
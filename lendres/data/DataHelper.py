@@ -14,7 +14,9 @@ import os
 import io
 
 from   lendres.algorithms.Search                                import Search
+from   lendres.algorithms.Selection                             import Selection
 from   lendres.io.ConsoleHelper                                 import ConsoleHelper
+from   lendres.io.CsvCache                                      import CsvCache
 from   lendres.data.DataHelperBase                              import DataHelperBase
 
 
@@ -75,7 +77,7 @@ class DataHelper(DataHelperBase):
         super().CopyFrom(dataHelper)
 
 
-    def LoadAndInspectData(self, inputFile, verboseLevel=ConsoleHelper.VERBOSEREQUESTED, **kwargs):
+    def LoadAndInspectData(self, inputFile, verboseLevel=ConsoleHelper.VERBOSEREQUESTED, csvCache:CsvCache=None, **kwargs):
         """
         Loads a data file and performs some initial inspections and reports results.
 
@@ -88,6 +90,8 @@ class DataHelper(DataHelperBase):
             Path and name of the file to load.
         verboseLevel : integer, optional
             Verbose level to use for the ConsoleHelper.  Default is ConsoleHelper.VERBOSEREQUESTED.
+        csvCache : CsvCache, optional
+            If supplied, the file is read through the cache.  The default is None.
         **kwargs : keyword arguments
             These arguments are passed on to the Pandas.read_csv function.
 
@@ -105,7 +109,10 @@ class DataHelper(DataHelperBase):
 
         # Read the file in.
         self.consoleHelper.PrintTitle("Input File: " + inputFile, verboseLevel)
-        self.data = pd.read_csv(inputFile, **kwargs)
+        if csvCache is not None:
+            self.data = csvCache.ReadCsv(inputFile, **kwargs)
+        else:
+            self.data = pd.read_csv(inputFile, **kwargs)
 
         # Data size and shape.
         self.consoleHelper.PrintTitle("Data Size", verboseLevel)
@@ -619,18 +626,16 @@ class DataHelper(DataHelperBase):
             # A boo-boo was made.
             raise Exception("Invalid \"method\" specified.")
 
-        # Sort then display the start and end of the series.
-        sortedSeries = self.data[column].sort_values()
+        # Select the smallest and largest values instead of sorting the entire column.
+        series                     = self.data[column]
+        smallestIndices, smallest  = Selection.Smallest(series.to_numpy(), numberOfRows)
+        largestIndices,  largest   = Selection.Largest(series.to_numpy(), numberOfRows)
 
         # Create new DataFrames for the head (smallest values) and the tail (largest values).
-        # Reset the index to move the index to a column and create a new, renumbered index.  This lets us combine the two DataFrames at
-        # the same index and saves the indices so we can use them later.
-        # Also, rename the columns to make them more meaningful.
-        head = sortedSeries.head(numberOfRows).reset_index()
-        head.rename({"index" : "Smallest_Index", column : "Smallest"}, axis=1, inplace=True)
-
-        tail = sortedSeries.tail(numberOfRows).reset_index()
-        tail.rename({"index" : "Largest_Index", column : "Largest"}, axis=1, inplace=True)
+        # The index labels are saved in a column so we can use them later.  The largest values are reversed so both
+        # DataFrames are in ascending order.
+        head = pd.DataFrame({"Smallest_Index" : series.index[smallestIndices], "Smallest" : smallest})
+        tail = pd.DataFrame({"Largest_Index" : series.index[largestIndices[::-1]], "Largest" : largest[::-1]})
 
         # Combine the two along the columns and return the result.
         return pd.concat([head, tail], axis=1)
@@ -883,12 +888,12 @@ class DataHelper(DataHelperBase):
         newColumnName : string
             Name of the new column that contains the categorized numbers.
         """
-        newColumn      = pd.Series(np.zeros(self.data.shape[0]))
-        existingColumn = self.data[column]
+        lowerIndices, upperIndices = Search.BoundingBinarySearchArray(self.data[column].to_numpy(), boundaries, returnedUnits="indices")
+
+        if np.isnan(lowerIndices).any():
+            raise Exception("The column \"" + column + "\" contains values that are outside of the boundaries.")
 
-        for i in range(existingColumn.size):
-            boundedIndices   = Search.BoundingBinarySearch(existingColumn.iloc[i], boundaries, returnedUnits="indices")
-            newColumn.loc[i] = labels[boundedIndices[0]]
+        newColumn      = pd.Series(np.asarray(labels, dtype=object)[lowerIndices.astype(int)], index=self.data.index)
 
         # Default to the original column name, then determine how to procede based on if we are to replace
         # the existing column or add a new one while retaining the original one.
@@ -0,0 +1,434 @@
+"""
+Created on October 18, 2026
+@author: Lance A. Endres
+"""
+import pandas                                                        as pd
+import numpy                                                         as np
+import hashlib
+import json
+import sys
+import threading
+import re
+import os
+
+
+class CsvCache():
+    """
+    A disk cache of parsed CSV files.
+
+    The first time a CSV file is read, the parsed DataFrame is saved in a binary format.  Later reads of the same file (with the
+    same read options) load the binary copy, which is much faster than parsing the CSV file again.
+
+    The cache entries are keyed by the file path, size, modification time, and read options, so a cache entry is not used after
+    the source file changes.  When the size of the cache exceeds the maximum, the least recently used entries are removed.
+
+    The default format stores each column as a numpy array and is loaded without pickle, so a cache file cannot run code when
+    it is read.  The pickle format can, so it should only be used with a cache directory that only trusted users can write to.
+    """
+
+    # File extension and functions used to write and read each format.  Feather and parquet require the pyarrow library.
+    formats = {
+        "npz"     : ("npz",     lambda data, path: CsvCache._WriteNpz(data, path), lambda path: CsvCache._ReadNpz(path)),
+        "pickle"  : ("pkl",     lambda data, path: data.to_pickle(path),           pd.read_pickle),
+        "feather" : ("feather", lambda data, path: data.to_feather(path),          pd.read_feather),
+        "parquet" : ("parquet", lambda data, path: data.to_parquet(path),          pd.read_parquet)
+    }
+
+    # The names of the cache files are the source file name, the key (see GetCachePath), and the format extension.
+    cacheFilePattern = re.compile(r".+\.[0-9a-f]{20}\.([a-z]+)")
+
+
+    def __init__(self, directory:str=None, maximumSize:int=2**30, fileFormat:str="npz"):
+        """
+        Constructor.
+
+        Parameters
+        ----------
+        directory : str, optional
+            The directory to store the cache files in.  If None, a directory in the user's cache directory (see
+            GetDefaultDirectory) is used.  The default is None.
+        maximumSize : int, optional
+            The maximum size of the cache (in bytes).  The default is 1 GB.
+        fileFormat : str, optional
+            The format the cache files are stored in.  The default is "npz".
+                npz : A numpy array for each column, loaded without pickle.  Data that cannot be stored as plain arrays (e.g.,
+                    columns of mixed types) is not cached.
+                pickle : Python pickle.  Preserves the data types and index exactly.  Loading a pickle can run code, so only use
+                    it with a directory that only trusted users can write to.
+                feather : Apache Arrow Feather.  Requires pyarrow and a default index.
+                parquet : Apache Parquet.  Requires pyarrow.
+
+        Returns
+        -------
+        None.
+        """
+        if fileFormat not in self.formats:
+            raise Exception("The file format \"" + fileFormat + "\" is not valid.")
+
+        self.directory    = self.GetDefaultDirectory() if directory is None else directory
+        self.maximumSize  = maximumSize
+        self.fileFormat   = fileFormat
+
+        self.hits         = 0
+        self.misses       = 0
+        self.evictions    = 0
+        self.lock         = threading.Lock()
+
+
+    def __getstate__(self):
+        # Locks cannot be pickled, which is required to pass the cache to another process.
+        state = self.__dict__.copy()
+        del state["lock"]
+        return state
+
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
+
+
+    @property
+    def Statistics(self):
+        """
+        Gets the cache hit and miss statistics.  Only reads made in this process are counted.
+
+        Returns
+        -------
+        : dict
+            The number of hits, misses, evictions, and the hit rate.
+        """
+        reads = self.hits + self.misses
+        return {
+            "hits"      : self.hits,
+            "misses"    : self.misses,
+            "evictions" : self.evictions,
+            "hitrate"   : self.hits / reads if reads > 0 else 0.0
+        }
+
+
+    def ReadCsv(self, path:str, **kwargs):
+        """
+        Reads a CSV file through the cache.
+
+        Parameters
+        ----------
+        path : str
+            Path to the CSV file.
+        **kwargs : keyword arguments
+            These arguments are passed on to the pandas.read_csv function.  They are part of the cache key.
+
+        Returns
+        -------
+        data : pandas.DataFrame
+            The file loaded into a DataFrame.
+        """
+        write, read            = self.formats[self.fileFormat][1:]
+        cachePath              = self.GetCachePath(path, **kwargs)
+
+        if os.path.exists(cachePath):
+            try:
+                data = read(cachePath)
+                # Update the modification time, it is used to find the least recently used entries.
+                os.utime(cachePath)
+                with self.lock:
+                    self.hits += 1
+                return data
+            except Exception:
+                # The entry was removed or is not readable, so read the source file instead.
+                pass
+
+        data = pd.read_csv(path, **kwargs)
+
+        with self.lock:
+            self.misses += 1
+
+        # Write to a temporary file and then move it into place so a partially written file is never read.  The directory is
+        # only accessible by the user when it is created here.
+        os.makedirs(os.path.dirname(cachePath), mode=0o700, exist_ok=True)
+        temporaryPath = cachePath + "." + str(os.getpid()) + "." + str(threading.get_ident()) + ".tmp"
+        try:
+            write(data, temporaryPath)
+        except TypeError:
+            # The data cannot be stored in the format.
+            if os.path.exists(temporaryPath):
+                os.remove(temporaryPath)
+            return data
+        os.replace(temporaryPath, cachePath)
+
+        self.Evict(os.path.dirname(cachePath))
+        return data
+
+
+    def GetCachePath(self, path:str, **kwargs):
+        """
+        Gets the path of the cache file for a source file and read options.
+
+        Parameters
+        ----------
+        path : str
+            Path to the CSV file.
+        **kwargs : keyword arguments
+            The pandas.read_csv arguments.
+
+        Returns
+        -------
+        : str
+            The path of the cache file.
+        """
+        path      = os.path.abspath(path)
+        status    = os.stat(path)
+        extension = self.formats[self.fileFormat][0]
+
+        key       = repr((path, status.st_size, status.st_mtime_ns, sorted(kwargs.items())))
+        key       = hashlib.sha1(key.encode("utf-8")).hexdigest()[:20]
+
+        return os.path.join(self.directory, os.path.basename(path) + "." + key + "." + extension)
+
+
+    @classmethod
+    def GetDefaultDirectory(cls):
+        """
+        Gets the default cache directory.  The directory is in the user's cache directory so that other users cannot write to it.
+            Windows : %LOCALAPPDATA%\\lendres\\csvcache
+            Other : $XDG_CACHE_HOME/lendres/csvcache (~/.cache/lendres/csvcache if XDG_CACHE_HOME is not set)
+
+        Returns
+        -------
+        : str
+            The default cache directory.
+        """
+        if sys.platform.startswith("win"):
+            root = os.environ.get("LOCALAPPDATA", os.path.join(os.path.expanduser("~"), "AppData", "Local"))
+        else:
+            root = os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache"))
+        return os.path.join(root, "lendres", "csvcache")
+
+
+    def Evict(self, directory:str):
+        """
+        Removes the least recently used cache files from a cache directory until the cache is smaller than the maximum size.
+
+        Parameters
+        ----------
+        directory : str
+            The cache directory.
+
+        Returns
+        -------
+        None.
+        """
+        entries = []
+        for cachePath in self._GetCacheFiles(directory):
+            try:
+                status = os.stat(cachePath)
+                entries.append((status.st_mtime, status.st_size, cachePath))
+            except OSError:
+                # Removed by another reader.
+                pass
+
+        totalSize = sum(entry[1] for entry in entries)
+
+        # Oldest first.
+        for modifiedTime, size, cachePath in sorted(entries):
+            if totalSize <= self.maximumSize:
+                break
+            try:
+                os.remove(cachePath)
+                with self.lock:
+                    self.evictions += 1
+            except OSError:
+                pass
+            totalSize -= size
+
+
+    def Clear(self, directory:str=None):
+        """
+        Removes all the cache files from a cache directory.
+
+        Parameters
+        ----------
+        directory : str, optional
+            The cache directory.  If None, the cache directory of this cache is used.  The default is None.
+
+        Returns
+        -------
+        None.
+        """
+        directory = self.directory if directory is None else directory
+
+        for cachePath in self._GetCacheFiles(directory):
+            os.remove(cachePath)
+
+
+    @classmethod
+    def _WriteNpz(cls, data:pd.DataFrame, path:str):
+        """
+        Writes a DataFrame as a numpy array for each column.  The column names and types are stored as JSON text, so nothing
+        is pickled.
+
+        Parameters
+        ----------
+        data : pandas.DataFrame
+            The data.
+        path : str
+            The path of the file.
+
+        Returns
+        -------
+        None.
+        """
+        if isinstance(data.columns, pd.MultiIndex):
+            raise TypeError("Multiple level column names cannot be stored.")
+
+        arrays   = {}
+        columns  = []
+        for i, column in enumerate(data.columns):
+            columns.append(cls._EncodeSeries(data.iloc[:, i], "column" + str(i), arrays))
+
+        index    = None
+        if not data.index.equals(pd.RangeIndex(len(data))):
+            if isinstance(data.index, pd.MultiIndex):
+                raise TypeError("Multiple level indices cannot be stored.")
+            index = cls._EncodeSeries(data.index.to_series(), "index", arrays)
+            index["name"] = data.index.name
+
+        metadata = {"names" : [column for column in data.columns], "columns" : columns, "index" : index, "length" : len(data)}
+        try:
+            arrays["metadata"] = np.array(json.dumps(metadata))
+        except (TypeError, ValueError):
+            # Column names that are not strings or numbers.
+            raise TypeError("The column names cannot be stored.")
+
+        # Write through a file object so that numpy does not add an extension to the path.
+        with open(path, "wb") as file:
+            np.savez(file, **arrays)
+
+
+    @classmethod
+    def _EncodeSeries(cls, series:pd.Series, key:str, arrays:dict):
+        """
+        Converts a column to numpy arrays that can be loaded without pickle.
+
+        Parameters
+        ----------
+        series : pandas.Series
+            The column.
+        key : str
+            The name the arrays are stored with.
+        arrays : dict
+            The arrays to store.  The arrays of the column are added to it.
+
+        Returns
+        -------
+        : dict
+            The information needed to restore the column.
+        """
+        dtype = series.dtype
+
+        # Numbers, booleans, and dates are stored as they are.
+        if isinstance(dtype, np.dtype) and dtype.kind in "biufcmM":
+            arrays[key] = series.to_numpy()
+            return {"key" : key, "dtype" : dtype.str, "text" : False}
+
+        # Text is stored as the UTF-8 bytes of all the values joined together, the character position each value ends at, and a
+        # mask of the missing values.  A fixed width unicode array would pad every value to the longest one at 4 bytes a character.
+        values  = series.to_numpy(dtype=object)
+        missing = series.isna().to_numpy()
+        values  = np.where(missing, "", values).tolist()
+        if not all(type(value) is str for value in values):
+            raise TypeError("The column \"" + str(series.name) + "\" cannot be stored.")
+
+        try:
+            text = "".join(values).encode("utf-8")
+        except UnicodeEncodeError:
+            raise TypeError("The column \"" + str(series.name) + "\" cannot be stored.")
+
+        arrays[key]             = np.frombuffer(text, dtype=np.uint8)
+        arrays[key + "ends"]    = np.cumsum(np.fromiter(map(len, values), dtype=np.int64, count=len(values)))
+        arrays[key + "missing"] = missing
+        return {"key" : key, "dtype" : str(dtype), "text" : True}
+
+
+    @classmethod
+    def _ReadNpz(cls, path:str):
+        """
+        Reads a DataFrame written by _WriteNpz.
+
+        Parameters
+        ----------
+        path : str
+            The path of the file.
+
+        Returns
+        -------
+        : pandas.DataFrame
+            The data.
+        """
+        with np.load(path, allow_pickle=False) as arrays:
+            metadata = json.loads(str(arrays["metadata"]))
+            columns  = [cls._DecodeSeries(arrays, column) for column in metadata["columns"]]
+
+            index    = pd.RangeIndex(metadata["length"])
+            if metadata["index"] is not None:
+                index = pd.Index(cls._DecodeSeries(arrays, metadata["index"]), name=metadata["index"]["name"])
+
+        data         = pd.DataFrame(dict(enumerate(columns)), index=index)
+        data.columns = metadata["names"]
+        return data
+
+
+    @classmethod
+    def _DecodeSeries(cls, arrays, column:dict):
+        """
+        Restores the values of a column stored by _EncodeSeries.
+
+        Parameters
+        ----------
+        arrays : numpy.lib.npyio.NpzFile
+            The stored arrays.
+        column : dict
+            The information needed to restore the column.
+
+        Returns
+        -------
+        : numpy.ndarray or pandas.array
+            The values.
+        """
+        values = arrays[column["key"]]
+        if not column["text"]:
+            return values
+
+        # The text is decoded once and then divided at the character positions the values end at.
+        text   = values.tobytes().decode("utf-8")
+        ends   = arrays[column["key"] + "ends"].tolist()
+        values = np.empty(len(ends), dtype=object)
+        values[:] = [text[start:end] for start, end in zip([0] + ends[:-1], ends)]
+        values[arrays[column["key"] + "missing"]] = np.nan
+        return pd.array(values, dtype=column["dtype"])
+
+
+    def _GetCacheFiles(self, directory:str):
+        """
+        Gets the cache files in a directory.  Only files with cache file names in the format of this cache are returned, so
+        other files in the directory are never removed.
+
+        Parameters
+        ----------
+        directory : str
+            The cache directory.
+
+        Returns
+        -------
+        : list of str
+            The paths of the cache files.
+        """
+        if not os.path.isdir(directory):
+            return []
+
+        extension  = self.formats[self.fileFormat][0]
+        cacheFiles = []
+        for name in os.listdir(directory):
+            match = self.cacheFilePattern.fullmatch(name)
+            if match is not None and match.group(1) == extension:
+                cacheFiles.append(os.path.join(directory, name))
+        return cacheFiles
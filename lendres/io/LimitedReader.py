@@ -0,0 +1,54 @@
+"""
+Created on October 18, 2026
+@author: Lance A. Endres
+"""
+
+
+class LimitedReader():
+    """
+    A binary file object that reads a file up to a set position.  Used to parse only the start of a file that is still being
+    written (e.g., the complete lines) without reading it into memory first.
+    """
+
+    def __init__(self, file, end:int):
+        """
+        Constructor.
+
+        Parameters
+        ----------
+        file : file object
+            A binary file opened for reading.  Reading starts at the current position of the file.
+        end : int
+            The position in the file that reading stops at.
+
+        Returns
+        -------
+        None.
+        """
+        self.file      = file
+        self.remaining = max(end - file.tell(), 0)
+
+
+    def read(self, size:int=-1):
+        """
+        Reads bytes from the file.
+
+        Parameters
+        ----------
+        size : int, optional
+            The maximum number of bytes to read.  If negative or None, the bytes up to the end position are read.  The default
+            is -1.
+
+        Returns
+        -------
+        : bytes
+            The bytes read.  Empty at the end position.
+        """
+        size            = self.remaining if size is None or size < 0 else min(size, self.remaining)
+        data            = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+
+    def __iter__(self):
+        return iter(self.read().splitlines(keepends=True))
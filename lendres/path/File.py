@@ -3,15 +3,65 @@ Created on November 16, 2022
 @author: Lance A. Endres
 """
 import os
-from   io                                                       import TextIOWrapper
+import mmap
+import shutil
+import gzip
+import bz2
+import lzma
+import collections
+import zlib
+import heapq
+import tempfile
+from   io                                                       import BufferedReader
+from   io                                                       import BufferedWriter
+from   concurrent.futures                                       import ThreadPoolExecutor
+from   concurrent.futures                                       import ProcessPoolExecutor
 
 
 class File():
 
+    # The compressed file extensions and the functions used to open each.  The compression level is a "preset" for xz.
+    compressionFormats = {
+        ".gz"  : lambda path, mode, level: gzip.open(path, mode, compresslevel=9 if level is None else level),
+        ".bz2" : lambda path, mode, level: bz2.open(path, mode, compresslevel=9 if level is None else level),
+        ".xz"  : lambda path, mode, level: lzma.open(path, mode, preset=level)
+    }
+
+    # The functions used to compress a block of data for each compressed file extension.  The compressed blocks can be written one
+    # after the other to make a file.
+    compressionFunctions = {
+        ".gz"  : lambda data, level: gzip.compress(data, compresslevel=9 if level is None else level),
+        ".bz2" : lambda data, level: bz2.compress(data, compresslevel=9 if level is None else level),
+        ".xz"  : lambda data, level: lzma.compress(data, preset=level)
+    }
+
     @classmethod
-    def SplitFileByNumberOfLines(cls, path:str, numberOfLines:int=40000, hasHeader:bool=True):
+    def SplitFileByNumberOfLines(
+            cls,
+            path:str,
+            numberOfLines:int=40000,
+            hasHeader:bool=True,
+            outputFileNameFormat:str="{base} part {number}.csv",
+            blockSize:int=2**22,
+            compressionLevel:int=None,
+            numberOfWorkers:int=1
+        ):
         """
-        Constructor.
+        Splits a file into files that each have a set number of lines.
+
+        The file is read in large binary blocks and the line endings are counted in each block, so the lines are never
+        decoded or held in memory.  The memory used is set by the block size, not the size of the file.
+
+        The file is normally split in one pass.  Compressed files (".gz", ".bz2", and ".xz") are decompressed as they are read.
+        If the parts are compressed, each block is compressed separately on a pool of threads and the blocks are written in
+        order.  A compressed file made of separately compressed blocks is a valid file for all the formats.  At most two blocks
+        per worker are held at a time.
+
+        When an uncompressed file is split into compressed parts with more than one worker, the line endings are counted first
+        to find the byte range of each part, then the parts are compressed concurrently like SplitFileBySize.  This reads the
+        file twice, but each part is compressed as a whole, which compresses better than separate blocks.
+
+        The parts are compressed if the output file names have a compressed file extension.
 
         Parameters
         ----------
@@ -22,96 +72,723 @@ class File():
         hasHeader : bool
             Set to True if the file contains a header line (one line only).  The header will then be copied
             into each file.  Set to False if the file does not contain a header.
+        outputFileNameFormat : string, optional
+            The format used to create the output file names.  The fields are:
+                base : The input path without the file extension (or extensions for a compressed file).
+                number : The part number (starting at 1).
+                extension : The file extension of the input file (including the ".").  For a compressed file, the extension
+                    before the compressed file extension.
+                compression : The compressed file extension of the input file (e.g., ".gz") or an empty string.
+            The default is "{base} part {number}.csv".
+        blockSize : integer, optional
+            The number of bytes read at a time.  The default is 4 MB.
+        compressionLevel : integer, optional
+            The compression level of compressed parts.  If None, the default of the compression format is used.  The default is None.
+        numberOfWorkers : integer, optional
+            The number of threads used to copy or compress the parts.  The default is 1.
 
         Returns
         -------
         outputFiles : list
             A list of the files generated from the split.
         """
-        # Removes the file extension and returns everything else, including the directory.
-        baseFileName    = os.path.splitext(path)[0]
+        if numberOfLines < 1:
+            raise Exception("The number of lines must be at least one.")
+
+        compressedParts = cls.GetCompression(cls.GetPartFileName(path, 1, outputFileNameFormat)) != ""
+        if cls.GetCompression(path) != "" or not compressedParts or numberOfWorkers < 2:
+            return cls._SplitFileByNumberOfLinesInOnePass(path, numberOfLines, hasHeader, outputFileNameFormat, blockSize, compressionLevel, numberOfWorkers)
+
+        header, ranges = cls._GetLineSplitRanges(path, numberOfLines, hasHeader, blockSize)
+        outputFiles    = [cls.GetPartFileName(path, i+1, outputFileNameFormat) for i in range(len(ranges))]
+
+        with ThreadPoolExecutor(max_workers=numberOfWorkers) as executor:
+            futures = [
+                executor.submit(cls._CopyRange, path, outputFile, header, start, end, compressionLevel, blockSize)
+                for outputFile, (start, end) in zip(outputFiles, ranges)
+            ]
+            # Raises any errors from the copying.
+            for future in futures:
+                future.result()
+
+        return outputFiles
+
+
+    @classmethod
+    def _GetLineSplitRanges(cls, path:str, numberOfLines:int, hasHeader:bool, blockSize:int=2**22):
+        """
+        Finds the byte ranges of the parts of an uncompressed file that is split by the number of lines.
+
+        Parameters
+        ----------
+        path : string
+            Full path and file name of the file to split.
+        numberOfLines : integer
+            The number of lines in each part.
+        hasHeader : bool
+            If True, the first line is the header and it is not included in the ranges.
+        blockSize : integer, optional
+            The number of bytes read at a time.  The default is 4 MB.
+
+        Returns
+        -------
+        header, ranges : bytes, list of tuple(int, int)
+            The header line and the (start, end) byte positions of each part.
+        """
+        splitPoints = []
+
+        with open(path, "rb") as sourceFile:
+            header          = sourceFile.readline() if hasHeader else b""
+            position        = len(header)
+
+            # The number of lines that still fit in the current part.
+            linesRemaining  = 0
+
+            while True:
+                block = sourceFile.read(blockSize)
+                if len(block) == 0:
+                    break
+
+                # The line endings after "start."  Counted once so the rest of the block is not scanned again for each part.
+                start       = 0
+                lineEndings = block.count(b"\n")
+                while start < len(block):
+                    # A part is only started when there is data for it so that an empty part is never written.
+                    if linesRemaining == 0:
+                        splitPoints.append(position + start)
+                        linesRemaining = numberOfLines
+
+                    if lineEndings < linesRemaining:
+                        linesRemaining -= lineEndings
+                        break
+
+                    start           = cls._FindLineEnd(block, start, linesRemaining)
+                    lineEndings    -= linesRemaining
+                    linesRemaining  = 0
 
+                position += len(block)
+
+        splitPoints.append(position)
+        return header, list(zip(splitPoints[:-1], splitPoints[1:]))
+
+
+    @classmethod
+    def _SplitFileByNumberOfLinesInOnePass(
+            cls,
+            path:str,
+            numberOfLines:int,
+            hasHeader:bool,
+            outputFileNameFormat:str,
+            blockSize:int,
+            compressionLevel:int,
+            numberOfWorkers:int
+        ):
+        """
+        Splits a file into files that each have a set number of lines by reading it once.  See SplitFileByNumberOfLines.
+
+        Returns
+        -------
+        outputFiles : list
+            A list of the files generated from the split.
+        """
         outputFiles     = []
+        outputFile      = None
+        compress        = cls.compressionFunctions.get(cls.GetCompression(cls.GetPartFileName(path, 1, outputFileNameFormat)))
 
-        with open(path, "r") as sourceFile:
-            lineCount   = 0
-            fileNumber  = 0
+        # The blocks being compressed and the file each is written to.  An entry without a block closes the file.
+        pending         = collections.deque()
+        maximumPending  = 2*numberOfWorkers
 
-            header      = ""
-            if hasHeader:
-                header  = sourceFile.readline()
-            lines       = []
-
-            # Read all the lines.
-            # Every time we read a "numberOfLines" a file is written from the read lines.  The number of lines
-            # is the cleared and line reading continues.  Note that this means there is likely left over lines
-            # as the file will not contain a number of lines evenly divisible by "numberOfLines."  Those are
-            # written after the loop.
-            for line in sourceFile:
-                lineCount += 1
-                lines.append(line)
+        def WritePending(numberToHold):
+            while len(pending) > numberToHold:
+                partFile, future = pending.popleft()
+                if future is None:
+                    partFile.close()
+                else:
+                    partFile.write(future.result())
 
-                # Write one file every time we reach the number of specified lines.
-                if lineCount % numberOfLines == 0:
-                    fileNumber += 1
-                    outputFileName = cls._WriteFileSection(baseFileName, fileNumber, header, lines)
-                    outputFiles.append(outputFileName)
-                    lines = []
+        def Write(data):
+            if compress is None:
+                outputFile.write(data)
+            elif len(data) > 0:
+                pending.append((outputFile, executor.submit(compress, data, compressionLevel)))
+                WritePending(maximumPending)
 
-            # Write any remaining lines.
-            if len(lines) > 0:
-                fileNumber += 1
-                outputFileName = cls._WriteFileSection(baseFileName, fileNumber, header, lines)
-                outputFiles.append(outputFileName)
+        def Close():
+            if compress is None:
+                outputFile.close()
+            else:
+                pending.append((outputFile, None))
+
+        with ThreadPoolExecutor(max_workers=numberOfWorkers) as executor:
+            try:
+                with cls.OpenFile(path, "rb") as sourceFile:
+                    header          = sourceFile.readline() if hasHeader else b""
+
+                    # The number of lines that still fit in the current output file.
+                    linesRemaining  = 0
+
+                    while True:
+                        block = sourceFile.read(blockSize)
+                        if len(block) == 0:
+                            break
+
+                        # The line endings after "start."  Counted once so the rest of the block is not scanned again for each
+                        # part.
+                        start       = 0
+                        lineEndings = block.count(b"\n")
+                        while start < len(block):
+                            # Start a new file when the current one is full.  Files are only started when there is data for them
+                            # so that an empty file is never written.
+                            if linesRemaining == 0:
+                                if outputFile is not None:
+                                    Close()
+                                outputFiles.append(cls.GetPartFileName(path, len(outputFiles)+1, outputFileNameFormat))
+                                outputFile     = open(outputFiles[-1], "wb")
+                                linesRemaining = numberOfLines
+                                Write(header)
+
+                            if lineEndings < linesRemaining:
+                                # The rest of the block fits in the current file.
+                                Write(block[start:] if start > 0 else block)
+                                linesRemaining -= lineEndings
+                                break
+
+                            end             = cls._FindLineEnd(block, start, linesRemaining)
+                            Write(block[start:end])
+                            lineEndings    -= linesRemaining
+                            linesRemaining  = 0
+                            start           = end
+
+                if outputFile is not None:
+                    Close()
+                WritePending(0)
+            finally:
+                # Close the files that were not finished because of an error.
+                for partFile, future in pending:
+                    partFile.close()
+                if outputFile is not None:
+                    outputFile.close()
 
         return outputFiles
 
 
     @classmethod
-    def _WriteFileSection(cls, baseFileName:str, fileNumber:int, header:str, lines:list[str]):
+    def OpenFile(cls, path:str, mode:str="rb", compressionLevel:int=None):
         """
-        Writes the lines to a new file.
+        Opens a file in binary mode.  Compressed files (".gz", ".bz2", and ".xz") are opened so that they are decompressed as
+        they are read or compressed as they are written.
 
         Parameters
         ----------
-        baseFileName : string
-            Root file name to use for the output file name.  The part number will be appended to
-            this name to create a new, unique file name.
-        fileNumber : integer
-            The number of the file.  This function is used when breaking a file into a sequence of files.
-            This number is the current count of written files (including the current one).
-        header : string
-            The header text to write to the file.
-        lines : list of strings
-            The lines to write to the file.
+        path : string
+            Full path and file name of the file.
+        mode : string, optional
+            The binary mode to open the file with ("rb", "wb", or "ab").  The default is "rb".
+        compressionLevel : integer, optional
+            The compression level used when writing a compressed file.  If None, the default of the compression format is used.
+            The default is None.
+
+        Returns
+        -------
+        : file object
+            The opened file.
+        """
+        compression = cls.GetCompression(path)
+        if compression != "":
+            return cls.compressionFormats[compression](path, mode, compressionLevel)
+        return open(path, mode)
+
+
+    @classmethod
+    def GetCompression(cls, path:str):
+        """
+        Gets the compressed file extension of a file.
+
+        Parameters
+        ----------
+        path : string
+            Full path and file name of the file.
+
+        Returns
+        -------
+        : string
+            The compressed file extension (e.g., ".gz") or an empty string if the file is not compressed.
+        """
+        extension = os.path.splitext(path)[1].lower()
+        return extension if extension in cls.compressionFormats else ""
+
+
+    @classmethod
+    def SplitFileBySize(
+            cls,
+            path:str,
+            partSize:int=None,
+            numberOfParts:int=None,
+            hasHeader:bool=True,
+            outputFileNameFormat:str="{base} part {number}.csv",
+            compressionLevel:int=None,
+            numberOfWorkers:int=None
+        ):
+        """
+        Splits a file into parts of about the same size.  Either the size of the parts or the number of parts is specified.
+
+        The split points are found by seeking to the target positions and moving each one forward to the start of the next
+        line, so only a few bytes around each split point are read to find them.  The parts are then copied concurrently.
+        Each part has about the same number of bytes, not the same number of lines.
+
+        The file cannot be compressed, because a compressed file cannot be read starting at a split point.  The parts are
+        compressed if the output file names have a compressed file extension, which is done concurrently like the copying.
+
+        Parameters
+        ----------
+        path : string
+            Full path and file name of the file to split.
+        partSize : integer, optional
+            The target size of each part (in bytes, not including the header).  The default is None.
+        numberOfParts : integer, optional
+            The number of parts.  Fewer parts are created if the file has fewer lines.  The default is None.
+        hasHeader : bool
+            Set to True if the file contains a header line (one line only).  The header will then be copied
+            into each file.  Set to False if the file does not contain a header.
+        outputFileNameFormat : string, optional
+            The format used to create the output file names.  See SplitFileByNumberOfLines.  The default is "{base} part {number}.csv".
+        compressionLevel : integer, optional
+            The compression level of compressed parts.  If None, the default of the compression format is used.  The default is None.
+        numberOfWorkers : integer, optional
+            The number of threads used to copy the parts.  If None, the executor default is used.  The default is None.
+
+        Returns
+        -------
+        outputFiles : list
+            A list of the files generated from the split.
+        """
+        if (partSize is None) == (numberOfParts is None):
+            raise Exception("Either the part size or the number of parts must be specified.")
+
+        if cls.GetCompression(path) != "":
+            raise Exception("A compressed file cannot be split by size.  Use SplitFileByNumberOfLines instead.")
+
+        header, ranges = cls._GetSplitRanges(path, partSize, numberOfParts, hasHeader)
+        outputFiles    = [cls.GetPartFileName(path, i+1, outputFileNameFormat) for i in range(len(ranges))]
+
+        with ThreadPoolExecutor(max_workers=numberOfWorkers) as executor:
+            futures = [
+                executor.submit(cls._CopyRange, path, outputFile, header, start, end, compressionLevel)
+                for outputFile, (start, end) in zip(outputFiles, ranges)
+            ]
+            # Raises any errors from the copying.
+            for future in futures:
+                future.result()
+
+        return outputFiles
+
+
+    @classmethod
+    def _GetSplitRanges(cls, path:str, partSize:int, numberOfParts:int, hasHeader:bool):
+        """
+        Finds the byte ranges of the parts of a file that is split by size.  Each range starts at the start of a line.
+
+        Parameters
+        ----------
+        path : string
+            Full path and file name of the file to split.
+        partSize : integer
+            The target size of each part (in bytes).  Not used if the number of parts is specified.
+        numberOfParts : integer
+            The number of parts.
+        hasHeader : bool
+            If True, the first line is the header and it is not included in the ranges.
 
         Returns
         -------
+        header, ranges : bytes, list of tuple(int, int)
+            The header line and the (start, end) byte positions of each part.
+        """
+        if os.path.getsize(path) == 0:
+            return b"", []
+
+        with open(path, "rb") as sourceFile:
+            with mmap.mmap(sourceFile.fileno(), 0, access=mmap.ACCESS_READ) as memoryMap:
+                size        = len(memoryMap)
+                dataStart   = 0
+                if hasHeader:
+                    dataStart = memoryMap.find(b"\n") + 1
+                    dataStart = size if dataStart == 0 else dataStart
+                header      = memoryMap[:dataStart]
+
+                dataSize    = size - dataStart
+                if dataSize == 0:
+                    return header, []
+
+                if numberOfParts is None:
+                    if partSize < 1:
+                        raise Exception("The part size must be at least one byte.")
+                    numberOfParts = -(-dataSize // partSize)
+                elif numberOfParts < 1:
+                    raise Exception("The number of parts must be at least one.")
+
+                # Move each target split point to the start of the next line.  A target that is already at the start of a line
+                # is not moved.  Targets in the same line give the same split point, so duplicates are removed.
+                splitPoints = [dataStart]
+                for i in range(1, numberOfParts):
+                    target = dataStart + dataSize*i // numberOfParts
+                    if target <= splitPoints[-1]:
+                        continue
+                    split  = memoryMap.find(b"\n", target-1) + 1
+                    if split == 0 or split >= size:
+                        break
+                    if split > splitPoints[-1]:
+                        splitPoints.append(split)
+
+        splitPoints.append(size)
+        return header, list(zip(splitPoints[:-1], splitPoints[1:]))
+
+
+    @classmethod
+    def _CopyRange(cls, path:str, outputFileName:str, header:bytes, start:int, end:int, compressionLevel:int=None, blockSize:int=2**22):
+        """
+        Copies a byte range of a file to a new file.
+
+        Parameters
+        ----------
+        path : string
+            Full path and file name of the file to copy from.
         outputFileName : string
-            The path and file name of the file written.
+            The path and file name of the file to write.
+        header : bytes
+            The header written at the start of the new file.
+        start : integer
+            The position of the first byte to copy.
+        end : integer
+            The position after the last byte to copy.
+        compressionLevel : integer, optional
+            The compression level used if the new file is compressed.  The default is None.
+        blockSize : integer, optional
+            The number of bytes copied at a time.  The default is 4 MB.
+
+        Returns
+        -------
+        None.
         """
-        outputFileName = baseFileName+" part "+str(fileNumber)+".csv"
-        with open(outputFileName, "w") as outputFile:
-            if header != "":
-                outputFile.write(header)
-            outputFile.writelines(lines)
+        with open(path, "rb") as sourceFile, cls.OpenFile(outputFileName, "wb", compressionLevel) as outputFile:
+            outputFile.write(header)
+            cls._CopyBytes(sourceFile, outputFile, start, end-start, blockSize)
+
+
+    @classmethod
+    def SplitFileByKey(
+            cls,
+            path:str,
+            keyColumn:str|int,
+            numberOfParts:int,
+            hasHeader:bool=True,
+            delimiter:str=",",
+            outputFileNameFormat:str="{base} part {number}.csv",
+            blockSize:int=2**22,
+            bufferSize:int=2**20,
+            compressionLevel:int=None
+        ):
+        """
+        Splits a file into parts so that all the lines with the same key are in the same part.  The part of a line is
+        found from a hash of its key, so the parts can be processed independently (e.g., in parallel).
+
+        Only the fields up to the key of each line are separated.  The lines are buffered for each part and a buffer is
+        written when it is full, so the memory used is set by the block size and the buffer sizes, not the size of the file.
+        Fields that contain quoted delimiters are not supported before or in the key field.
+
+        Parameters
+        ----------
+        path : string
+            Full path and file name of the file to split.
+        keyColumn : string or integer
+            The name of the key column (requires a header) or the position of the key column (starting at 0).
+        numberOfParts : integer
+            The number of parts.  A part with no lines is written with only the header.
+        hasHeader : bool
+            Set to True if the file contains a header line (one line only).  The header will then be copied
+            into each file.  Set to False if the file does not contain a header.
+        delimiter : string, optional
+            The field delimiter.  The default is ",".
+        outputFileNameFormat : string, optional
+            The format used to create the output file names.  See SplitFileByNumberOfLines.  The default is "{base} part {number}.csv".
+        blockSize : integer, optional
+            The number of bytes read at a time.  The default is 4 MB.
+        bufferSize : integer, optional
+            The number of bytes buffered for each part before they are written.  The default is 1 MB.
+        compressionLevel : integer, optional
+            The compression level of compressed parts.  If None, the default of the compression format is used.  The default is None.
+
+        Returns
+        -------
+        outputFiles : list
+            A list of the files generated from the split.
+        """
+        if numberOfParts < 1:
+            raise Exception("The number of parts must be at least one.")
+
+        delimiter   = delimiter.encode("utf-8")
+        outputFiles = [cls.GetPartFileName(path, i+1, outputFileNameFormat) for i in range(numberOfParts)]
+        partFiles   = []
+
+        try:
+            with cls.OpenFile(path, "rb") as sourceFile:
+                header = sourceFile.readline() if hasHeader else b""
+                key    = cls._GetKeyPosition(header, keyColumn, delimiter)
+
+                for outputFile in outputFiles:
+                    partFiles.append(cls.OpenFile(outputFile, "wb", compressionLevel))
+                    partFiles[-1].write(header)
+
+                buffers     = [[] for i in range(numberOfParts)]
+                bufferSizes = [0] * numberOfParts
+                remainder   = []
+
+                while True:
+                    block = sourceFile.read(blockSize)
+                    if len(block) == 0:
+                        break
+
+                    # Only complete lines are split.  The partial line at the end of a block is kept for the next block.
+                    for line in cls._SplitBlockIntoLines(block, remainder):
+                        part = zlib.crc32(cls._GetKey(line, key, delimiter)) % numberOfParts
+                        buffers[part].append(line)
+                        bufferSizes[part] += len(line) + 1
+
+                        if bufferSizes[part] >= bufferSize:
+                            cls._WriteLines(partFiles[part], buffers[part])
+                            buffers[part]     = []
+                            bufferSizes[part] = 0
+
+                # A last line without a line ending is given one so that it is not joined to a line from another file.
+                if len(remainder) > 0:
+                    line = b"".join(remainder)
+                    part = zlib.crc32(cls._GetKey(line, key, delimiter)) % numberOfParts
+                    buffers[part].append(line)
+
+                for partFile, lines in zip(partFiles, buffers):
+                    cls._WriteLines(partFile, lines)
+        finally:
+            for partFile in partFiles:
+                partFile.close()
+
+        return outputFiles
+
+
+    @classmethod
+    def _GetKeyPosition(cls, header:bytes, keyColumn:str|int, delimiter:bytes):
+        """
+        Gets the position of the key column.
+
+        Parameters
+        ----------
+        header : bytes
+            The header line.  Empty if the file does not have a header.
+        keyColumn : string or integer
+            The name or position of the key column.
+        delimiter : bytes
+            The field delimiter.
+
+        Returns
+        -------
+        : integer
+            The position of the key column.
+        """
+        if type(keyColumn) is int:
+            return keyColumn
+
+        columns = [column.strip().strip(b"\"").decode("utf-8") for column in header.rstrip(b"\r\n").split(delimiter)]
+        if keyColumn not in columns:
+            raise Exception("The key column \"" + keyColumn + "\" is not in the header.")
+        return columns.index(keyColumn)
+
+
+    @classmethod
+    def _GetKey(cls, line:bytes, key:int, delimiter:bytes):
+        """
+        Gets the key field of a line.  Only the fields up to the key field are separated.
+
+        Parameters
+        ----------
+        line : bytes
+            The line.
+        key : integer
+            The position of the key field.
+        delimiter : bytes
+            The field delimiter.
+
+        Returns
+        -------
+        : bytes
+            The key field.  Empty if the line does not have the field.
+        """
+        fields = line.split(delimiter, key+1)
+        if len(fields) <= key:
+            return b""
+        return fields[key].strip(b" \r\n\"")
+
+
+    @classmethod
+    def _SplitBlockIntoLines(cls, block:bytes, remainder:list[bytes]):
+        """
+        Splits a block of bytes into its complete lines.
+
+        The partial line at the end of the block is added to "remainder" and joined to the start of the next block's first
+        line.  The pieces of a partial line are kept in a list and joined once, when its line ending is found, so a line that
+        spans many blocks is not copied again for each block.
+
+        Parameters
+        ----------
+        block : bytes
+            The block of bytes.
+        remainder : list of bytes
+            The pieces of the partial line from the previous blocks.  Updated to hold the partial line at the end of this block.
 
-        return outputFileName
+        Returns
+        -------
+        lines : list of bytes
+            The complete lines (without line endings).
+        """
+        lines = block.split(b"\n")
+        last  = lines.pop()
+
+        if len(lines) > 0 and len(remainder) > 0:
+            remainder.append(lines[0])
+            lines[0] = b"".join(remainder)
+            remainder.clear()
+
+        if len(last) > 0:
+            remainder.append(last)
+
+        return lines
 
 
     @classmethod
-    def CombineFiles(cls, outputFileName:str, listOfFiles:list[str], removeFilesAfterCombining:bool=False):
+    def _WriteLines(cls, outputFile, lines:list[bytes]):
+        """
+        Writes lines (without line endings) to a file.
+
+        Parameters
+        ----------
+        outputFile : file object
+            A binary file.
+        lines : list of bytes
+            The lines.
+
+        Returns
+        -------
+        None.
+        """
+        if len(lines) > 0:
+            outputFile.write(b"\n".join(lines) + b"\n")
+
+
+    @classmethod
+    def GetPartFileName(cls, path:str, fileNumber:int, outputFileNameFormat:str="{base} part {number}.csv"):
+        """
+        Creates the file name of a part of a file that is split.
+
+        Parameters
+        ----------
+        path : string
+            Full path and file name of the file that is split.
+        fileNumber : integer
+            The number of the part (starting at 1).
+        outputFileNameFormat : string, optional
+            The format used to create the file name.  See SplitFileByNumberOfLines.  The default is "{base} part {number}.csv".
+
+        Returns
+        -------
+        : string
+            The path and file name of the part.
+        """
+        compression     = cls.GetCompression(path)
+        base, extension = os.path.splitext(path[:len(path)-len(compression)])
+        return outputFileNameFormat.format(base=base, number=fileNumber, extension=extension, compression=compression)
+
+
+    @classmethod
+    def _FindLineEnd(cls, block:bytes, start:int, numberOfLines:int):
+        """
+        Finds the position after the line ending of a line in a block of bytes.
+
+        The line endings are counted in windows that start at a guess of the length of the lines and double in size until the
+        line is found, so the scan stops near the line instead of at the end of the block.  The last window is then repeatedly
+        halved and the line endings in the first half counted, which keeps the search in the C level byte scanning instead of a
+        Python loop over each line.
+
+        Parameters
+        ----------
+        block : bytes
+            The block of bytes.  Must have at least "numberOfLines" line endings after "start."
+        start : integer
+            The position to start at.
+        numberOfLines : integer
+            The number of lines to skip.
+
+        Returns
+        -------
+        : integer
+            The position after the line ending of the last line skipped.
+        """
+        window = max(128*numberOfLines, 4096)
+        end    = min(start + window, len(block))
+        count  = block.count(b"\n", start, end)
+
+        while count < numberOfLines and end < len(block):
+            numberOfLines -= count
+            start          = end
+            window        *= 2
+            end            = min(start + window, len(block))
+            count          = block.count(b"\n", start, end)
+
+        while numberOfLines > 64 and end - start > 4096:
+            middle = (start + end) // 2
+            count  = block.count(b"\n", start, middle)
+            if count >= numberOfLines:
+                end            = middle
+            else:
+                numberOfLines -= count
+                start          = middle
+
+        position = start - 1
+        for i in range(numberOfLines):
+            position = block.index(b"\n", position+1)
+
+        return position + 1
+
+
+    @classmethod
+    def CombineFiles(
+            cls,
+            outputFileName:str,
+            listOfFiles:list[str],
+            removeFilesAfterCombining:bool=False,
+            compressionLevel:int=None,
+            blockSize:int=2**22
+        ):
         """
         Combines multiple text/csv files into a single document.
 
+        The files are copied as binary blocks (in the kernel when the platform supports it), so the lines are never decoded
+        and the memory used does not depend on the size of the files.
+
+        Compressed files (".gz", ".bz2", and ".xz") are decompressed as they are read.  The output file is compressed if its
+        name has a compressed file extension.
+
         Parameters
         ----------
         outputFileName : string
-            Output file path and name.
+            Output file name.  The file is written in the directory of the first input file.
         listOfFiles : list of strings
             List of input files to read from.
         removeFilesAfterCombining : boolean
             If True, the input files are deleted after they are read.
+        compressionLevel : integer, optional
+            The compression level used if the output file is compressed.  If None, the default of the compression format is used.
+            The default is None.
+        blockSize : integer, optional
+            The number of bytes copied at a time when the files are not copied in the kernel.  The default is 4 MB.
 
         Returns
         -------
@@ -123,10 +800,10 @@ class File():
         directory   = os.path.dirname(listOfFiles[0])
         writeHeader = True
 
-        with open(directory+"\\"+outputFileName, "w") as outputFile:
+        with cls.OpenFile(os.path.join(directory, outputFileName), "wb", compressionLevel) as outputFile:
             for fileName in listOfFiles:
                 # Copy the contents of the current file into the output file.
-                cls._CopyToOutputFile(fileName, outputFile, writeHeader)
+                cls._CopyToOutputFile(fileName, outputFile, writeHeader, blockSize)
 
                 # Only write the header the from the first file.
                 writeHeader = False
@@ -136,7 +813,7 @@ class File():
 
 
     @classmethod
-    def _CopyToOutputFile(cls, inputFileName:str, outputFile:TextIOWrapper, writeHeader:bool):
+    def _CopyToOutputFile(cls, inputFileName:str, outputFile:BufferedWriter, writeHeader:bool, blockSize:int=2**22):
         """
         Copies the contents of a file to the output file.  Opens the file and writes it to an existing file object.
 
@@ -145,23 +822,355 @@ class File():
         inputFileName : string
             The path and file name of the input file to read from.
         outputFile : file object
+            A binary file opened with OpenFile.
         writeHeader : boolean
             If True, the all lines of the input file are written to the output.  If False, the first
             line of the input file is skipped and not written to the output file.
+        blockSize : integer, optional
+            The number of bytes copied at a time when the file is not copied in the kernel.  The default is 4 MB.
 
         Returns
         -------
         None.
         """
-        with open(inputFileName, "r") as inputFile:
+        with cls.OpenFile(inputFileName, "rb") as inputFile:
             header = inputFile.readline()
 
             if writeHeader:
-                outputFile.writelines(header)
+                outputFile.write(header)
+
+            cls._CopyBytes(inputFile, outputFile, len(header), blockSize=blockSize)
+
+
+    @classmethod
+    def _CopyBytes(cls, inputFile:BufferedReader, outputFile:BufferedWriter, start:int, count:int=None, blockSize:int=2**22):
+        """
+        Copies bytes from one file to another.  The bytes are written at the current position of the output file.
+
+        On Linux, os.copy_file_range is used so the bytes are copied in the kernel without passing through Python.  If it is
+        not available, not supported for the files, or either file is compressed, the bytes are copied in blocks.
+
+        Parameters
+        ----------
+        inputFile : file object
+            A binary file (opened with OpenFile) to copy from.
+        outputFile : file object
+            A binary file (opened with OpenFile) to copy to.
+        start : integer
+            The position in the input file of the first byte to copy.
+        count : integer, optional
+            The number of bytes to copy.  If None, the bytes to the end of the input file are copied.  The default is None.
+        blockSize : integer, optional
+            The number of bytes copied at a time when the bytes are copied in blocks.  The default is 4 MB.
 
-            lines  = []
-            # Read all the lines.
-            for line in inputFile:
+        Returns
+        -------
+        None.
+        """
+        copied = 0
+
+        # The kernel copy is only possible between uncompressed files.  The buffered bytes of the output file are written first
+        # so that the copied bytes follow them, and the output file is then moved past the copied bytes.
+        if hasattr(os, "copy_file_range") and isinstance(inputFile, BufferedReader) and isinstance(outputFile, BufferedWriter):
+            end      = os.fstat(inputFile.fileno()).st_size if count is None else start + count
+            outputFile.flush()
+            position = outputFile.tell()
+            try:
+                while start + copied < end:
+                    size = os.copy_file_range(inputFile.fileno(), outputFile.fileno(), end-start-copied, start+copied, position+copied)
+                    if size == 0:
+                        break
+                    copied += size
+            except OSError:
+                # Not supported for these files (e.g., some file systems), the rest is copied in blocks.
+                pass
+            outputFile.seek(position + copied)
+
+        if inputFile.tell() != start + copied:
+            inputFile.seek(start + copied)
+
+        if count is None:
+            shutil.copyfileobj(inputFile, outputFile, blockSize)
+            return
+
+        remaining = count - copied
+        while remaining > 0:
+            block = inputFile.read(min(blockSize, remaining))
+            if len(block) == 0:
+                raise Exception("The file ended before the expected number of bytes were copied.")
+            outputFile.write(block)
+            remaining -= len(block)
+
+
+    @classmethod
+    def SortFiles(
+            cls,
+            outputFileName:str,
+            listOfFiles:list[str],
+            keyColumn:str|int,
+            numeric:bool=False,
+            hasHeader:bool=True,
+            delimiter:str=",",
+            memoryLimit:int=2**28,
+            numberOfWorkers:int=None,
+            mergeWidth:int=128,
+            temporaryDirectory:str=None,
+            compressionLevel:int=None,
+            blockSize:int=2**22
+        ):
+        """
+        Combines multiple text/csv files into a single file that is sorted by a key column.  The files do not have to fit in memory.
+
+        An external merge sort is used.  The files are divided into sections that fit in the memory limit.  Each section is
+        sorted and written to a temporary file (a sorted run) on a pool of processes.  The sorted runs are then merged into the
+        output file.  The sort is stable, lines with equal keys are kept in the order of the files and the lines in the files.
+
+        Compressed files (".gz", ".bz2", and ".xz") are decompressed as they are read, but a compressed file is sorted by one
+        process.  The output file is compressed if its name has a compressed file extension.
+
+        Parameters
+        ----------
+        outputFileName : string
+            Output file name.  The file is written in the directory of the first input file.
+        listOfFiles : list of strings
+            List of input files to read from.  The files must have the same columns.
+        keyColumn : string or integer
+            The name of the key column (requires a header) or the position of the key column (starting at 0).
+        numeric : bool, optional
+            If True, the keys are sorted as numbers (empty keys are last), otherwise they are sorted as text.  The default is False.
+        hasHeader : bool, optional
+            Set to True if the files contain a header line (one line only).  The header of the first file is written to
+            the output file.  The default is True.
+        delimiter : string, optional
+            The field delimiter.  The default is ",".
+        memoryLimit : integer, optional
+            The number of bytes of lines held in memory at one time (by all the processes).  The memory used by Python to hold
+            the lines is a few times larger.  The default is 256 MB.
+        numberOfWorkers : integer, optional
+            The number of processes used to sort the sections.  If None, the number of processors is used.  The default is None.
+        mergeWidth : integer, optional
+            The maximum number of sorted runs merged at one time.  Limits the number of open files.  The default is 128.
+        temporaryDirectory : string, optional
+            The directory the sorted runs are written in.  If None, the system temporary directory is used.  The default is None.
+        compressionLevel : integer, optional
+            The compression level used if the output file is compressed.  If None, the default of the compression format is used.
+            The default is None.
+        blockSize : integer, optional
+            The number of bytes read and written at a time.  The default is 4 MB.
+
+        Returns
+        -------
+        None.
+        """
+        if len(listOfFiles) < 1:
+            raise Exception("A list of files must be supplied.")
+
+        numberOfWorkers = (os.cpu_count() or 1) if numberOfWorkers is None else numberOfWorkers
+        runSize         = max(memoryLimit // numberOfWorkers, 1)
+        delimiter       = delimiter.encode("utf-8")
+
+        with cls.OpenFile(listOfFiles[0], "rb") as inputFile:
+            header = inputFile.readline() if hasHeader else b""
+        if len(header) > 0 and not header.endswith(b"\n"):
+            header += b"\n"
+        key = cls._GetKeyPosition(header, keyColumn, delimiter)
+
+        # Uncompressed files are divided into sections that are each sorted in one run.  Compressed files cannot be read from
+        # the middle, so each is read by one process, which writes as many runs as needed.
+        sections = []
+        for path in listOfFiles:
+            if cls.GetCompression(path) == "":
+                sections += [(path, start, end) for start, end in cls._GetSplitRanges(path, runSize, None, hasHeader)[1]]
+            else:
+                sections.append((path, None, None))
+
+        with tempfile.TemporaryDirectory(dir=temporaryDirectory) as runDirectory:
+            arguments = [
+                (path, start, end, hasHeader, key, delimiter, numeric, runSize, blockSize, os.path.join(runDirectory, str(i)))
+                for i, (path, start, end) in enumerate(sections)
+            ]
+
+            with ProcessPoolExecutor(max_workers=numberOfWorkers) as executor:
+                runs = [run for sectionRuns in executor.map(cls._SortSection, *zip(*arguments)) for run in sectionRuns] if len(arguments) > 0 else []
+
+            # Merge groups of runs until few enough are left to merge at once.
+            level = 0
+            while len(runs) > mergeWidth:
+                merged = []
+                for i in range(0, len(runs), mergeWidth):
+                    mergedRun = os.path.join(runDirectory, "merge " + str(level) + " " + str(i))
+                    with open(mergedRun, "wb") as outputFile:
+                        cls._MergeRuns(runs[i:i+mergeWidth], outputFile, key, delimiter, numeric, blockSize)
+                    for run in runs[i:i+mergeWidth]:
+                        os.remove(run)
+                    merged.append(mergedRun)
+                runs   = merged
+                level += 1
+
+            directory = os.path.dirname(listOfFiles[0])
+            with cls.OpenFile(os.path.join(directory, outputFileName), "wb", compressionLevel) as outputFile:
+                outputFile.write(header)
+                cls._MergeRuns(runs, outputFile, key, delimiter, numeric, blockSize)
+
+
+    @classmethod
+    def _SortSection(
+            cls,
+            path:str,
+            start:int,
+            end:int,
+            hasHeader:bool,
+            key:int,
+            delimiter:bytes,
+            numeric:bool,
+            runSize:int,
+            blockSize:int,
+            runPath:str
+        ):
+        """
+        Sorts a section of a file and writes it to sorted runs.  A class method so that it can be run in another process.
+
+        Parameters
+        ----------
+        path : string
+            Full path and file name of the file.
+        start : integer
+            The position of the start of the section.  If None, the whole file (after the header) is the section.
+        end : integer
+            The position after the end of the section.  Not used if start is None.
+        hasHeader : bool
+            If True, the file has a header line that is skipped.  Only used if start is None.
+        key : integer
+            The position of the key column.
+        delimiter : bytes
+            The field delimiter.
+        numeric : bool
+            If True, the keys are sorted as numbers.
+        runSize : integer
+            The maximum number of bytes in a run.
+        blockSize : integer
+            The number of bytes read at a time.
+        runPath : string
+            The path of the runs.  A run number is added to it for each run.
+
+        Returns
+        -------
+        runs : list of strings
+            The paths of the sorted runs.
+        """
+        sortKey = lambda line: cls._GetSortKey(line, key, delimiter, numeric)
+        runs    = []
+
+        def WriteRun(lines):
+            lines.sort(key=sortKey)
+            runs.append(runPath + " " + str(len(runs)))
+            with open(runs[-1], "wb") as runFile:
+                cls._WriteLines(runFile, lines)
+
+        if start is not None:
+            with open(path, "rb") as inputFile:
+                inputFile.seek(start)
+                lines = inputFile.read(end-start).split(b"\n")
+            if len(lines[-1]) == 0:
+                lines.pop()
+            WriteRun(lines)
+            return runs
+
+        with cls.OpenFile(path, "rb") as inputFile:
+            if hasHeader:
+                inputFile.readline()
+
+            lines     = []
+            size      = 0
+            remainder = []
+            while True:
+                block = inputFile.read(blockSize)
+                if len(block) == 0:
+                    break
+
+                # Only complete lines are kept.  The partial line at the end of a block is kept for the next block.
+                lines += cls._SplitBlockIntoLines(block, remainder)
+                size  += len(block)
+
+                if size >= runSize:
+                    WriteRun(lines)
+                    lines = []
+                    size  = 0
+
+            if len(remainder) > 0:
+                lines.append(b"".join(remainder))
+            if len(lines) > 0:
+                WriteRun(lines)
+
+        return runs
+
+
+    @classmethod
+    def _MergeRuns(cls, runs:list[str], outputFile, key:int, delimiter:bytes, numeric:bool, blockSize:int):
+        """
+        Merges sorted runs into a file.
+
+        Parameters
+        ----------
+        runs : list of strings
+            The paths of the sorted runs.  For lines with equal keys, the lines of earlier runs are written first.
+        outputFile : file object
+            A binary file (opened with OpenFile) to write to.
+        key : integer
+            The position of the key column.
+        delimiter : bytes
+            The field delimiter.
+        numeric : bool
+            If True, the keys are sorted as numbers.
+        blockSize : integer
+            The number of bytes written at a time.
+
+        Returns
+        -------
+        None.
+        """
+        runFiles = [open(run, "rb") for run in runs]
+        try:
+            lines = []
+            size  = 0
+            for line in heapq.merge(*runFiles, key=lambda line: cls._GetSortKey(line, key, delimiter, numeric)):
                 lines.append(line)
+                size += len(line)
+
+                # The lines are joined and written in blocks to reduce the number of writes.
+                if size >= blockSize:
+                    outputFile.write(b"".join(lines))
+                    lines = []
+                    size  = 0
+
+            outputFile.write(b"".join(lines))
+        finally:
+            for runFile in runFiles:
+                runFile.close()
 
-            outputFile.writelines(lines)
\ No newline at end of file
+
+    @classmethod
+    def _GetSortKey(cls, line:bytes, key:int, delimiter:bytes, numeric:bool):
+        """
+        Gets the value a line is sorted by.
+
+        Parameters
+        ----------
+        line : bytes
+            The line.
+        key : integer
+            The position of the key field.
+        delimiter : bytes
+            The field delimiter.
+        numeric : bool
+            If True, the key is converted to a number.  An empty key is converted to infinity so it is sorted last.
+
+        Returns
+        -------
+        : bytes or float
+            The key.
+        """
+        value = cls._GetKey(line, key, delimiter)
+        if numeric:
+            return float(value) if len(value) > 0 else float("inf")
+        return value
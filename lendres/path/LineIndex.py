@@ -0,0 +1,325 @@
+"""
+Created on October 18, 2026
+@author: Lance A. Endres
+"""
+import numpy                                                    as np
+import struct
+import os
+
+
+class LineIndex():
+    """
+    An index of the line start positions in a text file that allows lines to be read without reading the file from the start.
+
+    To keep the index small, the start position of every "linesPerSample" line is stored.  Reading a line seeks to the closest
+    stored line before it and skips at most "linesPerSample" - 1 lines.
+
+    The index is saved to a file next to the text file (the text file name with ".idx" added) and loaded from it the next time.
+    The saved index is not used if the size or modification time of the text file changed.
+    """
+
+    # Identifies index files and the version of the layout.  The header is followed by the stored line start positions.
+    fileIdentifier  = b"LINEIDX1"
+    headerFormat    = "<8sQqQQ"
+
+
+    def __init__(self, path:str, linesPerSample:int=1000, indexPath:str=None, save:bool=True, blockSize:int=2**22):
+        """
+        Constructor.  Loads the saved index or, if it is missing or out of date, builds the index.
+
+        Parameters
+        ----------
+        path : str
+            Path to the text file.
+        linesPerSample : int, optional
+            The number of lines between stored line start positions.  The default is 1000.
+        indexPath : str, optional
+            The path of the index file.  If None, ".idx" is added to the text file path.  The default is None.
+        save : bool, optional
+            If True, a newly built index is saved.  The default is True.
+        blockSize : int, optional
+            The number of bytes read at a time when the index is built.  The default is 4 MB.
+
+        Returns
+        -------
+        None.
+        """
+        if linesPerSample < 1:
+            raise Exception("The lines per sample must be at least one.")
+
+        self.path           = path
+        self.indexPath      = path + ".idx" if indexPath is None else indexPath
+        self.linesPerSample = linesPerSample
+
+        if not self.Load():
+            self.Build(blockSize)
+            if save:
+                self.Save()
+
+
+    @property
+    def NumberOfLines(self):
+        """
+        Gets the number of lines in the file.  A last line without a line ending is counted.
+
+        Returns
+        -------
+        int
+        """
+        return self.numberOfLines
+
+
+    def Build(self, blockSize:int=2**22):
+        """
+        Builds the index by reading the file.
+
+        Parameters
+        ----------
+        blockSize : int, optional
+            The number of bytes read at a time.  The default is 4 MB.
+
+        Returns
+        -------
+        None.
+        """
+        status          = os.stat(self.path)
+        samples         = [np.zeros(1, dtype=np.uint64)]
+        newLines        = 0
+        position        = 0
+        lastByte        = b"\n"
+
+        with open(self.path, "rb") as file:
+            while True:
+                block = file.read(blockSize)
+                if len(block) == 0:
+                    break
+
+                # Line "n+1" starts after line ending "n".  Store the starts of the lines that are multiples of the sample size.
+                endings  = np.flatnonzero(np.frombuffer(block, dtype=np.uint8) == ord("\n"))
+                first    = (self.linesPerSample - 1 - newLines) % self.linesPerSample
+                samples.append((endings[first::self.linesPerSample] + position + 1).astype(np.uint64))
+
+                newLines += len(endings)
+                position += len(block)
+                lastByte  = block[-1:]
+
+        # A line start at the end of the file is not a line.
+        self.offsets        = np.concatenate(samples)
+        self.offsets        = self.offsets[self.offsets < position] if position > 0 else self.offsets[:0]
+        self.numberOfLines  = newLines + (0 if lastByte == b"\n" else 1)
+        self.fileSize       = status.st_size
+        self.modifiedTime   = status.st_mtime_ns
+
+
+    def Save(self):
+        """
+        Saves the index to the index file.  The index is written to a temporary file that is then renamed, so a partially
+        written index file is never read.
+
+        Returns
+        -------
+        None.
+        """
+        header        = struct.pack(self.headerFormat, self.fileIdentifier, self.fileSize, self.modifiedTime, self.linesPerSample, self.numberOfLines)
+        temporaryPath = self.indexPath + "." + str(os.getpid()) + ".tmp"
+
+        with open(temporaryPath, "wb") as file:
+            file.write(header)
+            file.write(self.offsets.astype("<u8").tobytes())
+
+        os.replace(temporaryPath, self.indexPath)
+
+
+    def Load(self):
+        """
+        Loads the index from the index file.
+
+        Returns
+        -------
+        : bool
+            True if the index was loaded.  False if the index file does not exist, is not valid, was created with a different
+            number of lines per sample, or the text file has changed since it was created.
+        """
+        if not os.path.exists(self.indexPath):
+            return False
+
+        status     = os.stat(self.path)
+        headerSize = struct.calcsize(self.headerFormat)
+
+        with open(self.indexPath, "rb") as file:
+            header = file.read(headerSize)
+            if len(header) != headerSize:
+                return False
+
+            identifier, fileSize, modifiedTime, linesPerSample, numberOfLines = struct.unpack(self.headerFormat, header)
+
+            if identifier != self.fileIdentifier or linesPerSample != self.linesPerSample:
+                return False
+            if fileSize != status.st_size or modifiedTime != status.st_mtime_ns:
+                return False
+
+            offsets = np.frombuffer(file.read(), dtype="<u8").astype(np.uint64)
+
+        if len(offsets) != -(-numberOfLines // linesPerSample):
+            return False
+
+        self.offsets        = offsets
+        self.numberOfLines  = numberOfLines
+        self.fileSize       = fileSize
+        self.modifiedTime   = modifiedTime
+        return True
+
+
+    def GetLineOffset(self, line:int):
+        """
+        Gets the position in the file that a line starts at.
+
+        Parameters
+        ----------
+        line : int
+            The line number (the first line is 0).  The number of lines can be used to get the end of the file.
+
+        Returns
+        -------
+        : int
+            The position of the start of the line.
+        """
+        if line < 0 or line > self.numberOfLines:
+            raise Exception("The line " + str(line) + " is not in the file.")
+
+        if line == self.numberOfLines:
+            return self.fileSize
+
+        sample   = line // self.linesPerSample
+        offset   = int(self.offsets[sample])
+        skip     = line - sample*self.linesPerSample
+
+        if skip == 0:
+            return offset
+
+        with open(self.path, "rb") as file:
+            file.seek(offset)
+            return offset + self._SkipLines(file, skip)
+
+
+    def ReadLines(self, start:int, stop:int):
+        """
+        Reads a range of lines.
+
+        Parameters
+        ----------
+        start : int
+            The first line to read (the first line in the file is 0).
+        stop : int
+            The line after the last line to read.
+
+        Returns
+        -------
+        : bytes
+            The lines, including the line endings.
+        """
+        stop        = min(stop, self.numberOfLines)
+        if start >= stop:
+            return b""
+
+        return self.ReadBytes(self.GetLineOffset(start), self.GetLineOffset(stop))
+
+
+    def ReadBytes(self, start:int, end:int):
+        """
+        Reads a byte range of the file (e.g., a range from GetByteRanges).
+
+        Parameters
+        ----------
+        start : int
+            The position of the first byte.
+        end : int
+            The position after the last byte.
+
+        Returns
+        -------
+        : bytes
+            The bytes.
+        """
+        with open(self.path, "rb") as file:
+            file.seek(start)
+            return file.read(max(end - start, 0))
+
+
+    def GetByteRanges(self, numberOfRanges:int, firstLine:int=0):
+        """
+        Divides the file into byte ranges of about the same size that start at the start of a line.  Used to divide a file
+        between workers that parse it in parallel.
+
+        The ranges start at stored line start positions, so the ranges are found without reading the file.  The sizes of the
+        ranges differ by at most the size of "linesPerSample" lines.
+
+        Parameters
+        ----------
+        numberOfRanges : int
+            The number of ranges.  Fewer ranges are returned if the file does not have enough stored lines.
+        firstLine : int, optional
+            The line the first range starts at.  For example, 1 skips a header line.  The default is 0.
+
+        Returns
+        -------
+        : list of tuple(int, int)
+            The (start, end) byte positions of each range.
+        """
+        if numberOfRanges < 1:
+            raise Exception("The number of ranges must be at least one.")
+
+        start = self.GetLineOffset(firstLine)
+        end   = self.fileSize
+        if start >= end:
+            return []
+
+        # The nearest stored line start to each of the evenly spaced targets.
+        candidates  = self.offsets[self.offsets > start].astype(np.int64)
+        targets     = start + (end - start) * np.arange(1, numberOfRanges) // numberOfRanges
+        splitPoints = [start]
+
+        if len(candidates) > 0:
+            right        = np.clip(np.searchsorted(candidates, targets), 0, len(candidates)-1)
+            left         = np.maximum(right-1, 0)
+            nearest      = np.where(np.abs(candidates[left] - targets) <= np.abs(candidates[right] - targets), candidates[left], candidates[right])
+            splitPoints += sorted(set(int(offset) for offset in nearest))
+
+        splitPoints.append(end)
+        return list(zip(splitPoints[:-1], splitPoints[1:]))
+
+
+    @classmethod
+    def _SkipLines(cls, file, numberOfLines:int, blockSize:int=2**16):
+        """
+        Skips lines starting at the current position of a file.
+
+        Parameters
+        ----------
+        file : file object
+            A binary file.
+        numberOfLines : int
+            The number of lines to skip.
+        blockSize : int, optional
+            The number of bytes read at a time.  The default is 64 KB.
+
+        Returns
+        -------
+        : int
+            The number of bytes skipped.
+        """
+        skipped = 0
+        while True:
+            block = file.read(blockSize)
+            if len(block) == 0:
+                raise Exception("The file ended before the line was found.  The index is out of date.")
+
+            count = block.count(b"\n")
+            if count >= numberOfLines:
+                position = -1
+                for i in range(numberOfLines):
+                    position = block.index(b"\n", position+1)
+                return skipped + position + 1
+
+            numberOfLines -= count
+            skipped       += len(block)
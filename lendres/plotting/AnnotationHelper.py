@@ -5,6 +5,7 @@ Created on August 27, 2022
 import numpy                                                         as np
 from   adjustText                                                    import adjust_text
 
+from   lendres.algorithms.SpatialIndex                               import SpatialIndex
 from   lendres.plotting.PlotHelper                                   import PlotHelper
 from   lendres.signalprocessing.SignalProcessing                     import SignalProcessing
 
@@ -150,16 +151,110 @@ class AnnotationHelper():
                 xValue  = line.get_xdata()
                 xValue  = xValue[index]
 
-                textPosition   = [xValue, yValue]
-                text           = self.formatString.format(x=xValue, y=yValue)
-                annotation     = line.axes.annotate(text, textPosition, **self.defaults)
+                self._AddAnnotation(line, xValue, yValue)
 
-                self.annotations.append(annotation)
+        if self.adjustText:
+            self._AdjustAnnotations()
+
+
+    def AddNearestPointAnnotations(self, lines, x, y):
+        """
+        Annotates the points on the line(s) that are closest to the specified locations.
+
+        The closest points are found with a spatial index in display coordinates, so the point annotated is the one that
+        appears closest on the plot.  This is fast even for lines with hundreds of thousands of points.
+
+        Parameters
+        ----------
+        lines : Line2D or list of Line2D
+            Line(s) returned by plotting on an axes.
+        x : float or array like of float
+            The x value(s) of the location(s) in the data coordinates of the first line's axes.
+        y : float or array like of float
+            The y value(s) of the location(s) in the data coordinates of the first line's axes.
+
+        Returns
+        -------
+        None.
+        """
+        for line, index in self.GetNearestPoints(lines, x, y):
+            if line is not None:
+                self._AddAnnotation(line, line.get_xdata()[index], line.get_ydata()[index])
 
         if self.adjustText:
             self._AdjustAnnotations()
 
 
+    @classmethod
+    def GetNearestPoints(cls, lines, x, y):
+        """
+        Finds the points on the line(s) that are closest to the specified locations.  The distances are measured in
+        display coordinates.
+
+        Parameters
+        ----------
+        lines : Line2D or list of Line2D
+            Line(s) returned by plotting on an axes.
+        x : float or array like of float
+            The x value(s) of the location(s) in the data coordinates of the first line's axes.
+        y : float or array like of float
+            The y value(s) of the location(s) in the data coordinates of the first line's axes.
+
+        Returns
+        -------
+        : list of tuple(Line2D, int)
+            For each location, the line with the closest point and the index of the point in the line's data.  If the
+            lines have no points, the entry is (None, -1).
+        """
+        if type(lines) is not list:
+            lines = [lines]
+
+        # Combine the points of all the lines (in display coordinates) into a single index and keep track of which
+        # line and point each came from.
+        displayPoints = []
+        lineNumbers   = []
+        lineIndices   = []
+        for lineNumber, line in enumerate(lines):
+            data = np.column_stack((np.asarray(line.get_xdata(), dtype=float), np.asarray(line.get_ydata(), dtype=float)))
+            displayPoints.append(line.axes.transData.transform(data))
+            lineNumbers.append(np.full(len(data), lineNumber))
+            lineIndices.append(np.arange(len(data)))
+
+        displayPoints = np.concatenate(displayPoints)
+        lineNumbers   = np.concatenate(lineNumbers)
+        lineIndices   = np.concatenate(lineIndices)
+
+        spatialIndex  = SpatialIndex(displayPoints[:, 0], displayPoints[:, 1])
+        locations     = lines[0].axes.transData.transform(np.column_stack((np.atleast_1d(x), np.atleast_1d(y))).astype(float))
+        indices, _    = spatialIndex.Nearest(locations[:, 0], locations[:, 1])
+
+        return [(lines[lineNumbers[index]], int(lineIndices[index])) if index >= 0 else (None, -1) for index in indices]
+
+
+    def _AddAnnotation(self, line, xValue, yValue):
+        """
+        Adds an annotation of a point to the line's axes using the default settings.
+
+        Parameters
+        ----------
+        line : Line2D
+            The line the point is on.
+        xValue : float
+            The x value of the point.
+        yValue : float
+            The y value of the point.
+
+        Returns
+        -------
+        None.
+        """
+        textPosition   = [xValue, yValue]
+        text           = self.formatString.format(x=xValue, y=yValue)
+        annotation     = line.axes.annotate(text, textPosition, **self.defaults)
+
+        self.annotations.append(annotation)
+
+
     def _AdjustAnnotations(self):
         """
         Takes all the annotations that have been created and passes them to the "adjustText" library for position refinement.
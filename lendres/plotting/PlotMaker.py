@@ -9,6 +9,7 @@ import matplotlib.pyplot                                             as plt
 import seaborn                                                       as sns
 sns.set(color_codes=True)
 
+from   lendres.algorithms.Decimation                                 import Decimation
 from   lendres.plotting.AxesHelper                                   import AxesHelper
 from   lendres.plotting.PlotHelper                                   import PlotHelper
 from   lendres.datatypes.ListTools                                   import ListTools
@@ -259,7 +260,7 @@ class PlotMaker():
 
 
     @classmethod
-    def MultiAxesPlot(cls, axeses:list, data:pd.DataFrame, independentColumnName:str, axesesColumnNames:list, independentAxis:str="x", **kwargs):
+    def MultiAxesPlot(cls, axeses:list, data:pd.DataFrame, independentColumnName:str, axesesColumnNames:list, independentAxis:str="x", decimate:bool|int=False, **kwargs):
         """
         Plots data on two axes with the same x-axis but different y-axis scales.  The y-axis are on either side (left and right)
         of the plot.
@@ -277,6 +278,10 @@ class PlotMaker():
             each axes.  Example: [[column1, column2], [column3], [column 4, column5]] creates a three axes plot with
             column1 and column2 plotted on the left axes, column3 plotted on the first right axes, and column4 and column5
             plotted on the second right axes.
+        independentAxis : string, optional
+            The axis ("x" or "y") the independent data is plotted on.  The default is "x".
+        decimate : bool or int, optional
+            If True or an integer, the number of points plotted is reduced.  See DecimateForAxes.  The default is False.
         **kwargs : keyword arguments
             These arguments are passed to the plot function.  Each keyword argument can be a single value or a list.  If it is
             a single value, the same value is used for every call to plat.  If it is a list, the values are passed in order to
@@ -313,16 +318,58 @@ class PlotMaker():
                 defaultKwargs = {"color" : PlotHelper.NextColor()}
                 defaultKwargs.update(seriesKeyWordArgs[seriesIndex])
 
+                independent, dependent = cls.DecimateForAxes(axes, data[independentColumnName], data[column], decimate, independentAxis)
+
                 if independentAxis == "x":
-                    lines = axes.plot(data[independentColumnName], data[column], label=column, **defaultKwargs)
+                    lines = axes.plot(independent, dependent, label=column, **defaultKwargs)
                 else:
-                    lines = axes.plot(data[column], data[independentColumnName], label=column, **defaultKwargs)
+                    lines = axes.plot(dependent, independent, label=column, **defaultKwargs)
 
                 lines2d.append(lines[0])
                 seriesIndex += 1
         return lines2d
 
 
+    @classmethod
+    def DecimateForAxes(cls, axes, independent, dependent, decimate:bool|int=True, independentAxis:str="x"):
+        """
+        Reduces the number of points in a series to approximately what can be displayed on the axes.  The minimum and maximum
+        of each pixel column (or row) are kept so the plot looks the same, peaks included.  See Decimation.MinMax.
+
+        Parameters
+        ----------
+        axes : matplotlib.axes.Axes
+            The axes the series will be plotted on.
+        independent : array like
+            The independent values.
+        dependent : array like
+            The dependent values.
+        decimate : bool or int, optional
+            If True, the series is reduced to the pixel width (or height) of the axes.  If an integer, the series is reduced to
+            that many buckets.  If False, the series is returned unchanged.  The default is True.
+        independentAxis : string, optional
+            The axis ("x" or "y") the independent data is plotted on.  The default is "x".
+
+        Returns
+        -------
+        independent, dependent : array like, array like
+            The reduced series.
+        """
+        if decimate is False or decimate is None:
+            return independent, dependent
+
+        numberOfBuckets = decimate
+        if decimate is True:
+            extent          = axes.get_window_extent()
+            numberOfBuckets = int(np.ceil(extent.width if independentAxis == "x" else extent.height))
+
+        try:
+            return Decimation.MinMax(np.asarray(independent), np.asarray(dependent), numberOfBuckets)
+        except (TypeError, ValueError):
+            # Data that is not numeric cannot be decimated.
+            return independent, dependent
+
+
     @classmethod
     def CreateConfusionMatrixPlot(cls, confusionMatrix, title, titleSuffix=None, axesLabels=None):
         """
@@ -3,7 +3,8 @@ Created on March 23, 2024
 @author: lance.endres
 """
 from   scipy.signal                                                  import find_peaks
-import heapq
+
+from   lendres.algorithms.Selection                                  import Selection
 
 
 class SignalProcessing():
@@ -57,14 +58,14 @@ class SignalProcessing():
         # The top values are defined as those with the largest local peak height.
         match sortBy:
             case "localheight":
-                largestPeaks = heapq.nlargest(number, zip(localHeights, peakIndices))
+                largestPeaks, heights = Selection.Largest(localHeights, number)
             case "globalheight":
-                largestPeaks = heapq.nlargest(number, zip(y[peakIndices], peakIndices))
+                largestPeaks, heights = Selection.Largest(y[peakIndices], number)
             case _:
                 raise Exception("The 'sortBy' parameter is not valid.")
 
         # Extract the y (absolute heights) from the sorted results.
-        largestPeaksIndices = [peakCouple[1] for peakCouple in largestPeaks]
+        largestPeaksIndices = peakIndices[largestPeaks].tolist()
         largestYValues      = y[largestPeaksIndices]
 
         return largestPeaksIndices, largestYValues
\ No newline at end of file